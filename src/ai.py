@@ -1,92 +1,377 @@
 # tetris_duel/src/ai.py
 
+import json
 import random
-import copy
+import time
+
+try:
+    from simulator import MoveSimulator
+    from placement import Placement, generate_placements, piece_rotations, find_placement
+    from game import piece_key
+    from transposition import TranspositionTable
+    from planner import BeamPlanner
+    import vector_scoring
+    from metrics import DecisionMetrics
+    from features import FEATURE_NAMES, PLACEMENT_FEATURE_NAMES, extract_features, placement_features
+except ImportError:
+    from src.simulator import MoveSimulator
+    from src.placement import Placement, generate_placements, piece_rotations, find_placement
+    from src.game import piece_key
+    from src.transposition import TranspositionTable
+    from src.planner import BeamPlanner
+    from src import vector_scoring
+    from src.metrics import DecisionMetrics
+    from src.features import FEATURE_NAMES, PLACEMENT_FEATURE_NAMES, extract_features, placement_features
 
 class AI:
     """
     AI class for automatic piece placement in Tetris Duel.
     """
 
-    def __init__(self, game):
+    # Weights for different evaluation metrics
+    DEFAULT_WEIGHTS = {
+        'height': -0.510066,
+        'lines': 0.760666,
+        'holes': -0.35663,
+        'bumpiness': -0.184483,
+        'random': 0.1  # Ajouter un facteur aléatoire pour plus de variété
+    }
+
+    # Plus petit nombre de placements évalués ensemble avec NumPy (voir vectorized)
+    VECTOR_MIN_PLACEMENTS = 8
+
+    def __init__(self, game, player='ai', cache_size=64, search_depth=2, beam_width=4, time_budget=0.25,
+                 vectorized=False):
         """
         Initializes the AI with a reference to the game instance.
 
         :param game: An instance of the TetrisGame class.
+        :param player: The board controlled by this AI ('ai' or 'human').
+        :param cache_size: Number of entries (placements of a piece on a
+                           board, or their evaluations) kept in a cache, or
+                           None for no cache; the next decision reuses those
+                           of the last lookahead (see generate_placements).
+        :param search_depth: Number of pieces searched (the current piece and
+                             the next ones); 1 disables the lookahead.
+        :param beam_width: Number of boards expanded per level of the lookahead.
+        :param time_budget: Wall-clock budget of the lookahead, in seconds, or
+                            None for no deadline (reproducible decisions).
+        :param vectorized: Evaluate the placements of a piece together with
+                           NumPy, when it is installed and there are at least
+                           VECTOR_MIN_PLACEMENTS of them. Only worth it with
+                           feature_weights: the simulator reads its surface
+                           features in constant time, but computes the
+                           features of features.py board by board.
         """
         self.game = game
-        # Weights for different evaluation metrics
-        self.weights = {
-            'height': -0.510066,
-            'lines': 0.760666,
-            'holes': -0.35663,
-            'bumpiness': -0.184483,
-            'random': 0.1  # Ajouter un facteur aléatoire pour plus de variété
-        }
+        self.player = player
+        self.weights = dict(self.DEFAULT_WEIGHTS)
+        # Poids optionnels des caractéristiques de features.py, ajoutés au score
+        # de chaque placement (vide: non calculées)
+        self.feature_weights = {}
+        # Amplitude du bruit ajouté aux scores et nombre maximal de placements
+        # considérés (None: tous), réglés par les niveaux de difficulté
+        self.noise = 0.1
+        self.max_candidates = None
         # Garder une trace des derniers mouvements pour éviter les répétitions
         self.last_moves = []
         self.max_history = 5
+        # Partie de travail réutilisée pour les simulations (voir get_game_copy)
+        self.scratch_game = None
+        # Simulateur de placement sans copie de la partie
+        self.simulator = MoveSimulator(game.grid_width, game.grid_height)
+        # Cache optionnel des placements d'une pièce et de leurs évaluations, par plateau
+        self.evaluation_cache = TranspositionTable(cache_size) if cache_size else None
+        # Évaluation groupée des candidats avec NumPy (voir score_placements)
+        self.vectorized = vectorized and vector_scoring.np is not None
+        # Recherche en faisceau sur la pièce courante et les suivantes
+        self.search_depth = search_depth
+        self.planner = BeamPlanner(self.simulator, self.score_placements, beam_width, time_budget,
+                                   generate=self.generate_placements)
+        # Dernier coup choisi et le placement (avec son chemin) qu'il représente
+        self.planned_move = None
+        self.planned_placement = None
+        # Mesures de chaque décision (temps, effort de recherche, marge)
+        self.metrics = DecisionMetrics()
+        self.decision_stats = {'generated': 0, 'evaluated': 0, 'simulated': 0}
+
+    def load_weights(self, path):
+        """
+        Loads evaluation weights from a JSON weight file (see tuning.py).
+
+        Only the known weights are read; missing ones keep their value.
+        Weights named after FEATURE_NAMES or PLACEMENT_FEATURE_NAMES go to
+        feature_weights.
+
+        :param path: Path of the weight file.
+        """
+        with open(path) as weights_file:
+            weights = json.load(weights_file)
+        for name in self.DEFAULT_WEIGHTS:
+            if name in weights:
+                self.weights[name] = float(weights[name])
+        for name in FEATURE_NAMES + PLACEMENT_FEATURE_NAMES:
+            if name in weights:
+                self.feature_weights[name] = float(weights[name])
 
     def calculate_best_move(self):
         """
         Calculates the best move for the AI player based on the current game state.
 
+        Candidates are the distinct lock positions the piece can actually
+        reach (see generate_placements), including tucks under overhangs.
+        When the next piece is known and search_depth allows it, the choice
+        comes from a beam search over the upcoming pieces (see BeamPlanner).
+        max_candidates, the noise and the penalty on recent moves apply to
+        the current piece's placements in both cases; only the one-piece
+        choice also picks at random among near-equal scores.
+        The chosen placement and its input path are kept for play_move, and
+        the decision's measurements are recorded in self.metrics.
+
         :return: A tuple containing the best move (rotation, direction).
         """
-        if not self.game.current_pieces.get('ai'):
+        # Un coup précédent ne doit pas survivre à une décision sans placement
+        self.planned_move = self.planned_placement = None
+        piece = self.game.current_pieces.get(self.player)
+        if not piece:
             return None
-            
-        best_moves = []
-        best_score = float('-inf')
         
-        piece_type = self.game.current_pieces['ai'].get('type')
-        
-        # Skip if it's a funny piece that can't rotate
-        if piece_type == 'funny':
-            # For funny pieces, try different horizontal positions
-            for col_offset in range(-5, 6):
-                # Simulate moving the piece
-                score = self.evaluate_move(0, col_offset)
-                # Ajouter un bruit aléatoire pour éviter de toujours choisir la même action
-                score += random.uniform(-0.1, 0.1)
-                
-                if score > best_score:
-                    best_score = score
-                    best_moves = [(0, col_offset)]  # Reset list with this move
-                elif abs(score - best_score) < 0.1:  # If scores are very close
-                    best_moves.append((0, col_offset))  # Add as an alternative
+        started = time.perf_counter()
+        cache_hits = self.evaluation_cache.hits if self.evaluation_cache is not None else 0
+        self.decision_stats = {'generated': 0, 'evaluated': 0, 'simulated': 0, 'depth': 1, 'margin': None}
+        row, col = self.game.piece_positions[self.player]
+        board = self.game.boards[self.player]
+        rotation = self.game.piece_rotations[self.player]
+        pieces = self.preview_pieces()
+        placements = self.generate_placements(board, piece, row, col, rotation)
+        generated = len(placements)
+        if self.max_candidates is not None and len(placements) > self.max_candidates:
+            placements = random.sample(placements, self.max_candidates)
+        if len(pieces) > 1:
+            bias = [self.move_bias(placement, col) for placement in placements]
+            plan = self.planner.plan(board, pieces, row, col, rotation, placements, bias)
+            placement = plan.placement if plan else None
+            # Le planificateur compte les placements de la racine qu'il a reçus
+            self.decision_stats['generated'] = generated + self.planner.generated - len(placements)
+            self.decision_stats['simulated'] += self.planner.built
+            if plan:
+                self.decision_stats.update(depth=plan.depth, margin=plan.margin)
+        else:
+            self.decision_stats['generated'] = generated
+            placement = self.choose_placement(placements, piece, col)
+        if self.evaluation_cache is not None:
+            cache_hits = self.evaluation_cache.hits - cache_hits
         else:
-            # Pour les pièces normales
-            max_rotations = 1 if piece_type == 'O' else 4  # O piece doesn't need rotation
-            
-            for rotation in range(max_rotations):
-                for col_offset in range(-5, 6):  # Try different horizontal positions
-                    # Simulate moving the piece
-                    score = self.evaluate_move(rotation, col_offset)
-                    # Ajouter un bruit aléatoire pour éviter de toujours choisir la même action
-                    score += random.uniform(-0.1, 0.1)
-                    
-                    # Pénaliser légèrement les mouvements récemment effectués
-                    if (rotation, col_offset) in self.last_moves:
-                        score -= 0.05 * (self.max_history - self.last_moves.index((rotation, col_offset)))
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_moves = [(rotation, col_offset)]  # Reset list with this move
-                    elif abs(score - best_score) < 0.1:  # If scores are very close
-                        best_moves.append((rotation, col_offset))  # Add as an alternative
+            cache_hits = None
+        self.record_decision(time.perf_counter() - started, cache_hits)
+        if placement is None:
+            return None
         
-        # Si plusieurs mouvements ont des scores similaires, en choisir un au hasard
-        best_move = random.choice(best_moves) if best_moves else None
+        best_move = (placement.rotation, placement.col - col)
+        self.planned_move = best_move
+        self.planned_placement = placement
         
         # Remember this move
-        if best_move:
-            self.last_moves.append(best_move)
-            if len(self.last_moves) > self.max_history:
-                self.last_moves.pop(0)
+        self.last_moves.append(best_move)
+        if len(self.last_moves) > self.max_history:
+            self.last_moves.pop(0)
                 
         return best_move
 
+    def record_decision(self, wall_time, cache_hits=None):
+        """
+        Adds the measurements of the last decision to self.metrics.
+
+        :param wall_time: Time spent choosing the move, in seconds
+        :param cache_hits: Evaluation cache hits during the decision, None
+                           (not recorded) when there is no cache
+        """
+        stats = {name: value for name, value in self.decision_stats.items() if value is not None}
+        if cache_hits is not None:
+            stats['cache_hits'] = cache_hits
+        self.metrics.record(wall_time=wall_time, **stats)
+
+    def preview_pieces(self):
+        """
+        Lists the pieces searched by the lookahead.
+
+        :return: The current piece followed by the known next pieces, at
+                 most search_depth pieces.
+        """
+        pieces = [self.game.current_pieces[self.player]]
+        next_piece = self.game.next_pieces.get(self.player)
+        if next_piece:
+            pieces.append(next_piece)
+        return pieces[:max(1, self.search_depth)]
+
+    def choose_placement(self, placements, piece, col):
+        """
+        Picks a placement of the current piece by scoring each one alone.
+
+        :param placements: Placements returned by generate_placements
+        :param piece: The current piece
+        :param col: Current column of the piece
+        :return: The chosen Placement, or None if there is none
+        """
+        best_placements = []
+        best_score = second_score = float('-inf')
+        
+        board = self.game.boards[self.player]
+        scored = self.score_placements(board, piece_rotations(piece), placements)
+        for placement, (score, _) in zip(placements, scored):
+            score += self.move_bias(placement, col)
+            if score > best_score:
+                best_score, second_score = score, best_score
+                best_placements = [placement]  # Reset list with this move
+            else:
+                second_score = max(second_score, score)
+                if abs(score - best_score) < 0.1:  # If scores are very close
+                    best_placements.append(placement)  # Add as an alternative
+        
+        if len(placements) > 1:
+            self.decision_stats['margin'] = best_score - second_score
+        # Si plusieurs mouvements ont des scores similaires, en choisir un au hasard
+        if not best_placements:
+            return None
+        return random.choice(best_placements)
+
+    def move_bias(self, placement, col):
+        """
+        Random noise and recent-move penalty added to a placement's score.
+
+        :param placement: A Placement of the current piece
+        :param col: Current column of the piece
+        :return: The value to add to the placement's score
+        """
+        # Ajouter un bruit aléatoire pour éviter de toujours choisir la même action
+        bias = random.uniform(-self.noise, self.noise)
+        
+        # Pénaliser légèrement les mouvements récemment effectués
+        move = (placement.rotation, placement.col - col)
+        if move in self.last_moves:
+            bias -= 0.05 * (self.max_history - self.last_moves.index(move))
+        return bias
+
+    def score_placements(self, board, shapes, placements, base_lines=0):
+        """
+        Scores every placement of a piece on a board.
+
+        The placements are evaluated by evaluate_placements. With an
+        evaluation cache, the ones already evaluated on the same board are
+        read from it instead, so they are neither simulated nor stacked
+        again. When feature_weights is set,
+        the weighted features of features.py (board and placement ones) are
+        added to every score.
+
+        :param board: The Board the piece is placed on
+        :param shapes: The PieceShapes of the piece, indexed by rotation
+        :param placements: Placements returned by generate_placements
+        :param base_lines: Lines already completed before this piece
+        :return: A list of (score, lines_cleared), one per placement
+        """
+        if not placements:
+            return []
+        self.decision_stats['evaluated'] += len(placements)
+        cache = self.evaluation_cache
+        if cache is None:
+            children = self.evaluate_placements(board, shapes, placements)
+        else:
+            # Évaluations déjà connues des placements de cette pièce sur ce plateau
+            key = ('evaluations', tuple(board.rows), shapes[0].masks, bool(self.feature_weights))
+            known = cache.get(key)
+            if known is None:
+                known = {}
+                cache.put(key, known)
+            children = [known.get(placement[:3]) for placement in placements]
+            missing = [index for index, child in enumerate(children) if child is None]
+            if missing:
+                evaluated = self.evaluate_placements(board, shapes, [placements[index] for index in missing])
+                for index, child in zip(missing, evaluated):
+                    children[index] = known[placements[index][:3]] = child
+        scored = []
+        for features, cleared, vector in children:
+            score = self.score_features(features, base_lines + cleared)
+            if vector is not None:
+                score += self.score_feature_vector(vector)
+            scored.append((score, cleared))
+        return scored
+
+    def generate_placements(self, board, piece, row, col, rotation=0):
+        """
+        Lists the placements of a piece, through the evaluation cache if any.
+
+        The lookahead places the next piece on the boards it keeps, from its
+        spawn position; the next decision usually starts from one of these
+        boards with that piece, and then finds its placements (and, in
+        score_placements, their evaluations) in the cache instead of
+        searching them again.
+
+        :return: The list returned by placement.generate_placements, which
+                 must not be modified
+        """
+        cache = self.evaluation_cache
+        if cache is None:
+            return generate_placements(board, piece, row, col, rotation)
+        key = ('placements', tuple(board.rows), piece_key(piece), row, col, rotation)
+        placements = cache.get(key)
+        if placements is None:
+            placements = generate_placements(board, piece, row, col, rotation)
+            cache.put(key, placements)
+        return placements
+
+    def evaluate_placements(self, board, shapes, placements):
+        """
+        Builds the board resulting from each placement and reads its features.
+
+        When vectorized and there are enough placements, the resulting boards
+        are stacked and evaluated together (see vector_scoring); otherwise
+        each one is dropped with the simulator.
+
+        :param board: The Board the piece is placed on
+        :param shapes: The PieceShapes of the piece, indexed by rotation
+        :param placements: Placements returned by generate_placements
+        :return: A list of (features, lines_cleared, feature_vector), one per
+                 placement: features as returned by MoveSimulator.features,
+                 feature_vector the features of features.py
+                 (FEATURE_NAMES + PLACEMENT_FEATURE_NAMES) when feature_weights
+                 is set, None otherwise
+        """
+        self.decision_stats['simulated'] += len(placements)
+        weighted = bool(self.feature_weights)
+        if self.vectorized and len(placements) >= self.VECTOR_MIN_PLACEMENTS:
+            return vector_scoring.evaluate_placements(board.rows, board.width, shapes, placements, weighted)
+        children = []
+        for placement in placements:
+            shape = shapes[placement.rotation]
+            cleared = self.simulator.place(board, shape, placement.row, placement.col)
+            vector = None
+            if weighted:
+                vector = (extract_features(self.simulator.rows, board.width) +
+                          placement_features(board.rows, shape, placement.row, placement.col, board.width))
+            children.append((self.simulator.features(), cleared, vector))
+        return children
+
+    def evaluate_simulation(self, simulator, completed_lines):
+        """
+        Scores the board currently held by a MoveSimulator.
+
+        :param simulator: The MoveSimulator holding the board
+        :param completed_lines: Number of lines completed to reach this board
+        :return: A score for this board
+        """
+        return self.score_features(simulator.features(), completed_lines)
+
+    def evaluate_placement(self, placement):
+        """
+        Evaluates a lock position of the current piece.
+
+        :param placement: A Placement returned by generate_placements
+        :return: A score for this placement, as score_placements gives it
+        """
+        board = self.game.boards[self.player]
+        shapes = piece_rotations(self.game.current_pieces[self.player])
+        return self.score_placements(board, shapes, [placement])[0][0]
+
     def evaluate_move(self, rotation, col_offset):
         """
         Evaluates a potential move by simulating it and scoring the resulting board.
@@ -95,35 +380,83 @@ class AI:
         :param col_offset: The horizontal offset to apply
         :return: A score for this move
         """
-        # Make a copy of the game state
-        game_copy = self.get_game_copy()
-        
-        # Apply rotation
-        original_rotation = game_copy.piece_rotations['ai']
-        game_copy.piece_rotations['ai'] = rotation
+        row, col = self.game.piece_positions[self.player]
+        board = self.game.boards[self.player]
+        shapes = piece_rotations(self.game.current_pieces[self.player])
+        rotation %= len(shapes)
+        shape = shapes[rotation]
+        if not board.fits(shape, row, col + col_offset):
+            return float('-inf')  # Invalid move
         
-        # Apply horizontal movement
-        original_position = game_copy.piece_positions['ai'][:]
-        game_copy.piece_positions['ai'][1] += col_offset
+        # Lâcher la pièce tout droit, comme le ferait le simulateur
+        landing = board.landing_row(shape, row, col + col_offset)
+        return self.evaluate_placement(Placement(rotation, landing, col + col_offset, None))
+
+    def play_move(self, move):
+        """
+        Applies a move returned by calculate_best_move to the live game.
+
+        :param move: A tuple (rotation, direction), or None to do nothing.
+        """
+        if not move:
+            return
         
-        # Check if this position is valid
-        if game_copy.check_collision('ai'):
-            return float('-inf')  # Invalid move
-            
-        # Simulate dropping the piece
-        self.simulate_drop(game_copy, 'ai')
+        # Lock the piece where the placement behind this move was evaluated
+        if move == self.planned_move and self.planned_placement is not None:
+            self.play_placement(self.planned_placement)
+            self.planned_move = self.planned_placement = None
+            return
         
-        # Evaluate the board state
-        return self.evaluate_board(game_copy)
+        # Sinon: tourner sur place, glisser jusqu'à la colonne puis lâcher
+        rotation, direction = move
+        row, col = self.game.piece_positions[self.player]
+        board = self.game.boards[self.player]
+        shapes = piece_rotations(self.game.current_pieces[self.player])
+        shape = shapes[rotation % len(shapes)]
+        if board.fits(shape, row, col + direction):
+            self.game.apply_placement(self.player, rotation, board.landing_row(shape, row, col + direction),
+                                      col + direction)
+
+    def play_placement(self, placement, origin=None):
+        """
+        Plays a placement chosen for the current piece, possibly elsewhere.
+
+        The game validates the placement's input path and locks the piece in
+        a single transition (see TetrisGame.apply_placement). When the piece
+        has moved since the placement was planned (for instance by gravity
+        while a background search was running), the input path is searched
+        again from the current position.
+
+        :param placement: The Placement to reach.
+        :param origin: The (row, col, rotation) the placement's path starts
+                       from, or None if it starts from the current position.
+        :return: True if the piece was locked there, False if the placement
+                 cannot be reached any more (the piece is then left untouched).
+        """
+        row, col = self.game.piece_positions[self.player]
+        rotation = self.game.piece_rotations[self.player]
+        if origin is not None and tuple(origin) != (row, col, rotation):
+            piece = self.game.current_pieces[self.player]
+            placements = generate_placements(self.game.boards[self.player], piece, row, col, rotation)
+            placement = find_placement(placements, piece, placement)
+            if placement is None:
+                return False
+        return self.game.apply_placement(self.player, placement.rotation, placement.row, placement.col,
+                                         placement.path)
 
     def get_game_copy(self):
         """
         Creates a copy of the game state for simulation.
+
+        The copy is a scratch game owned by the AI, restored from a snapshot
+        of the live game, so no deep copy is made for each candidate move.
         
         :return: A copy of the game object
         """
-        game_copy = copy.deepcopy(self.game)
-        return game_copy
+        if self.scratch_game is None:
+            self.scratch_game = type(self.game)()
+        self.scratch_game.restore(self.game.snapshot())
+        return self.scratch_game
 
     def simulate_drop(self, game, player):
         """
@@ -132,58 +465,46 @@ class AI:
         :param game: The game object
         :param player: The player ('human' or 'ai')
         """
-        while True:
-            old_position = game.piece_positions[player][:]
-            game.piece_positions[player][0] += 1
-            
-            if game.check_collision(player):
-                game.piece_positions[player] = old_position
-                game.lock_piece(player)
-                break
+        game.piece_positions[player][0] = game.landing_row(player)
+        game.lock_piece(player)
 
     def evaluate_board(self, game, player='ai'):
         """
         Evaluates the board state and returns a score.
-        Uses multiple heuristics to determine how good the position is.
+        Uses the same heuristics as score_placements, from the board's own
+        features (its completed rows count as completed lines).
 
         :param game: The game state to evaluate
         :param player: The player whose board to evaluate
         :return: A score representing how favorable the board state is
         """
-        # Get the grid
-        grid = game.grids[player]
-        
-        # Calculate various metrics
-        height_sum = 0
-        holes = 0
-        completed_lines = 0
-        bumpiness = 0
-        
-        # Calculate column heights and holes
-        heights = [0] * game.grid_width
-        for col in range(game.grid_width):
-            found_block = False
-            for row in range(game.grid_height):
-                if grid[row][col]:
-                    found_block = True
-                    if heights[col] == 0:  # First block in column
-                        heights[col] = game.grid_height - row
-                elif found_block:
-                    # This is a hole
-                    holes += 1
-        
-        # Calculate sum of heights
-        height_sum = sum(heights)
-        
-        # Calculate bumpiness (sum of height differences between adjacent columns)
-        for i in range(game.grid_width - 1):
-            bumpiness += abs(heights[i] - heights[i+1])
-        
-        # Check for completed lines
-        completed_lines = 0
-        for row in range(game.grid_height):
-            if all(cell for cell in grid[row]):
-                completed_lines += 1
+        board = game.boards[player]
+        score = self.score_features(board.features(), len(board.full_rows))
+        if self.feature_weights:
+            score += self.score_feature_vector(extract_features(board.rows, board.width))
+        return score
+
+    def score_feature_vector(self, vector):
+        """
+        Weights a feature vector with feature_weights.
+
+        :param vector: extract_features followed by placement_features, in
+                       FEATURE_NAMES + PLACEMENT_FEATURE_NAMES order
+        :return: The weighted sum of the features that have a weight
+        """
+        names = FEATURE_NAMES + PLACEMENT_FEATURE_NAMES
+        return sum(self.feature_weights.get(name, 0) * value for name, value in zip(names, vector))
+
+    def score_features(self, features, completed_lines):
+        """
+        Combines board features into a score with the AI weights.
+
+        :param features: A tuple (aggregate_height, holes, bumpiness), as
+                         returned by Board.features or MoveSimulator.features
+        :param completed_lines: Number of lines completed by the move
+        :return: A score representing how favorable the board state is
+        """
+        height_sum, holes, bumpiness = features
         
         # Facteur aléatoire pour diversité
         random_factor = random.random() * self.weights['random']
@@ -205,18 +526,12 @@ class AI:
         Note: This method is kept for compatibility with tests.
 
         :param piece: The current Tetris piece.
-        :return: A list of possible moves (rotation, direction).
-        """
-        moves = []
-        # Add all possible rotations and directions
-        if piece.get('type') == 'funny':
-            # Funny pieces can't rotate, just different horizontal positions
-            for direction in range(-5, 6):
-                moves.append((0, direction))
-        else:
-            max_rotations = 1 if piece.get('type') == 'O' else 4
-            for rotation in range(max_rotations):
-                for direction in range(-5, 6):
-                    moves.append((rotation, direction))
-                    
-        return moves
\ No newline at end of file
+        :return: A list of possible moves (rotation, direction), one per
+                 distinct reachable lock position.
+        """
+        row, col = self.game.piece_positions[self.player]
+        rotation = 0
+        if piece is self.game.current_pieces[self.player]:
+            rotation = self.game.piece_rotations[self.player]
+        placements = generate_placements(self.game.boards[self.player], piece, row, col, rotation)
+        return [(placement.rotation, placement.col - col) for placement in placements]
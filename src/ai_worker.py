@@ -0,0 +1,108 @@
+# tetris_duel/src/ai_worker.py
+
+"""
+Calcul des décisions de l'IA hors du thread de l'interface.
+
+AIWorker runs the AI search in a background thread on a private copy of the
+game, restored from a snapshot of the live game, so the tkinter loop never
+waits for it. Requests and results travel through queues; every request
+carries a key (for instance a game generation and the id of the AI piece),
+and the caller polls for the result of its current key, results for any
+other key being stale and dropped.
+
+A thread is enough here: the search only takes a few milliseconds and the
+interpreter switches threads often enough for input and drawing to stay
+smooth, without the cost of sending game states to another process.
+"""
+
+import queue
+import threading
+from collections import namedtuple
+
+try:
+    from game import TetrisGame
+    from ai import AI
+except ImportError:
+    from src.game import TetrisGame
+    from src.ai import AI
+
+# Result of a search: the request key, the move returned by
+# calculate_best_move, its Placement and the (row, col, rotation) of the piece
+# the placement's input path starts from
+Decision = namedtuple('Decision', ['key', 'move', 'placement', 'origin'])
+
+
+class AIWorker:
+    """
+    Background thread computing AI decisions on game snapshots.
+    """
+
+    def __init__(self, player='ai', **ai_options):
+        """
+        Creates the worker and starts its thread.
+
+        :param player: The board the AI plays ('ai' or 'human').
+        :param ai_options: Extra keyword arguments passed to the AI.
+        """
+        self.player = player
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        # Key of the last request not answered yet
+        self.pending = None
+        self.game = TetrisGame()
+        self.ai = AI(self.game, player, **ai_options)
+        self.thread = threading.Thread(target=self._run, name="ai-worker", daemon=True)
+        self.thread.start()
+
+    def request(self, key, state):
+        """
+        Asks for a decision on a game state.
+
+        :param key: Hashable identifier of the position, returned with the result.
+        :param state: A state returned by TetrisGame.snapshot().
+        """
+        self.pending = key
+        self.requests.put((key, state))
+
+    def poll(self, key):
+        """
+        Collects the results computed so far without blocking.
+
+        :param key: Key of the position the caller is interested in.
+        :return: The Decision for this key, or None if it is not ready yet.
+        """
+        decision = None
+        while True:
+            try:
+                result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            # Les résultats d'une autre pièce ou d'une autre partie sont périmés
+            if result.key == key:
+                decision = result
+        if decision is not None and self.pending == key:
+            self.pending = None
+        return decision
+
+    def stop(self):
+        """Stops the worker thread once its current search is over."""
+        self.requests.put(None)
+        self.thread.join()
+
+    def _run(self):
+        """Thread loop: answer the most recent request, skip older ones."""
+        while True:
+            request = self.requests.get()
+            try:
+                while True:
+                    request = self.requests.get_nowait()
+            except queue.Empty:
+                pass
+            if request is None:
+                return
+            key, state = request
+            self.game.restore(state)
+            row, col = self.game.piece_positions[self.player]
+            origin = (row, col, self.game.piece_rotations[self.player])
+            move = self.ai.calculate_best_move()
+            self.results.put(Decision(key, move, self.ai.planned_placement, origin))
@@ -0,0 +1,257 @@
+# tetris_duel/src/batch.py
+
+"""
+Moteur vectorisé pour simuler N duels en parallèle.
+
+BatchTetrisGame holds N duels as NumPy row bitmasks of shape (N, 2, rows)
+and advances all of them in lockstep: moves, rotations, gravity, locking and
+line clears are array operations over every duel at once. Scoring follows
+TetrisGame.settle_piece: 50 points per line, +100/+200/+300 for 2/3/4 lines,
+a surprise gift (I or O piece) for the opponent on double clears, a funny
+piece every 3000 points and +100 when a funny piece clears lines.
+
+Row bitmask layout: bit ``PAD + c`` is column ``c``; the ``PAD`` bits on each
+side are always set and act as walls, and ``FLOOR_ROWS`` full rows under the
+board act as the floor, so a single AND tells whether a piece collides.
+"""
+
+import numpy as np
+
+try:
+    from game import TETROMINOS, FUNNY_PIECE, PIECE_SHAPES, FUNNY_SHAPES
+    from features import batch_features
+except ImportError:
+    from src.game import TETROMINOS, FUNNY_PIECE, PIECE_SHAPES, FUNNY_SHAPES
+    from src.features import batch_features
+
+# Action codes accepted by BatchTetrisGame.step
+NO_ACTION, LEFT, RIGHT, DOWN, ROTATE, DROP = range(6)
+ACTION_CODES = {None: NO_ACTION, 'left': LEFT, 'right': RIGHT, 'down': DOWN, 'up': ROTATE, 'space': DROP}
+
+# Piece ids: the tetrominos in TETROMINOS order, then the funny pieces
+PIECE_TYPES = list(TETROMINOS.keys()) + ['funny'] * len(FUNNY_PIECE)
+FUNNY_NAMES = list(FUNNY_PIECE.keys())
+FIRST_FUNNY_ID = len(TETROMINOS)
+GIFT_IDS = np.array([PIECE_TYPES.index('I'), PIECE_TYPES.index('O')])
+
+PAD = 4
+MATRIX_ROWS = 5
+FLOOR_ROWS = MATRIX_ROWS
+LINE_BONUS = np.array([0, 0, 100, 200, 300])
+
+
+def _build_mask_table():
+    """Pack every piece rotation into an array of row masks."""
+    shapes = [PIECE_SHAPES[piece_type] for piece_type in TETROMINOS]
+    shapes += [(FUNNY_SHAPES[name],) for name in FUNNY_NAMES]
+    masks = np.zeros((len(shapes), 4, MATRIX_ROWS), dtype=np.int64)
+    rotations = np.zeros(len(shapes), dtype=np.int64)
+    for piece_id, rotation_shapes in enumerate(shapes):
+        rotations[piece_id] = len(rotation_shapes)
+        for rotation in range(4):
+            shape = rotation_shapes[rotation % len(rotation_shapes)]
+            for offset, mask in shape.masks:
+                masks[piece_id, rotation, offset] = mask
+    return masks, rotations
+
+
+PIECE_MASKS, PIECE_ROTATIONS = _build_mask_table()
+
+
+class BatchTetrisGame:
+    """
+    N independent Tetris duels stepped together with NumPy.
+    """
+
+    def __init__(self, n_games, grid_width=10, grid_height=20, seed=None):
+        """
+        Creates the batch and starts a fresh game in every duel.
+
+        :param n_games: Number of duels simulated together.
+        :param grid_width: Number of columns of every board.
+        :param grid_height: Number of rows of every board.
+        :param seed: Seed of the batch's random generator.
+        """
+        self.n_games = n_games
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.rng = np.random.default_rng(seed)
+
+        wall = (1 << PAD) - 1
+        self.full_row = (1 << (grid_width + 2 * PAD)) - 1
+        self.empty_row = wall | (wall << (grid_width + PAD))
+        self.spawn_col = grid_width // 2 - 2
+        self.initialize_game()
+
+    def initialize_game(self):
+        """Reset every duel to an empty board with fresh pieces."""
+        n, height = self.n_games, self.grid_height
+        self.rows = np.full((n, 2, height + FLOOR_ROWS), self.full_row, dtype=np.int64)
+        self.rows[:, :, :height] = self.empty_row
+        self.scores = np.zeros((n, 2), dtype=np.int64)
+        self.lines_completed = np.zeros((n, 2), dtype=np.int64)
+        self.last_cleared_lines = np.zeros((n, 2), dtype=np.int64)
+        self.funny_piece_thresholds = np.full((n, 2), 3000, dtype=np.int64)
+        self.surprise_gift_pending = np.zeros((n, 2), dtype=bool)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.ticks = np.zeros(n, dtype=np.int64)
+
+        self.current_pieces = np.zeros((n, 2), dtype=np.int64)
+        self.next_pieces = np.zeros((n, 2), dtype=np.int64)
+        self.piece_rows = np.zeros((n, 2), dtype=np.int64)
+        self.piece_cols = np.full((n, 2), self.spawn_col, dtype=np.int64)
+        self.piece_rotations = np.zeros((n, 2), dtype=np.int64)
+
+        everyone = np.arange(n)
+        for player in (0, 1):
+            self.next_pieces[:, player] = self._generate_pieces(everyone, player)
+        for player in (0, 1):
+            self._spawn(everyone, player)
+
+    def _generate_pieces(self, games, player):
+        """Draw the next piece of the given games, applying gifts and funny pieces."""
+        # Comme TetrisGame.generate_piece, un seul tirage par pièce
+        pieces = np.empty(len(games), dtype=np.int64)
+
+        # A funny piece takes precedence over a pending gift, which then waits
+        funny = self.scores[games, player] >= self.funny_piece_thresholds[games, player]
+        if funny.any():
+            self.funny_piece_thresholds[games[funny], player] += 3000
+            pieces[funny] = FIRST_FUNNY_ID + self.rng.integers(0, len(FUNNY_NAMES), size=int(funny.sum()))
+
+        gift = self.surprise_gift_pending[games, player] & ~funny
+        if gift.any():
+            pieces[gift] = GIFT_IDS[self.rng.integers(0, 2, size=int(gift.sum()))]
+            self.surprise_gift_pending[games[gift], player] = False
+
+        regular = ~(funny | gift)
+        pieces[regular] = self.rng.integers(0, FIRST_FUNNY_ID, size=int(regular.sum()))
+        return pieces
+
+    def _spawn(self, games, player):
+        """Bring in the next piece of the given games and detect top-outs."""
+        self.current_pieces[games, player] = self.next_pieces[games, player]
+        self.next_pieces[games, player] = self._generate_pieces(games, player)
+        self.piece_rows[games, player] = 0
+        self.piece_cols[games, player] = self.spawn_col
+        self.piece_rotations[games, player] = 0
+        blocked = ~self._fits(games, player, self.piece_rows[games, player],
+                              self.piece_cols[games, player], self.piece_rotations[games, player])
+        self.game_over[games[blocked]] = True
+
+    def _piece_masks(self, games, player, cols, rotations):
+        """Row masks of the games' current pieces, shifted to their columns."""
+        masks = PIECE_MASKS[self.current_pieces[games, player], rotations]
+        return masks << (cols + PAD)[:, None]
+
+    def _fits(self, games, player, rows, cols, rotations):
+        """Vectorized collision test: True where the piece fits at (rows, cols, rotations)."""
+        masks = self._piece_masks(games, player, cols, rotations)
+        index = rows[:, None] + np.arange(MATRIX_ROWS)
+        board = np.take_along_axis(self.rows[games, player], index, axis=1)
+        return ~((board & masks) != 0).any(axis=1)
+
+    def _shift(self, games, player, delta):
+        """Move pieces one column sideways where possible."""
+        cols = self.piece_cols[games, player] + delta
+        ok = self._fits(games, player, self.piece_rows[games, player], cols, self.piece_rotations[games, player])
+        self.piece_cols[games[ok], player] = cols[ok]
+
+    def _rotate(self, games, player):
+        """Rotate pieces where possible; funny pieces and O pieces do not rotate."""
+        count = PIECE_ROTATIONS[self.current_pieces[games, player]]
+        rotations = (self.piece_rotations[games, player] + 1) % count
+        ok = self._fits(games, player, self.piece_rows[games, player], self.piece_cols[games, player], rotations)
+        self.piece_rotations[games[ok], player] = rotations[ok]
+
+    def _fall(self, games, player):
+        """Move pieces down one row, settling the ones that cannot move."""
+        rows = self.piece_rows[games, player] + 1
+        ok = self._fits(games, player, rows, self.piece_cols[games, player], self.piece_rotations[games, player])
+        self.piece_rows[games[ok], player] = rows[ok]
+        if not ok.all():
+            self._settle(games[~ok], player)
+
+    def _hard_drop(self, games, player):
+        """Drop pieces to their landing rows and settle them."""
+        falling = games
+        while len(falling):
+            rows = self.piece_rows[falling, player] + 1
+            ok = self._fits(falling, player, rows, self.piece_cols[falling, player],
+                            self.piece_rotations[falling, player])
+            self.piece_rows[falling[ok], player] = rows[ok]
+            falling = falling[ok]
+        self._settle(games, player)
+
+    def _settle(self, games, player):
+        """Lock pieces, clear completed lines, score them and spawn the next pieces."""
+        if not len(games):
+            return
+        height = self.grid_height
+        masks = self._piece_masks(games, player, self.piece_cols[games, player], self.piece_rotations[games, player])
+        boards = self.rows[games, player]
+        index = self.piece_rows[games, player][:, None] + np.arange(MATRIX_ROWS)
+        np.put_along_axis(boards, index, np.take_along_axis(boards, index, axis=1) | masks, axis=1)
+
+        # Compaction en une passe: les lignes pleines passent en tête puis sont vidées
+        full = boards[:, :height] == self.full_row
+        cleared = full.sum(axis=1)
+        if cleared.any():
+            order = np.argsort(~full, axis=1, kind='stable')
+            playfield = np.take_along_axis(boards[:, :height], order, axis=1)
+            playfield[np.arange(height) < cleared[:, None]] = self.empty_row
+            boards[:, :height] = playfield
+        self.rows[games, player] = boards
+
+        self.last_cleared_lines[games, player] = cleared
+        self.lines_completed[games, player] += cleared
+        points = 50 * cleared + LINE_BONUS[cleared]
+        funny_bonus = (cleared > 0) & (self.current_pieces[games, player] >= FIRST_FUNNY_ID)
+        self.scores[games, player] += points + 100 * funny_bonus
+        self.surprise_gift_pending[games[cleared == 2], 1 - player] = True
+
+        self._spawn(games, player)
+
+    def step(self, actions=None):
+        """
+        Advance every running duel by one tick.
+
+        :param actions: Optional integer array of shape (N, 2) with one action
+                        code (NO_ACTION, LEFT, RIGHT, DOWN, ROTATE, DROP) per
+                        player; player 0 is the human board, 1 the AI board.
+        :return: The boolean array of finished duels.
+        """
+        if actions is not None:
+            actions = np.asarray(actions)
+            for player in (0, 1):
+                running = ~self.game_over
+                column = actions[:, player]
+                for code, handler in ((LEFT, lambda g, p: self._shift(g, p, -1)),
+                                      (RIGHT, lambda g, p: self._shift(g, p, 1)),
+                                      (DOWN, self._fall),
+                                      (ROTATE, self._rotate),
+                                      (DROP, self._hard_drop)):
+                    games = np.flatnonzero(running & (column == code))
+                    if len(games):
+                        handler(games, player)
+
+        running = np.flatnonzero(~self.game_over)
+        for player in (0, 1):
+            self._fall(running, player)
+        self.ticks[running] += 1
+        return self.game_over
+
+    def grid(self, game, player):
+        """Return one board as a (height, width) boolean array."""
+        rows = self.rows[game, player, :self.grid_height]
+        return ((rows[:, None] >> (np.arange(self.grid_width) + PAD)) & 1).astype(bool)
+
+    def board_features(self, player):
+        """
+        Computes the board features (see features.FEATURE_NAMES) of every duel.
+
+        :param player: 0 for the human board, 1 for the AI board.
+        :return: An (n_games, len(FEATURE_NAMES)) int64 array.
+        """
+        rows = (self.rows[:, player, :self.grid_height] >> PAD) & ((1 << self.grid_width) - 1)
+        return batch_features(rows, self.grid_width)
@@ -0,0 +1,511 @@
+# tetris_duel/src/board.py
+
+"""
+Représentation bitboard d'une grille de Tetris.
+
+Each row of the board is stored as an integer bitmask (bit ``c`` is set when
+column ``c`` is occupied), with a parallel ``bytearray`` colour plane holding
+a small code for the piece type of every cell. Collision tests, locking and
+full-row detection are bitwise operations on the row masks. A transposed copy
+(one bitmask per column, bit ``r`` set when row ``r`` is occupied) answers
+column height and landing-row queries in constant time per column; column
+heights, holes, bumpiness and the aggregate height are kept up to date from
+it on every write (see ColumnFeatures). Per-row
+fill counters are updated on every write, so completed rows are known as soon
+as a piece locks and are removed in a single compaction pass, while
+``Board.grid`` keeps the historical ``grid[row][col]`` access working as a
+live view over both planes.
+"""
+
+from collections import namedtuple
+
+# Codes of the colour plane: index 0 is an empty cell
+CELL_TYPES = [0, 'I', 'O', 'T', 'S', 'Z', 'J', 'L', 'funny']
+CELL_CODES = {value: code for code, value in enumerate(CELL_TYPES)}
+
+
+def cell_code(value):
+    """
+    Returns the colour-plane code of a grid value, registering unknown values.
+
+    :param value: A grid value (0 for an empty cell, usually a piece type).
+    :return: The code stored in the colour plane.
+    """
+    if not value:
+        return 0
+    code = CELL_CODES.get(value)
+    if code is None:
+        if len(CELL_TYPES) >= 256:
+            raise ValueError(f"Too many distinct cell values, cannot store {value!r}")
+        code = len(CELL_TYPES)
+        CELL_TYPES.append(value)
+        CELL_CODES[value] = code
+    return code
+
+
+# Geometry of one piece rotation, precomputed once per shape:
+# - cells: (row, col) offsets of the occupied cells inside the piece matrix
+# - masks: (row, mask) pairs, bit j of mask being column j of the matrix
+# - top, bottom, left, right: bounding box of the occupied cells
+# - profile: cells with no piece cell right below them (lowest cell of each
+#   vertical run), the only cells that can hit something when falling
+PieceShape = namedtuple('PieceShape', ['cells', 'masks', 'top', 'bottom', 'left', 'right', 'profile'])
+
+
+def shape_masks(shape):
+    """
+    Converts a piece matrix into per-row bitmasks.
+
+    :param shape: A piece matrix such as ``TETROMINOS['T'][0]``.
+    :return: A tuple of ``(row_offset, mask)`` pairs for every non-empty row,
+             where bit ``j`` of ``mask`` is column ``j`` of the matrix.
+    """
+    masks = []
+    for i, line in enumerate(shape):
+        mask = 0
+        for j, cell in enumerate(line):
+            if cell:
+                mask |= 1 << j
+        if mask:
+            masks.append((i, mask))
+    return tuple(masks)
+
+
+def build_piece_shape(shape):
+    """
+    Precomputes the geometry of a piece matrix.
+
+    :param shape: A piece matrix such as ``TETROMINOS['T'][0]``.
+    :return: A PieceShape describing the occupied cells.
+    """
+    cells = tuple((i, j) for i, line in enumerate(shape) for j, cell in enumerate(line) if cell)
+    occupied = set(cells)
+    rows = [i for i, _ in cells]
+    cols = [j for _, j in cells]
+    profile = tuple((i, j) for i, j in cells if (i + 1, j) not in occupied)
+    return PieceShape(cells, shape_masks(shape), min(rows), max(rows), min(cols), max(cols), profile)
+
+
+def compact_columns(cols, removed):
+    """
+    Removes rows from column bitmasks in place.
+
+    :param cols: Column bitmasks (bit ``r`` set when row ``r`` is occupied).
+    :param removed: Sorted indexes of the removed rows; removing them top-down
+                    keeps the remaining indexes valid.
+    """
+    for row in removed:
+        above = (1 << row) - 1
+        below = ~((1 << (row + 1)) - 1)
+        for c in range(len(cols)):
+            bits = cols[c]
+            cols[c] = ((bits & above) << 1) | (bits & below)
+
+
+class ColumnFeatures:
+    """
+    Board features maintained incrementally from column bitmasks.
+
+    Subclasses provide ``width``, ``height`` and ``cols``, and call
+    update_column whenever a column changes. Reading the features is then
+    O(1): ``heights`` and ``holes`` per column, plus the ``aggregate_height``,
+    ``total_holes`` and ``bumpiness`` totals used by the AI heuristics.
+    """
+
+    def reset_features(self):
+        """Recomputes every feature from the column bitmasks."""
+        self.heights = [0] * self.width
+        self.holes = [0] * self.width
+        self.aggregate_height = 0
+        self.total_holes = 0
+        self.bumpiness = 0
+        for c in range(self.width):
+            self.update_column(c)
+
+    def update_column(self, col):
+        """Refreshes the features of one column and the totals depending on it."""
+        bits = self.cols[col]
+        if bits:
+            height = self.height - ((bits & -bits).bit_length() - 1)
+            holes = height - bin(bits).count('1')
+        else:
+            height = holes = 0
+        heights = self.heights
+        old_height = heights[col]
+        if height != old_height:
+            if col > 0:
+                left = heights[col - 1]
+                self.bumpiness += abs(height - left) - abs(old_height - left)
+            if col < self.width - 1:
+                right = heights[col + 1]
+                self.bumpiness += abs(height - right) - abs(old_height - right)
+            heights[col] = height
+            self.aggregate_height += height - old_height
+        self.total_holes += holes - self.holes[col]
+        self.holes[col] = holes
+
+    def copy_features(self, other):
+        """Copies the features of another ColumnFeatures without allocating."""
+        self.heights[:] = other.heights
+        self.holes[:] = other.holes
+        self.aggregate_height = other.aggregate_height
+        self.total_holes = other.total_holes
+        self.bumpiness = other.bumpiness
+
+    def features(self):
+        """
+        Returns the AI's surface features.
+
+        :return: A tuple (aggregate_height, holes, bumpiness).
+        """
+        return self.aggregate_height, self.total_holes, self.bumpiness
+
+
+class Board(ColumnFeatures):
+    """
+    A single player's grid stored as row bitmasks plus a colour plane.
+    """
+
+    def __init__(self, width=10, height=20):
+        """
+        Creates an empty board.
+
+        :param width: Number of columns.
+        :param height: Number of rows.
+        """
+        self.width = width
+        self.height = height
+        self.full_mask = (1 << width) - 1
+        self.rows = [0] * height
+        self.cols = [0] * width
+        self.fill = [0] * height
+        self.full_rows = set()
+        self.colors = bytearray(width * height)
+        self.grid = GridView(self)
+        self.reset_features()
+
+    def clear(self):
+        """Empties the board in place."""
+        self.rows[:] = [0] * self.height
+        self.cols[:] = [0] * self.width
+        self.fill[:] = [0] * self.height
+        self.full_rows.clear()
+        self.colors[:] = bytes(self.width * self.height)
+        self.reset_features()
+
+    def get(self, row, col):
+        """Returns the value stored at (row, col), 0 when the cell is empty."""
+        if not (self.rows[row] >> col) & 1:
+            return 0
+        return CELL_TYPES[self.colors[row * self.width + col]]
+
+    def set(self, row, col, value):
+        """Stores a value at (row, col); a falsy value empties the cell."""
+        code = cell_code(value)
+        bit = 1 << col
+        was_set = self.rows[row] & bit
+        if code:
+            self.rows[row] |= bit
+            self.cols[col] |= 1 << row
+            if not was_set:
+                self._count(row, 1)
+        else:
+            self.rows[row] &= ~bit
+            self.cols[col] &= ~(1 << row)
+            if was_set:
+                self._count(row, -1)
+        self.colors[row * self.width + col] = code
+        self.update_column(col)
+
+    def _count(self, row, delta):
+        """Updates a row's fill counter and the set of completed rows."""
+        self.fill[row] += delta
+        if self.fill[row] == self.width:
+            self.full_rows.add(row)
+        else:
+            self.full_rows.discard(row)
+
+    def set_row(self, row, values):
+        """Replaces a whole row with the given sequence of values."""
+        for col in range(self.width):
+            self.set(row, col, values[col])
+
+    def fits(self, piece, row, col):
+        """
+        Tests whether a piece can occupy the board at the given position.
+
+        :param piece: The PieceShape of the piece.
+        :param row: Board row of the piece matrix's top edge.
+        :param col: Board column of the piece matrix's left edge.
+        :return: True if every cell is inside the board and empty.
+        """
+        if (row + piece.top < 0 or row + piece.bottom >= self.height
+                or col + piece.left < 0 or col + piece.right >= self.width):
+            return False
+        rows = self.rows
+        if col >= 0:
+            for offset, mask in piece.masks:
+                if rows[row + offset] & (mask << col):
+                    return False
+        else:
+            for offset, mask in piece.masks:
+                if rows[row + offset] & (mask >> -col):
+                    return False
+        return True
+
+    def place(self, piece, row, col, value):
+        """
+        Writes a piece into the board, ignoring cells outside of it.
+
+        :param piece: The PieceShape of the piece.
+        :param row: Board row of the piece matrix's top edge.
+        :param col: Board column of the piece matrix's left edge.
+        :param value: The value stored in the colour plane (the piece type).
+        """
+        code = cell_code(value)
+        width = self.width
+        touched = 0
+        for offset, mask in piece.masks:
+            r = row + offset
+            if r < 0 or r >= self.height:
+                continue
+            shifted = (mask << col if col >= 0 else mask >> -col) & self.full_mask
+            touched |= shifted
+            added = 0
+            row_bit = 1 << r
+            base = r * width
+            bits = shifted & ~self.rows[r]
+            self.rows[r] |= shifted
+            while shifted:
+                low = shifted & -shifted
+                c = low.bit_length() - 1
+                self.cols[c] |= row_bit
+                self.colors[base + c] = code
+                if bits & low:
+                    added += 1
+                shifted ^= low
+            if added:
+                self._count(r, added)
+        while touched:
+            low = touched & -touched
+            self.update_column(low.bit_length() - 1)
+            touched ^= low
+
+    def column_height(self, col):
+        """Returns the height of the highest occupied cell of a column (0 if empty)."""
+        return self.heights[col]
+
+    def drop_distance(self, piece, row, col):
+        """
+        Computes how many rows a piece can fall before touching something.
+
+        Only the piece's bottom profile is tested: for each of those cells the
+        first occupied cell below it is read from the column bitmask, so the
+        cost does not depend on the drop height.
+
+        :param piece: The PieceShape of the piece.
+        :param row: Current board row of the piece matrix's top edge.
+        :param col: Current board column of the piece matrix's left edge.
+        :return: The number of free rows under the piece.
+        """
+        cols = self.cols
+        distance = self.height
+        for i, j in piece.profile:
+            r = row + i
+            below = cols[col + j] >> (r + 1)
+            if below:
+                d = (below & -below).bit_length() - 1
+            else:
+                d = self.height - 1 - r
+            if d < distance:
+                distance = d
+        return distance
+
+    def landing_row(self, piece, row, col):
+        """Returns the row where a piece dropped from (row, col) comes to rest."""
+        return row + self.drop_distance(piece, row, col)
+
+    def is_full(self, row):
+        """Returns True if every cell of the row is occupied."""
+        return self.fill[row] == self.width
+
+    def remove_row(self, row):
+        """Deletes a row and shifts every row above it down by one."""
+        self.remove_rows([row])
+
+    def remove_rows(self, rows):
+        """
+        Deletes several rows at once, compacting the board in a single pass.
+
+        :param rows: Indexes of the rows to delete.
+        :return: The number of rows deleted.
+        """
+        removed = sorted(set(rows))
+        count = len(removed)
+        if not count:
+            return 0
+        width = self.width
+        new_rows = [0] * count
+        new_fill = [0] * count
+        new_colors = bytearray(count * width)
+        start = 0
+        for row in removed + [self.height]:
+            new_rows += self.rows[start:row]
+            new_fill += self.fill[start:row]
+            new_colors += self.colors[start * width:row * width]
+            start = row + 1
+        self.rows[:] = new_rows
+        self.fill[:] = new_fill
+        self.colors[:] = new_colors
+
+        compact_columns(self.cols, removed)
+        for c in range(width):
+            self.update_column(c)
+
+        if self.full_rows.difference(removed):
+            self.full_rows = {r for r, n in enumerate(self.fill) if n == width}
+        else:
+            self.full_rows.clear()
+        return count
+
+    def clear_full_rows(self):
+        """
+        Deletes every completed row.
+
+        :return: The number of rows cleared.
+        """
+        if not self.full_rows:
+            return 0
+        return self.remove_rows(self.full_rows)
+
+    def snapshot(self):
+        """
+        Captures the board as a compact immutable value.
+
+        :return: A tuple (rows, cols, fill, colors) of int tuples and bytes.
+        """
+        return tuple(self.rows), tuple(self.cols), tuple(self.fill), bytes(self.colors)
+
+    def restore(self, state):
+        """Restores in place a value returned by snapshot()."""
+        rows, cols, fill, colors = state
+        self.rows[:] = rows
+        self.cols[:] = cols
+        self.fill[:] = fill
+        self.colors[:] = colors
+        width = self.width
+        self.full_rows = {r for r, n in enumerate(fill) if n == width}
+        self.reset_features()
+
+    def load(self, rows, cols):
+        """
+        Loads occupancy bitmasks into the board, e.g. from a MoveSimulator.
+
+        The colour plane is reset: loaded cells read back as 0-coded values,
+        which is fine for boards only used for searching.
+
+        :param rows: Row bitmasks, top row first.
+        :param cols: The matching column bitmasks.
+        """
+        self.rows[:] = rows
+        self.cols[:] = cols
+        width = self.width
+        self.fill[:] = [bin(bits).count('1') for bits in rows]
+        self.full_rows = {r for r, n in enumerate(self.fill) if n == width}
+        self.colors[:] = bytes(width * self.height)
+        self.reset_features()
+
+    def to_list(self):
+        """Returns the board as a fresh list of lists of grid values."""
+        width = self.width
+        colors = self.colors
+        grid = []
+        for r, bits in enumerate(self.rows):
+            base = r * width
+            grid.append([CELL_TYPES[colors[base + c]] if (bits >> c) & 1 else 0
+                         for c in range(width)])
+        return grid
+
+
+class RowView:
+    """Live list-like view of one board row."""
+
+    __slots__ = ('board', 'row')
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.width
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return [self.board.get(self.row, c) for c in range(self.board.width)[col]]
+        if col < 0:
+            col += self.board.width
+        if not 0 <= col < self.board.width:
+            raise IndexError("column index out of range")
+        return self.board.get(self.row, col)
+
+    def __setitem__(self, col, value):
+        if col < 0:
+            col += self.board.width
+        if not 0 <= col < self.board.width:
+            raise IndexError("column index out of range")
+        self.board.set(self.row, col, value)
+
+    def __iter__(self):
+        board = self.board
+        for col in range(board.width):
+            yield board.get(self.row, col)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class GridView:
+    """Live ``grid[row][col]`` view of a Board, kept for backward compatibility."""
+
+    __slots__ = ('board',)
+
+    def __init__(self, board):
+        self.board = board
+
+    def __len__(self):
+        return self.board.height
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [RowView(self.board, r) for r in range(self.board.height)[row]]
+        if row < 0:
+            row += self.board.height
+        if not 0 <= row < self.board.height:
+            raise IndexError("row index out of range")
+        return RowView(self.board, row)
+
+    def __setitem__(self, row, values):
+        if row < 0:
+            row += self.board.height
+        if not 0 <= row < self.board.height:
+            raise IndexError("row index out of range")
+        self.board.set_row(row, values)
+
+    def __iter__(self):
+        for row in range(self.board.height):
+            yield RowView(self.board, row)
+
+    def __eq__(self, other):
+        try:
+            return [list(row) for row in self] == [list(row) for row in other]
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(self.board.to_list())
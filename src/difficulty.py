@@ -0,0 +1,124 @@
+# tetris_duel/src/difficulty.py
+
+"""
+Niveaux de difficulté et budget de recherche adaptatif de l'IA.
+
+A difficulty is a search budget: how many pieces the AI looks ahead, how
+many boards its beam search keeps, and for the easiest levels how many of
+the reachable placements it considers at all. Presets fix the budget;
+SearchBudgetController instead moves the AI along a ladder of budgets at
+runtime, from the measured frame times of the render loop and the measured
+AI decision times: it steps down when either exceeds its budget and steps up
+while both leave plenty of headroom.
+"""
+
+# Fixed difficulty presets: search depth (pieces searched), beam width and
+# maximum number of placements considered (None for all of them)
+DIFFICULTY_PRESETS = {
+    'easy': {'search_depth': 1, 'beam_width': 1, 'max_candidates': 6},
+    'medium': {'search_depth': 1, 'beam_width': 1, 'max_candidates': None},
+    'hard': {'search_depth': 2, 'beam_width': 4, 'max_candidates': None},
+    'expert': {'search_depth': 2, 'beam_width': 12, 'max_candidates': None}
+}
+
+# Budgets tried by the adaptive controller, from the cheapest to the strongest
+ADAPTIVE_LEVELS = (
+    {'search_depth': 1, 'beam_width': 1, 'max_candidates': None},
+    {'search_depth': 2, 'beam_width': 2, 'max_candidates': None},
+    {'search_depth': 2, 'beam_width': 4, 'max_candidates': None},
+    {'search_depth': 2, 'beam_width': 8, 'max_candidates': None},
+    {'search_depth': 2, 'beam_width': 16, 'max_candidates': None}
+)
+
+
+def apply_budget(ai, budget):
+    """
+    Sets the search budget of an AI.
+
+    The random noise of the evaluation is turned off: the strength of the AI
+    is set by its budget only.
+
+    :param ai: The AI to configure.
+    :param budget: A dict with search_depth, beam_width and max_candidates.
+    """
+    ai.search_depth = budget['search_depth']
+    ai.planner.beam_width = budget['beam_width']
+    ai.max_candidates = budget['max_candidates']
+    ai.noise = 0
+    ai.weights['random'] = 0
+
+
+def apply_difficulty(ai, difficulty):
+    """
+    Configures an AI with a difficulty preset.
+
+    :param ai: The AI to configure.
+    :param difficulty: A key of DIFFICULTY_PRESETS.
+    """
+    if difficulty not in DIFFICULTY_PRESETS:
+        raise ValueError(f"Unknown difficulty: {difficulty}")
+    apply_budget(ai, DIFFICULTY_PRESETS[difficulty])
+
+
+class SearchBudgetController:
+    """
+    Raises or lowers the AI search budget from measured frame and decision times.
+    """
+
+    def __init__(self, ai, performance, target_fps=60, decision_budget=0.05, window=10, levels=ADAPTIVE_LEVELS,
+                 level=None):
+        """
+        Creates the controller and applies its starting budget.
+
+        :param ai: The AI whose budget is controlled (the one making the decisions).
+        :param performance: The PerformanceManager measuring the render loop.
+        :param target_fps: Frame rate the render loop must keep.
+        :param decision_budget: Longest acceptable AI decision, in seconds; it
+                                also caps the beam search's time budget.
+        :param window: Number of decisions between two adjustments.
+        :param levels: Budgets, from the cheapest to the strongest.
+        :param level: Index of the starting budget (the middle one by default).
+        """
+        self.ai = ai
+        self.performance = performance
+        self.target_fps = target_fps
+        self.decision_budget = decision_budget
+        self.window = window
+        self.levels = levels
+        self.level = len(levels) // 2 if level is None else level
+        # Nombre de décisions mesurées lors du dernier ajustement
+        self.decisions_seen = self.decision_count()
+        ai.planner.time_budget = decision_budget
+        apply_budget(ai, levels[self.level])
+
+    def decision_count(self):
+        """Number of decisions measured by the AI so far."""
+        histogram = self.ai.metrics.histograms.get('wall_time')
+        return histogram.count if histogram else 0
+
+    def update(self):
+        """
+        Adjusts the budget once ``window`` new decisions have been measured.
+
+        :return: The index of the budget in use.
+        """
+        count = self.decision_count()
+        if count - self.decisions_seen < self.window:
+            return self.level
+        self.decisions_seen = count
+
+        # Pire décision et temps de frame moyen sur la dernière fenêtre
+        decision_time = max(list(self.ai.metrics.histograms['wall_time'].samples)[-self.window:])
+        frame_times = self.performance.frame_times[-self.window:]
+        frame_time = sum(frame_times) / len(frame_times) if frame_times else 0
+        frame_budget = 1.0 / self.target_fps
+
+        level = self.level
+        if frame_time > frame_budget or decision_time > self.decision_budget:
+            level = max(0, level - 1)
+        elif frame_time < frame_budget / 2 and decision_time < self.decision_budget / 4:
+            level = min(len(self.levels) - 1, level + 1)
+        if level != self.level:
+            self.level = level
+            apply_budget(self.ai, self.levels[level])
+        return self.level
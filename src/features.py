@@ -0,0 +1,195 @@
+# tetris_duel/src/features.py
+
+"""
+Extraction de caractéristiques de plateau à partir des masques de lignes.
+
+extract_features returns a fixed-order feature vector (see FEATURE_NAMES)
+for a board given as row bitmasks, working on whole rows with bitwise
+operations rather than cell by cell; batch_features computes the same vector
+for a stack of boards with NumPy, for instance every board of a
+BatchTetrisGame. placement_features adds what depends on the piece just
+placed (landing height, eroded piece cells).
+
+Definitions (the walls and the floor count as filled):
+
+- ``holes``: empty cells with a block somewhere above them;
+- ``covered_cells``: blocks with a hole somewhere below them;
+- ``row_transitions`` / ``column_transitions``: filled/empty changes
+  between horizontally / vertically adjacent cells;
+- ``wells``: for every well (empty cells with filled neighbours on both
+  sides and nothing above), 1 + 2 + ... + depth;
+- ``tetris_ready``: number of bottom rows that are full except for one
+  open cell, the same column for all of them.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FEATURE_NAMES = (
+    'aggregate_height', 'max_height', 'holes', 'bumpiness', 'row_transitions',
+    'column_transitions', 'wells', 'covered_cells', 'tetris_ready'
+)
+PLACEMENT_FEATURE_NAMES = ('landing_height', 'eroded_cells')
+
+
+def _popcount(bits):
+    """Number of set bits of an int."""
+    return bin(bits).count('1')
+
+
+def extract_features(rows, width):
+    """
+    Computes the board features from row bitmasks.
+
+    :param rows: Row bitmasks, top row first (bit c set: column c filled).
+    :param width: Number of columns of the board.
+    :return: A tuple of ints in FEATURE_NAMES order.
+    """
+    height = len(rows)
+    full_mask = (1 << width) - 1
+    heights = [0] * width
+    holes = 0
+    row_transitions = 0
+    column_transitions = 0
+    wells = 0
+    covered = 0
+    # Longueur du puits en cours dans chaque colonne
+    well_runs = [0] * width
+    well_active = 0
+    previous = 0
+    hole_rows = []
+
+    for r, bits in enumerate(rows):
+        # Les murs comptent comme des cases pleines
+        walled = (bits << 1) | 1 | (1 << (width + 1))
+        row_transitions += _popcount((walled ^ (walled >> 1)) & ((1 << (width + 1)) - 1))
+        if r:
+            column_transitions += _popcount(previous ^ bits)
+        previous = bits
+
+        row_holes = covered & ~bits & full_mask
+        holes += _popcount(row_holes)
+        hole_rows.append(row_holes)
+
+        new_blocks = bits & ~covered
+        while new_blocks:
+            low = new_blocks & -new_blocks
+            heights[low.bit_length() - 1] = height - r
+            new_blocks ^= low
+        covered |= bits
+
+        # Case de puits: vide, voisins pleins (ou mur) et rien au-dessus
+        well = ~walled & (walled << 1) & (walled >> 1)
+        well = (well >> 1) & full_mask & ~covered
+        ended = well_active & ~well
+        while ended:
+            low = ended & -ended
+            well_runs[low.bit_length() - 1] = 0
+            ended ^= low
+        well_active = well
+        while well:
+            low = well & -well
+            c = low.bit_length() - 1
+            well_runs[c] += 1
+            wells += well_runs[c]
+            well ^= low
+    column_transitions += _popcount(full_mask & ~previous)  # Le sol est plein
+
+    # Blocs au-dessus d'un trou, et lignes prêtes pour un tetris, du bas vers le haut
+    covered_cells = 0
+    holes_below = 0
+    tetris_ready = 0
+    ready_column = None
+    counting = True
+    above = [0] * height
+    mask = 0
+    for r in range(height):
+        above[r] = mask
+        mask |= rows[r]
+    for r in range(height - 1, -1, -1):
+        bits = rows[r]
+        covered_cells += _popcount(bits & holes_below)
+        holes_below |= hole_rows[r]
+        if counting:
+            missing = full_mask & ~bits
+            if (_popcount(missing) == 1 and not missing & above[r]
+                    and (ready_column is None or missing == ready_column)):
+                ready_column = missing
+                tetris_ready += 1
+            else:
+                counting = False
+
+    bumpiness = sum(abs(heights[c] - heights[c + 1]) for c in range(width - 1))
+    return (sum(heights), max(heights), holes, bumpiness, row_transitions,
+            column_transitions, wells, covered_cells, tetris_ready)
+
+
+def placement_features(rows, shape, row, col, width):
+    """
+    Computes the features that depend on the piece placed last.
+
+    :param rows: Row bitmasks of the board before the piece is locked.
+    :param shape: The PieceShape placed.
+    :param row: Row of the piece matrix.
+    :param col: Column of the piece matrix.
+    :param width: Number of columns of the board.
+    :return: A tuple (landing_height, eroded_cells): the height of the
+             middle of the piece above the floor, and lines cleared times the
+             number of piece cells removed by them.
+    """
+    height = len(rows)
+    full_mask = (1 << width) - 1
+    lines = 0
+    removed_cells = 0
+    for offset, mask in shape.masks:
+        shifted = mask << col if col >= 0 else mask >> -col
+        if rows[row + offset] | shifted == full_mask:
+            lines += 1
+            removed_cells += _popcount(shifted)
+    landing_height = height - row - (shape.top + shape.bottom) / 2
+    return landing_height, lines * removed_cells
+
+
+def batch_features(boards, width):
+    """
+    Computes extract_features for a stack of boards with NumPy.
+
+    :param boards: An (N, height) integer array of row bitmasks.
+    :param width: Number of columns of the boards.
+    :return: An (N, len(FEATURE_NAMES)) int64 array.
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    n, height = boards.shape
+    cells = ((boards[:, :, None] >> np.arange(width)) & 1).astype(bool)
+    covered = np.logical_or.accumulate(cells, axis=1)
+    heights = covered.sum(axis=1)
+    holes_mask = covered & ~cells
+
+    walled = np.pad(cells, ((0, 0), (0, 0), (1, 1)), constant_values=True)
+    row_transitions = (walled[:, :, 1:] != walled[:, :, :-1]).sum(axis=(1, 2))
+    floored = np.pad(cells, ((0, 0), (0, 1), (0, 0)), constant_values=True)
+    column_transitions = (floored[:, 1:] != floored[:, :-1]).sum(axis=(1, 2))
+
+    # Puits: longueur courante de chaque suite de cases de puits dans une colonne
+    well = ~cells & walled[:, :, :-2] & walled[:, :, 2:] & ~covered
+    counts = np.cumsum(well, axis=1)
+    resets = np.maximum.accumulate(np.where(well, 0, counts), axis=1)
+    wells = np.where(well, counts - resets, 0).sum(axis=(1, 2))
+
+    # Blocs ayant un trou plus bas dans leur colonne
+    holes_below = np.logical_or.accumulate(holes_mask[:, ::-1], axis=1)[:, ::-1]
+    holes_below = np.concatenate([holes_below[:, 1:], np.zeros((n, 1, width), dtype=bool)], axis=1)
+    covered_cells = (cells & holes_below).sum(axis=(1, 2))
+
+    # Lignes du bas pleines sauf une case ouverte, toujours dans la même colonne
+    missing = ~cells
+    covered_above = np.concatenate([np.zeros((n, 1, width), dtype=bool), covered[:, :-1]], axis=1)
+    ready = (missing.sum(axis=2) == 1) & ~(missing & covered_above).any(axis=2)
+    ready &= (missing == missing[:, -1:, :]).all(axis=2)
+    tetris_ready = np.cumprod(ready[:, ::-1], axis=1).sum(axis=1)
+
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+    return np.stack([heights.sum(axis=1), heights.max(axis=1), holes_mask.sum(axis=(1, 2)), bumpiness,
+                     row_transitions, column_transitions, wells, covered_cells, tetris_ready], axis=1)
@@ -1,19 +1,24 @@
 # tetris_duel/src/game.py
 
+"""
+Headless Tetris Duel simulation core.
+
+This module imports no GUI toolkit: notifications (gifts, funny pieces,
+points, game over...) are published through the optional ``on_event`` hook
+of TetrisGame instead of being printed. What changed on each board since it
+was last drawn is collected as a ChangeSet (see TetrisGame.take_changes).
+"""
+
 import random
-import copy
+from collections import namedtuple
 
 # Handle different import scenarios
 try:
     # For direct running from game.py
-    from scoreboard import Scoreboard
+    from board import Board, build_piece_shape
 except ImportError:
-    try:
-        # For running from project root
-        from src.scoreboard import Scoreboard
-    except ImportError:
-        # Fallback if scoreboard isn't available
-        Scoreboard = None
+    # For running from project root
+    from src.board import Board, build_piece_shape
 
 # Définition des pièces de Tetris et leurs rotations
 TETROMINOS = {
@@ -164,14 +169,85 @@ FUNNY_PIECE = {
 
 FUNNY_PIECE_COLOR = (255, 105, 180)  # Rose vif
 
+# Géométrie précalculée de chaque pièce et rotation (cellules, masques de
+# lignes, boîte englobante et profil du bas), construite une seule fois
+PIECE_SHAPES = {
+    piece_type: tuple(build_piece_shape(shape) for shape in rotations)
+    for piece_type, rotations in TETROMINOS.items()
+}
+FUNNY_SHAPES = {
+    name: build_piece_shape(rotations[0])
+    for name, rotations in FUNNY_PIECE.items()
+}
+
+PLAYERS = ('human', 'ai')
+
+# Changes of a board since the last take_changes: cells to redraw (old and new
+# piece footprint, locked cells), rows shifted by line clears (a range from the
+# top row) and whether the whole board must be redrawn
+ChangeSet = namedtuple('ChangeSet', ['cells', 'rows', 'full'])
+
+# Dictionnaires de pièces partagés par restore(); les pièces ne sont jamais modifiées
+_PIECES_BY_KEY = {}
+
+
+def piece_key(piece):
+    """Return a compact hashable key identifying a piece dict (None for no piece)."""
+    if piece is None:
+        return None
+    if piece['type'] == 'funny':
+        return ('funny', piece.get('funny_shape'))
+    return piece['type']
+
+
+def piece_from_key(key):
+    """Return the piece dict described by a key built with piece_key."""
+    if key is None:
+        return None
+    piece = _PIECES_BY_KEY.get(key)
+    if piece is None:
+        if isinstance(key, tuple):
+            funny_shape = key[1]
+            piece = {
+                'type': 'funny',
+                'shape': FUNNY_PIECE[funny_shape][0],
+                'color': FUNNY_PIECE_COLOR,
+                'funny_shape': funny_shape
+            }
+        else:
+            piece = {
+                'type': key,
+                'shape': TETROMINOS[key][0],
+                'color': PIECE_COLORS[key]
+            }
+        _PIECES_BY_KEY[key] = piece
+    return piece
+
+
+def piece_shape(piece, rotation=0):
+    """Return the precomputed PieceShape of a piece dict in the given rotation."""
+    # Handle special case for funny piece (funny pieces never rotate)
+    if piece.get('type') == 'funny':
+        funny_shape = piece.get('funny_shape')
+        if funny_shape in FUNNY_SHAPES and FUNNY_PIECE[funny_shape][0] is piece['shape']:
+            return FUNNY_SHAPES[funny_shape]
+        return build_piece_shape(piece['shape'])
+    # Regular tetromino
+    return PIECE_SHAPES[piece['type']][rotation]
+
+
+def piece_rotations(piece):
+    """Return the PieceShapes of every rotation of a piece dict."""
+    if piece.get('type') == 'funny':
+        return (piece_shape(piece),)
+    return PIECE_SHAPES[piece['type']]
+
+
 class TetrisGame:
     def __init__(self):
         """Initialize the Tetris game with default settings."""
         self.grid_width, self.grid_height = 10, 20  # Dimensions standards de la grille Tetris
-        self.grids = {
-            'human': [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)],
-            'ai': [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)]
-        }
+        self.reset_grids()
         self.current_pieces = {'human': None, 'ai': None}
         self.next_pieces = {'human': None, 'ai': None}
         self.piece_positions = {'human': [0, 3], 'ai': [0, 3]}  # [row, col] for each player
@@ -185,14 +261,19 @@ class TetrisGame:
         self.funny_piece_thresholds = {'human': 3000, 'ai': 3000}
         self.surprise_gift_pending = {'human': False, 'ai': False}
         self.last_cleared_lines = {'human': 0, 'ai': 0}
+        # Nombre de pièces apparues par joueur, identifie la pièce courante
+        self.piece_counts = {'human': 0, 'ai': 0}
+
+        # Optional notification hook, called as on_event(event, **details).
+        # Events: 'spawn', 'funny_piece', 'surprise_gift', 'gift_pending',
+        # 'points', 'funny_bonus', 'game_over' and 'rainbow'.
+        self.on_event = None
         
     def initialize_game(self):
         """Set up the game state for a new game."""
         # Réinitialiser les grilles
-        self.grids = {
-            'human': [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)],
-            'ai': [[0 for _ in range(self.grid_width)] for _ in range(self.grid_height)]
-        }
+        self.reset_grids()
+        self.piece_counts = {'human': 0, 'ai': 0}
         
         # Générer les pièces initiales et suivantes
         self.next_pieces = {'human': self.generate_piece('human'), 'ai': self.generate_piece('ai')}
@@ -208,14 +289,110 @@ class TetrisGame:
         self.surprise_gift_pending = {'human': False, 'ai': False}
         self.last_cleared_lines = {'human': 0, 'ai': 0}
 
+    def reset_grids(self):
+        """Create empty bitboards for both players.
+
+        ``self.grids[player]`` is a live ``grid[row][col]`` view over
+        ``self.boards[player]``, so code indexing the grids keeps working.
+        """
+        self.boards = {
+            'human': Board(self.grid_width, self.grid_height),
+            'ai': Board(self.grid_width, self.grid_height)
+        }
+        self.grids = {player: board.grid for player, board in self.boards.items()}
+        self.mark_all_changed()
+
+    def mark_all_changed(self):
+        """Make the next change set of each board cover the whole board."""
+        self.changed_cells = {player: set() for player in PLAYERS}
+        # Nombre de lignes, depuis le haut, décalées par des suppressions de lignes
+        self.shifted_rows = {player: 0 for player in PLAYERS}
+        self.full_changes = {player: True for player in PLAYERS}
+        # Type et cellules de la pièce courante lors du dernier take_changes
+        self.drawn_pieces = {player: None for player in PLAYERS}
+
+    def take_changes(self, player):
+        """
+        Return what changed on a board since the last call, and start over.
+
+        Moves and rotations are not recorded one by one: the footprint of the
+        current piece is compared with the one seen by the previous call, so
+        any number of moves between two frames costs one comparison.
+
+        :param player: The player ('human' or 'ai').
+        :return: A ChangeSet.
+        """
+        cells = self.changed_cells[player]
+        piece = self.current_pieces[player]
+        footprint = (piece_key(piece), tuple(self.get_current_piece_cells(player))) if piece else None
+        drawn = self.drawn_pieces[player]
+        if footprint != drawn:
+            if drawn:
+                cells.update(drawn[1])
+            if footprint:
+                cells.update(footprint[1])
+            self.drawn_pieces[player] = footprint
+        changes = ChangeSet(cells, range(self.shifted_rows[player]), self.full_changes[player])
+        self.changed_cells[player] = set()
+        self.shifted_rows[player] = 0
+        self.full_changes[player] = False
+        return changes
+
+    def snapshot(self):
+        """
+        Capture the full game state as a compact immutable value.
+
+        The value only holds tuples of ints, strings and bytes (boards as row
+        bitmasks, pieces as keys), so it is cheap to build, hash and store,
+        and restore() can bring the game back to it in place.
+        """
+        return (
+            tuple(self.boards[player].snapshot() for player in PLAYERS),
+            tuple(piece_key(self.current_pieces[player]) for player in PLAYERS),
+            tuple(piece_key(self.next_pieces[player]) for player in PLAYERS),
+            tuple(tuple(self.piece_positions[player]) for player in PLAYERS),
+            tuple(self.piece_rotations[player] for player in PLAYERS),
+            tuple(self.lines_completed[player] for player in PLAYERS),
+            tuple(self.scores[player] for player in PLAYERS),
+            tuple(self.funny_piece_thresholds[player] for player in PLAYERS),
+            tuple(self.surprise_gift_pending[player] for player in PLAYERS),
+            tuple(self.last_cleared_lines[player] for player in PLAYERS),
+            tuple(self.piece_counts[player] for player in PLAYERS),
+            self.game_over,
+            self.special_events_timer
+        )
+
+    def restore(self, state):
+        """Restore in place a state returned by snapshot()."""
+        (boards, current_pieces, next_pieces, positions, rotations, lines, scores,
+         thresholds, gifts, last_cleared, counts, self.game_over, self.special_events_timer) = state
+        for i, player in enumerate(PLAYERS):
+            self.boards[player].restore(boards[i])
+            self.current_pieces[player] = piece_from_key(current_pieces[i])
+            self.next_pieces[player] = piece_from_key(next_pieces[i])
+            self.piece_positions[player] = list(positions[i])
+            self.piece_rotations[player] = rotations[i]
+            self.lines_completed[player] = lines[i]
+            self.scores[player] = scores[i]
+            self.funny_piece_thresholds[player] = thresholds[i]
+            self.surprise_gift_pending[player] = gifts[i]
+            self.last_cleared_lines[player] = last_cleared[i]
+            self.piece_counts[player] = counts[i]
+        self.mark_all_changed()
+
+    def get_piece_shape(self, player):
+        """Return the precomputed PieceShape of the current piece and rotation."""
+        return piece_shape(self.current_pieces[player], self.piece_rotations[player])
+
     def generate_piece(self, player):
         """Générer une nouvelle pièce avec son type."""
         # Check if we should generate a funny piece (every 3000 points)
         if self.scores[player] >= self.funny_piece_thresholds[player]:
             self.funny_piece_thresholds[player] += 3000  # Set next threshold
-            print(f"Funny piece for {player}!")
             # Choisir une pièce rigolote (cœur ou étoile)
             funny_shape = random.choice(list(FUNNY_PIECE.keys()))
+            if self.on_event is not None:
+                self.on_event('funny_piece', player=player, shape=funny_shape)
             return {
                 'type': 'funny',
                 'shape': FUNNY_PIECE[funny_shape][0],
@@ -228,7 +405,8 @@ class TetrisGame:
             self.surprise_gift_pending[player] = False
             # Give an easy piece (I or O)
             easy_piece = random.choice(['I', 'O'])
-            print(f"Surprise gift for {player}: {easy_piece}!")
+            if self.on_event is not None:
+                self.on_event('surprise_gift', player=player, piece_type=easy_piece)
             return {
                 'type': easy_piece,
                 'shape': TETROMINOS[easy_piece][0],
@@ -251,15 +429,39 @@ class TetrisGame:
     def spawn_new_pieces(self):
         """Place de nouvelles pièces pour les deux joueurs."""
         for player in ['human', 'ai']:
-            self.current_pieces[player] = self.next_pieces[player]
-            self.next_pieces[player] = self.generate_piece(player)
-            self.piece_positions[player] = [0, self.grid_width // 2 - 2]
-            self.piece_rotations[player] = 0
-            
-            # Vérifier si le jeu est terminé
-            if self.check_collision(player):
-                self.game_over = True
-                print(f"Game over! {player.capitalize()} player lost.")
+            self.spawn_next_piece(player)
+
+    def spawn_next_piece(self, player):
+        """Faire apparaître la pièce suivante du joueur et vérifier la fin de partie."""
+        self.current_pieces[player] = self.next_pieces[player]
+        self.next_pieces[player] = self.generate_piece(player)
+        self.piece_positions[player] = [0, self.grid_width // 2 - 2]
+        self.piece_rotations[player] = 0
+        self.piece_counts[player] += 1
+        
+        # Vérifier si le jeu est terminé
+        if self.check_collision(player):
+            self.game_over = True
+            if self.on_event is not None:
+                self.on_event('game_over', player=player)
+        elif self.on_event is not None:
+            self.on_event('spawn', player=player, piece_id=self.piece_counts[player])
+
+    def step(self, human_action=None, ai_action=None):
+        """
+        Advance the simulation by one tick.
+
+        Each action is one of 'left', 'right', 'down', 'up' (rotate) or
+        'space' (hard drop), or None to let the piece fall on its own.
+
+        :return: True if the game is over.
+        """
+        if self.game_over:
+            return True
+        self.apply_action('human', human_action)
+        self.apply_action('ai', ai_action)
+        self.update_game_state()
+        return self.game_over
 
     def update_game_state(self):
         """Update the game state, including piece positions and scoring."""
@@ -284,108 +486,166 @@ class TetrisGame:
         if self.check_collision(player):
             # Restaurer l'ancienne position
             self.piece_positions[player] = old_position
-            # Fixer la pièce dans la grille
-            self.lock_piece(player)
-            # Vérifier les lignes complètes
-            completed_lines = self.check_for_completed_lines(player)
-            self.last_cleared_lines[player] = completed_lines
+            self.settle_piece(player)
+
+    def settle_piece(self, player):
+        """Fixer la pièce, compter les lignes et les points, puis engendrer la suivante."""
+        # Fixer la pièce dans la grille
+        self.lock_piece(player)
+        # Vérifier les lignes complètes
+        completed_lines = self.check_for_completed_lines(player)
+        self.last_cleared_lines[player] = completed_lines
+        
+        if completed_lines:
+            self.lines_completed[player] += completed_lines
+            
+            # Règle du cadeau surprise: Si un joueur complète 2 lignes, 
+            # l'adversaire reçoit une pièce facile
+            if completed_lines == 2:
+                opponent = 'ai' if player == 'human' else 'human'
+                self.surprise_gift_pending[opponent] = True
+                if self.on_event is not None:
+                    self.on_event('gift_pending', player=opponent)
+            
+            # Calculer le score selon les règles demandées
+            base_points = 50 * completed_lines
             
-            if completed_lines:
-                self.lines_completed[player] += completed_lines
-                
-                # Règle du cadeau surprise: Si un joueur complète 2 lignes, 
-                # l'adversaire reçoit une pièce facile
-                if completed_lines == 2:
-                    opponent = 'ai' if player == 'human' else 'human'
-                    self.surprise_gift_pending[opponent] = True
-                    print(f"Surprise gift pending for {opponent}")
-                
-                # Calculer le score selon les règles demandées
-                base_points = 50 * completed_lines
-                
-                # Apply bonuses
-                if completed_lines == 2:
-                    bonus = 100
-                elif completed_lines == 3:
-                    bonus = 200
-                elif completed_lines == 4:
-                    bonus = 300
-                else:
-                    bonus = 0
-                
-                total_points = base_points + bonus
-                self.scores[player] += total_points
-                
-                # Bonus pour les pièces rigolotes bien placées
-                if self.current_pieces[player].get('type') == 'funny':
-                    self.scores[player] += 100
-                    print(f"Bonus de 100 points pour pièce rigolote bien placée!")
+            # Apply bonuses
+            if completed_lines == 2:
+                bonus = 100
+            elif completed_lines == 3:
+                bonus = 200
+            elif completed_lines == 4:
+                bonus = 300
+            else:
+                bonus = 0
             
-            # Engendrer une nouvelle pièce
-            self.current_pieces[player] = self.next_pieces[player]
-            self.next_pieces[player] = self.generate_piece(player)
-            self.piece_positions[player] = [0, self.grid_width // 2 - 2]
-            self.piece_rotations[player] = 0
+            total_points = base_points + bonus
+            self.scores[player] += total_points
+            if self.on_event is not None:
+                self.on_event('points', player=player, base=base_points, bonus=bonus)
             
-            # Vérifier si le jeu est terminé
-            if self.check_collision(player):
-                self.game_over = True
-                print(f"Game over! {player.capitalize()} player lost.")
+            # Bonus pour les pièces rigolotes bien placées
+            if self.current_pieces[player].get('type') == 'funny':
+                self.scores[player] += 100
+                if self.on_event is not None:
+                    self.on_event('funny_bonus', player=player, points=100)
+        
+        # Engendrer une nouvelle pièce
+        self.spawn_next_piece(player)
 
     def lock_piece(self, player):
         """Fixer la pièce courante dans la grille."""
         piece = self.current_pieces[player]
-        
-        # Handle special case for funny piece
-        if piece.get('type') == 'funny':
-            shape = piece['shape']
-        else:
-            # Regular tetromino
-            shape = TETROMINOS[piece['type']][self.piece_rotations[player]]
-            
         row_offset, col_offset = self.piece_positions[player]
-        
-        for i in range(len(shape)):
-            for j in range(len(shape[i])):
-                if shape[i][j]:
-                    new_row, new_col = row_offset + i, col_offset + j
-                    if 0 <= new_row < self.grid_height and 0 <= new_col < self.grid_width:
-                        self.grids[player][new_row][new_col] = piece['type']
+        self.boards[player].place(self.get_piece_shape(player), row_offset, col_offset, piece['type'])
+        self.changed_cells[player].update(self.get_current_piece_cells(player))
 
     def check_for_completed_lines(self, player):
         """Vérifier et supprimer les lignes complétées."""
-        completed_lines = 0
-        # Check from bottom to top
-        row = self.grid_height - 1
-        while row >= 0:
-            if all(cell for cell in self.grids[player][row]):
-                completed_lines += 1
-                # Supprimer la ligne complétée
-                for r in range(row, 0, -1):
-                    self.grids[player][r] = self.grids[player][r-1][:]
-                self.grids[player][0] = [0 for _ in range(self.grid_width)]
-                # Ne pas incrémenter row car la nouvelle ligne déplacée doit être vérifiée
-            else:
-                row -= 1
-        
-        return completed_lines
+        # Les compteurs de remplissage tenus par lock_piece donnent directement
+        # les lignes complètes, supprimées en une seule passe de compactage
+        board = self.boards[player]
+        if board.full_rows:
+            # Toutes les lignes au-dessus de la plus basse supprimée descendent
+            self.shifted_rows[player] = max(self.shifted_rows[player], max(board.full_rows) + 1)
+        return board.clear_full_rows()
 
     def handle_user_input(self, input_command):
         """Handle user input for controlling the human player."""
-        if self.game_over:
+        self.apply_action('human', input_command)
+
+    def apply_action(self, player, action):
+        """Apply one control action ('left', 'right', 'down', 'up', 'space') for a player."""
+        if self.game_over or action is None:
             return
             
         # Mapper les commandes clavier aux actions
-        commands = {
-            'left': lambda: self.move_piece('human', 0, -1),
-            'right': lambda: self.move_piece('human', 0, 1),
-            'down': lambda: self.move_piece('human', 1, 0),
-            'up': lambda: self.rotate_piece('human'),
-            'space': lambda: self.hard_drop('human')
-        }
-        
-        if input_command in commands:
-            commands[input_command]()
+        if action == 'left':
+            self.move_piece(player, 0, -1)
+        elif action == 'right':
+            self.move_piece(player, 0, 1)
+        elif action == 'down':
+            self.move_piece(player, 1, 0)
+        elif action == 'up':
+            self.rotate_piece(player)
+        elif action == 'space':
+            self.hard_drop(player)
+
+    def apply_placement(self, player, rotation, row, col, path=None):
+        """
+        Lock the current piece at a target placement in one validated transition.
+
+        With a path (actions as for apply_action), the path is replayed on
+        the bitboard without touching the game and must lock the piece at the
+        target. Without a path, the piece must be able to rotate in place
+        (through every intermediate rotation, as rotate_piece turns it one
+        step at a time), slide along its current row to the target column and drop onto the
+        target row. Once validated, the piece is placed and settled once.
+
+        :param player: The player whose piece is placed.
+        :param rotation: Target rotation index.
+        :param row: Target row of the piece matrix.
+        :param col: Target column of the piece matrix.
+        :param path: Optional list of actions leading to the placement.
+        :return: True if the piece was locked there; False (and nothing
+                 changes) if the placement cannot be reached.
+        """
+        if self.game_over:
+            return False
+        shapes = piece_rotations(self.current_pieces[player])
+        rotation %= len(shapes)
+        if path is not None:
+            if self.trace_path(player, path) != (row, col, rotation):
+                return False
+        else:
+            board = self.boards[player]
+            shape = shapes[rotation]
+            start_row, start_col = self.piece_positions[player]
+            turned = self.piece_rotations[player]
+            while turned != rotation:
+                turned = (turned + 1) % len(shapes)
+                if not board.fits(shapes[turned], start_row, start_col):
+                    return False
+            step = 1 if col >= start_col else -1
+            if not all(board.fits(shape, start_row, c) for c in range(start_col, col + step, step)):
+                return False
+            if board.landing_row(shape, start_row, col) != row:
+                return False
+            
+        self.piece_positions[player] = [row, col]
+        self.piece_rotations[player] = rotation
+        self.settle_piece(player)
+        return True
+
+    def trace_path(self, player, path):
+        """
+        Replay actions on the bitboard only, as apply_action would play them.
+
+        :return: The (row, col, rotation) where the piece locks, or None if
+                 the path ends before the piece is locked.
+        """
+        board = self.boards[player]
+        shapes = piece_rotations(self.current_pieces[player])
+        row, col = self.piece_positions[player]
+        rotation = self.piece_rotations[player]
+        for action in path:
+            shape = shapes[rotation]
+            if action == 'left' or action == 'right':
+                delta = -1 if action == 'left' else 1
+                if board.fits(shape, row, col + delta):
+                    col += delta
+            elif action == 'up':
+                turned = (rotation + 1) % len(shapes)
+                if board.fits(shapes[turned], row, col):
+                    rotation = turned
+            elif action == 'down':
+                if not board.fits(shape, row + 1, col):
+                    return row, col, rotation
+                row += 1
+            elif action == 'space':
+                return board.landing_row(shape, row, col), col, rotation
+        return None
 
     def move_piece(self, player, delta_row, delta_col):
         """Move the current piece of the specified player."""
@@ -402,53 +662,7 @@ class TetrisGame:
             
             # Si le mouvement vers le bas est bloqué, fixer la pièce
             if delta_row > 0:
-                self.lock_piece(player)
-                
-                # Vérifier les lignes complètes
-                completed_lines = self.check_for_completed_lines(player)
-                self.last_cleared_lines[player] = completed_lines
-                
-                if completed_lines:
-                    self.lines_completed[player] += completed_lines
-                    
-                    # Règle du cadeau surprise
-                    if completed_lines == 2:
-                        opponent = 'ai' if player == 'human' else 'human'
-                        self.surprise_gift_pending[opponent] = True
-                        print(f"Surprise gift pending for {opponent}")
-                    
-                    # Calculer le score selon les règles demandées
-                    base_points = 50 * completed_lines
-                    
-                    # Apply bonuses
-                    if completed_lines == 2:
-                        bonus = 100
-                    elif completed_lines == 3:
-                        bonus = 200
-                    elif completed_lines == 4:
-                        bonus = 300
-                    else:
-                        bonus = 0
-                    
-                    total_points = base_points + bonus
-                    self.scores[player] += total_points
-                    print(f"{player} got {total_points} points ({base_points} base + {bonus} bonus)")
-                    
-                    # Bonus pour les pièces rigolotes bien placées
-                    if self.current_pieces[player].get('type') == 'funny':
-                        self.scores[player] += 100
-                        print(f"Bonus de 100 points pour pièce rigolote bien placée!")
-                
-                # Engendrer une nouvelle pièce
-                self.current_pieces[player] = self.next_pieces[player]
-                self.next_pieces[player] = self.generate_piece(player)
-                self.piece_positions[player] = [0, self.grid_width // 2 - 2]
-                self.piece_rotations[player] = 0
-                
-                # Vérifier si le jeu est terminé
-                if self.check_collision(player):
-                    self.game_over = True
-                    print(f"Game over! {player.capitalize()} player lost.")
+                self.settle_piece(player)
                     
             return False
         return True
@@ -465,66 +679,38 @@ class TetrisGame:
         piece_type = piece['type']
         
         # Calculer la nouvelle rotation
-        self.piece_rotations[player] = (self.piece_rotations[player] + 1) % len(TETROMINOS[piece_type])
+        self.piece_rotations[player] = (self.piece_rotations[player] + 1) % len(PIECE_SHAPES[piece_type])
         
         # Vérifier collision
         if self.check_collision(player):
             # Restaurer l'ancienne rotation
             self.piece_rotations[player] = old_rotation
 
+    def landing_row(self, player):
+        """Rangée où la pièce courante s'arrêterait si on la lâchait maintenant."""
+        row_offset, col_offset = self.piece_positions[player]
+        return self.boards[player].landing_row(self.get_piece_shape(player), row_offset, col_offset)
+
     def hard_drop(self, player):
         """Faire tomber la pièce jusqu'à ce qu'elle entre en collision."""
-        while self.move_piece(player, 1, 0):
-            pass  # Continuer à déplacer la pièce vers le bas jusqu'à ce qu'elle ne puisse plus
+        self.piece_positions[player][0] = self.landing_row(player)
+        # Le déplacement suivant est bloqué: la pièce est fixée et la suivante apparaît
+        self.move_piece(player, 1, 0)
 
     def check_collision(self, player):
         """Vérifier si la pièce actuelle est en collision avec les murs ou d'autres pièces."""
-        piece = self.current_pieces[player]
-        
-        # Handle special case for funny piece
-        if piece.get('type') == 'funny':
-            shape = piece['shape']
-        else:
-            # Regular tetromino
-            shape = TETROMINOS[piece['type']][self.piece_rotations[player]]
-            
         row_offset, col_offset = self.piece_positions[player]
-        
-        for i in range(len(shape)):
-            for j in range(len(shape[i])):
-                if shape[i][j]:
-                    new_row, new_col = row_offset + i, col_offset + j
-                    
-                    # Vérifier les limites de la grille
-                    if new_row < 0 or new_row >= self.grid_height or new_col < 0 or new_col >= self.grid_width:
-                        return True
-                    
-                    # Vérifier la collision avec d'autres pièces
-                    if self.grids[player][new_row][new_col]:
-                        return True
-        
-        return False
+        return not self.boards[player].fits(self.get_piece_shape(player), row_offset, col_offset)
 
     def get_current_piece_cells(self, player):
         """Obtenir les cellules occupées par la pièce actuelle du joueur."""
-        piece = self.current_pieces[player]
-        
-        # Handle special case for funny piece
-        if piece.get('type') == 'funny':
-            shape = piece['shape']
-        else:
-            # Regular tetromino
-            shape = TETROMINOS[piece['type']][self.piece_rotations[player]]
-            
         row_offset, col_offset = self.piece_positions[player]
         cells = []
         
-        for i in range(len(shape)):
-            for j in range(len(shape[i])):
-                if shape[i][j]:
-                    new_row, new_col = row_offset + i, col_offset + j
-                    if 0 <= new_row < self.grid_height and 0 <= new_col < self.grid_width:
-                        cells.append((new_row, new_col))
+        for i, j in self.get_piece_shape(player).cells:
+            new_row, new_col = row_offset + i, col_offset + j
+            if 0 <= new_row < self.grid_height and 0 <= new_col < self.grid_width:
+                cells.append((new_row, new_col))
         
         return cells
 
@@ -538,40 +724,26 @@ class TetrisGame:
     def trigger_rainbow_effect(self):
         """Trigger a rainbow effect in the game."""
         # Cette méthode est maintenant gérée par la classe TetrisDuel
-        print("Rainbow effect triggered!")
+        if self.on_event is not None:
+            self.on_event('rainbow')
         
     def get_grid_with_current_piece(self, player):
         """Obtenir une copie de la grille incluant la pièce actuelle."""
-        grid_copy = copy.deepcopy(self.grids[player])
+        grid_copy = self.boards[player].to_list()
         
         if not self.current_pieces[player]:
             return grid_copy
         
-        piece = self.current_pieces[player]
-        
-        # Handle special case for funny piece
-        if piece.get('type') == 'funny':
-            shape = piece['shape']
-        else:
-            # Regular tetromino
-            shape = TETROMINOS[piece['type']][self.piece_rotations[player]]
-            
-        row_offset, col_offset = self.piece_positions[player]
-        
-        for i in range(len(shape)):
-            for j in range(len(shape[i])):
-                if shape[i][j]:
-                    new_row, new_col = row_offset + i, col_offset + j
-                    if 0 <= new_row < self.grid_height and 0 <= new_col < self.grid_width:
-                        grid_copy[new_row][new_col] = piece['type']
+        piece_type = self.current_pieces[player]['type']
+        for row, col in self.get_current_piece_cells(player):
+            grid_copy[row][col] = piece_type
         
         return grid_copy
 
 # Example usage
 if __name__ == "__main__":
     game = TetrisGame()
+    game.on_event = lambda event, **details: print(event, details)
     game.initialize_game()
-    while not game.game_over:
-        game.update_game_state()
-        # Simulate user input
-        game.handle_user_input(random.choice(['left', 'right', 'up', 'down', 'space']))
\ No newline at end of file
+    while not game.step(random.choice(['left', 'right', 'up', 'down', 'space'])):
+        pass
\ No newline at end of file
@@ -1,28 +1,54 @@
 # tetris_duel/src/main.py
 
+import argparse
 import tkinter as tk
 import time
-import random
 
 # Import correct paths
 try:
     # For direct running from main.py
     from game import TetrisGame, PIECE_COLORS
     from ai import AI
+    from ai_worker import AIWorker
     from scoreboard import Scoreboard
     from timer import GameTimer
-    from performance import PerformanceManager
+    from performance import PerformanceManager, FrameScheduler
+    from difficulty import SearchBudgetController, apply_difficulty
+    from renderer import RENDERERS
 except ImportError:
     # For running from project root
     from src.game import TetrisGame, PIECE_COLORS
     from src.ai import AI
+    from src.ai_worker import AIWorker
     from src.scoreboard import Scoreboard
     from src.timer import GameTimer
-    from src.performance import PerformanceManager
+    from src.performance import PerformanceManager, FrameScheduler
+    from src.difficulty import SearchBudgetController, apply_difficulty
+    from src.renderer import RENDERERS
+
+# Messages affichés dans la console pour les événements du moteur de jeu
+GAME_EVENT_MESSAGES = {
+    'funny_piece': "Funny piece for {player}!",
+    'surprise_gift': "Surprise gift for {player}: {piece_type}!",
+    'gift_pending': "Surprise gift pending for {player}",
+    'points': "{player} got {total} points ({base} base + {bonus} bonus)",
+    'funny_bonus': "Bonus de {points} points pour pièce rigolote bien placée!",
+    'game_over': "Game over! {name} player lost.",
+    'rainbow': "Rainbow effect triggered!"
+}
 
 class TetrisDuel:
-    def __init__(self, root: tk.Tk):
-        """Initialize the Tetris Duel game."""
+    def __init__(self, root: tk.Tk, difficulty='adaptive', renderer='canvas'):
+        """
+        Initialize the Tetris Duel game.
+
+        :param root: The main Tkinter window.
+        :param difficulty: A difficulty preset ('easy', 'medium', 'hard',
+                           'expert') or 'adaptive' to fit the AI search to
+                           the machine.
+        :param renderer: How the boards are drawn: 'canvas' (one rectangle
+                         per cell) or 'image' (one image per board).
+        """
         self.root = root
         self.root.title("Tetris Duel")
         self.root.geometry("800x700")  # Adjusted for better visibility
@@ -31,8 +57,15 @@ class TetrisDuel:
         self.canvas = tk.Canvas(root, width=800, height=600, bg='black')
         self.canvas.pack(pady=10)
         
+        # AI decisions are computed in a background thread, started as soon
+        # as an AI piece spawns (see on_game_event)
+        self.ai_worker = AIWorker()
+        self.game_generation = 0
+        self.ai_poll_interval = 20  # Attente d'une décision en cours, en ms
+        
         # Initialize game objects
         self.game = TetrisGame()
+        self.game.on_event = self.on_game_event
         self.game.initialize_game()
         self.scoreboard = Scoreboard(root)
         self.timer = GameTimer()
@@ -42,6 +75,10 @@ class TetrisDuel:
         self.performance = PerformanceManager(root)
         self.performance.optimize_tkinter(self.canvas)
         
+        # AI difficulty: a fixed search budget, or one adapted to measured times
+        self.budget_controller = None
+        self.set_difficulty(difficulty)
+        
         # Game speed control
         self.game_speed = 500  # milliseconds between updates
         self.original_speed = 500
@@ -53,7 +90,9 @@ class TetrisDuel:
         
         # Task IDs for cancellation during reset
         self.ai_task_id = None
-        self.game_task_id = None
+        # Game ticks, paced by root.after without blocking the event loop
+        self.game_loop = FrameScheduler(root, self.update_game, self.game_speed / 1000)
+        self.redraw_task_id = None  # Redessin en attente (voir request_redraw)
         
         # Visual effects
         self.rainbow_mode = False
@@ -68,13 +107,17 @@ class TetrisDuel:
         self.color_cache = {}
         self._precalculate_colors()
         
+        # Canvas items are created once and only updated when they change
+        self.renderer = RENDERERS[renderer](self.canvas, self.game.grid_width, self.game.grid_height,
+                                            self.color_cache)
+        
         # Keyboard bindings
         self.setup_keyboard_bindings()
         
         # Start game timer
         self.timer.start_timer()
         self.update_ai()
-        self.update_game()
+        self.game_loop.start()
     
     def _precalculate_colors(self):
         """Précalculer les couleurs pour éviter la conversion à chaque frame"""
@@ -83,17 +126,56 @@ class TetrisDuel:
             r, g, b = rgb
             self.color_cache[piece_type] = f'#{r:02x}{g:02x}{b:02x}'
     
+    def on_game_event(self, event, **details):
+        """Print the notifications published by the game engine."""
+        if event == 'spawn' and details['player'] == 'ai':
+            self.request_ai_decision()
+        message = GAME_EVENT_MESSAGES.get(event)
+        if message is None:
+            return
+        if 'player' in details:
+            details['name'] = details['player'].capitalize()
+        if event == 'points':
+            details['total'] = details['base'] + details['bonus']
+        print(message.format(**details))
+    
     def setup_keyboard_bindings(self):
         """Set up keyboard bindings for the game."""
-        self.root.bind("<Left>", lambda event: self.game.handle_user_input('left'))
-        self.root.bind("<Right>", lambda event: self.game.handle_user_input('right'))
-        self.root.bind("<Down>", lambda event: self.game.handle_user_input('down'))
-        self.root.bind("<Up>", lambda event: self.game.handle_user_input('up'))
-        self.root.bind("<space>", lambda event: self.game.handle_user_input('space'))
+        self.root.bind("<Left>", lambda event: self.on_user_input('left'))
+        self.root.bind("<Right>", lambda event: self.on_user_input('right'))
+        self.root.bind("<Down>", lambda event: self.on_user_input('down'))
+        self.root.bind("<Up>", lambda event: self.on_user_input('up'))
+        self.root.bind("<space>", lambda event: self.on_user_input('space'))
         # Corriger les bindings pour le redémarrage
         self.root.bind("<r>", lambda event: self.reset_game())
         self.root.bind("<R>", lambda event: self.reset_game())  # Ajouter la majuscule
         
+    def on_user_input(self, command):
+        """Apply a key press and show it without waiting for the next game tick."""
+        self.game.handle_user_input(command)
+        self.request_redraw()
+    
+    def request_redraw(self):
+        """
+        Schedule a redraw for when Tk is idle.
+
+        Requests made before it runs (key repeats, an AI move) share it, so a
+        burst of events costs a single frame.
+        """
+        if self.redraw_task_id is None:
+            self.redraw_task_id = self.root.after_idle(self._idle_redraw)
+    
+    def _idle_redraw(self):
+        """Run the redraw scheduled by request_redraw."""
+        self.redraw_task_id = None
+        self.redraw()
+    
+    def cancel_redraw(self):
+        """Drop the redraw scheduled by request_redraw, if any."""
+        if self.redraw_task_id is not None:
+            self.root.after_cancel(self.redraw_task_id)
+            self.redraw_task_id = None
+    
     def reset_game(self):
         """Reset the game to initial state."""
         print("Resetting game...")
@@ -101,11 +183,14 @@ class TetrisDuel:
         # Annuler les mises à jour programmées
         if hasattr(self, 'ai_task_id') and self.ai_task_id:
             self.root.after_cancel(self.ai_task_id)
-        if hasattr(self, 'game_task_id') and self.game_task_id:
-            self.root.after_cancel(self.game_task_id)
+        self.game_loop.stop()
+        self.cancel_redraw()
         
         # Réinitialiser complètement le jeu et ses composants
+        # (les décisions de l'IA encore en cours deviennent périmées)
+        self.game_generation += 1
         self.game = TetrisGame()
+        self.game.on_event = self.on_game_event
         self.game.initialize_game()
         
         # Réinitialiser le score
@@ -115,6 +200,7 @@ class TetrisDuel:
         self.game_speed = self.original_speed
         self.gentle_pause_active = False
         self.rainbow_mode = False
+        self.renderer.clear_game_over()
         
         # Réinitialiser le timer
         self.timer = GameTimer()
@@ -125,40 +211,52 @@ class TetrisDuel:
         
         # Redémarrer les tâches périodiques
         self.update_ai()
-        self.update_game()
+        self.game_loop.start()
         
         # Mise à jour forcée de l'interface
         self.redraw()
     
+    def set_difficulty(self, difficulty):
+        """Apply a difficulty preset, or 'adaptive', to the AI making the decisions."""
+        if difficulty == 'adaptive':
+            self.budget_controller = SearchBudgetController(self.ai_worker.ai, self.performance)
+        else:
+            self.budget_controller = None
+            apply_difficulty(self.ai_worker.ai, difficulty)
+        self.difficulty = difficulty
+    
+    def ai_decision_key(self):
+        """Identify the AI piece a decision is computed for."""
+        return (self.game_generation, self.game.piece_counts['ai'])
+    
+    def request_ai_decision(self):
+        """Start computing the AI's move for its current piece in the background."""
+        if not self.game.game_over:
+            self.ai_worker.request(self.ai_decision_key(), self.game.snapshot())
+    
     def update_ai(self):
         """Have the AI make a move."""
+        delay = self.ai_delay
         if not self.game.game_over:
-            # Get best move from AI
-            move = self.ai.calculate_best_move()
-            if move:
-                rotation, direction = move
-                
-                # Apply rotation
-                current_rotation = self.game.piece_rotations['ai']
-                while current_rotation != rotation:
-                    self.game.rotate_piece('ai')
-                    current_rotation = (current_rotation + 1) % 4
-                
-                # Apply horizontal movement
-                if direction < 0:
-                    # Move left
-                    for _ in range(abs(direction)):
-                        self.game.move_piece('ai', 0, -1)
-                elif direction > 0:
-                    # Move right
-                    for _ in range(direction):
-                        self.game.move_piece('ai', 0, 1)
-                
-                # Drop the piece
-                self.game.hard_drop('ai')
+            # Jouer la décision calculée en arrière-plan, ou l'attendre
+            key = self.ai_decision_key()
+            decision = self.ai_worker.poll(key)
+            if decision is None:
+                if self.ai_worker.pending != key:
+                    self.request_ai_decision()
+                delay = self.ai_poll_interval
+            elif decision.placement is not None:
+                if self.ai.play_placement(decision.placement, decision.origin):
+                    self.request_redraw()
+                else:
+                    # Placement devenu inaccessible: relancer la recherche
+                    self.request_ai_decision()
+                    delay = self.ai_poll_interval
+            if decision is not None and self.budget_controller is not None:
+                self.budget_controller.update()
         
         # Schedule next AI move with longer delay
-        self.ai_task_id = self.root.after(self.ai_delay, self.update_ai)
+        self.ai_task_id = self.root.after(delay, self.update_ai)
     
     def update_game(self):
         """Update the game state and redraw the canvas."""
@@ -189,12 +287,12 @@ class TetrisDuel:
         self.performance.begin_frame()
         self.redraw()
         self.performance.end_frame()
-        self.performance.limit_fps(60)  # Target 60 FPS for smoothness
         
-        # Schedule next update if game is not over
+        # Keep ticking at the current speed until the game is over
         if not self.game.game_over:
-            self.game_task_id = self.root.after(self.game_speed, self.update_game)
+            self.game_loop.interval = self.game_speed / 1000
         else:
+            self.game_loop.stop()
             self.game_over_display()
     
     def check_special_events(self):
@@ -226,6 +324,9 @@ class TetrisDuel:
     
     def redraw(self):
         """Redraw the game grids and scores."""
+        # Ce redessin remplace celui qui était en attente
+        self.cancel_redraw()
+        
         # Measure performance
         current_time = time.time()
         elapsed = current_time - self.last_update_time
@@ -235,126 +336,13 @@ class TetrisDuel:
         if self.frame_count % 10 == 0 and elapsed > 0:  # Update FPS every 10 frames
             self.frame_rate = 1.0 / elapsed
         
-        # Clear canvas efficiently
-        self.canvas.delete("all")
-        
-        # Draw game elements
-        self.draw_grids()
-        self.draw_next_pieces()
-        self.draw_scores()
-        
-        # Display special effects indicators
-        if self.gentle_pause_active:
-            self.canvas.create_text(400, 30, text="GENTLE PAUSE ACTIVE!", fill="yellow", font=("Arial", 16))
-        
-        if self.rainbow_mode:
-            self.canvas.create_text(400, 580, text="RAINBOW MODE!", fill="magenta", font=("Arial", 16))
+        # Only the items that changed since the last frame are updated
+        self.renderer.render(self.game, self.rainbow_mode, self.gentle_pause_active, self.frame_count)
         
         # Force update for smoother animation
         if not self.game.game_over:
             self.canvas.update_idletasks()
     
-    def draw_grids(self):
-        """Draw the game grids for both players."""
-        # Draw borders
-        self.canvas.create_rectangle(50, 50, 300, 550, outline='white', width=2)
-        self.canvas.create_rectangle(500, 50, 750, 550, outline='white', width=2)
-        
-        # Draw grid labels
-        self.canvas.create_text(175, 30, text="HUMAN PLAYER", fill="white", font=("Arial", 14))
-        self.canvas.create_text(625, 30, text="AI PLAYER", fill="white", font=("Arial", 14))
-        
-        # Calculate cell size
-        cell_width = (300 - 50) / self.game.grid_width
-        cell_height = (550 - 50) / self.game.grid_height
-        
-        # Draw grid cells and pieces for human player
-        self.draw_grid_cells('human', 50, 50, cell_width, cell_height)
-        
-        # Draw grid cells and pieces for AI player
-        self.draw_grid_cells('ai', 500, 50, cell_width, cell_height)
-    
-    def draw_grid_cells(self, player, grid_x, grid_y, cell_width, cell_height):
-        """Draw the grid cells for a player."""
-        # Get the grid with the current piece
-        grid = self.game.get_grid_with_current_piece(player)
-        
-        # Draw background grid first (optimization)
-        for row in range(self.game.grid_height):
-            for col in range(self.game.grid_width):
-                x1 = grid_x + col * cell_width
-                y1 = grid_y + row * cell_height
-                x2 = x1 + cell_width
-                y2 = y1 + cell_height
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill='black', outline='#222222', width=0.5)
-        
-        # Then only draw occupied cells
-        for row in range(self.game.grid_height):
-            for col in range(self.game.grid_width):
-                cell_value = grid[row][col]
-                if cell_value:
-                    x1 = grid_x + col * cell_width
-                    y1 = grid_y + row * cell_height
-                    x2 = x1 + cell_width
-                    y2 = y1 + cell_height
-                    
-                    # This is a piece cell, color it
-                    if isinstance(cell_value, str):  # Regular piece
-                        if self.rainbow_mode:
-                            # Rainbow mode - use cached random colors for better performance
-                            color_key = f'rainbow_{row}_{col}_{self.frame_count % 20}'
-                            if color_key not in self.color_cache:
-                                self.color_cache[color_key] = f'#{random.randint(128, 255):02x}{random.randint(128, 255):02x}{random.randint(128, 255):02x}'
-                            color = self.color_cache[color_key]
-                        else:
-                            # Normal mode - use the cached piece color
-                            color = self.color_cache.get(cell_value, '#C8C8C8')
-                    else:  # Special piece like a funny piece
-                        color = '#FF00FF'  # Pink for special pieces
-                    
-                    # Fill the cell with the appropriate color
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline='black', width=0.5)
-    
-    def draw_next_pieces(self):
-        """Draw the next piece preview for both players."""
-        # Human player next piece
-        self.canvas.create_text(175, 570, text="NEXT PIECE:", fill="white", font=("Arial", 12))
-        self.draw_piece_preview(self.game.next_pieces['human'], 175, 590)
-        
-        # AI player next piece
-        self.canvas.create_text(625, 570, text="NEXT PIECE:", fill="white", font=("Arial", 12))
-        self.draw_piece_preview(self.game.next_pieces['ai'], 625, 590)
-    
-    def draw_piece_preview(self, piece, center_x, center_y):
-        """Draw a preview of a piece at the specified position."""
-        if not piece:
-            return
-            
-        shape = piece['shape']  # First rotation
-        r, g, b = piece['color']
-        color = f'#{r:02x}{g:02x}{b:02x}'
-        
-        cell_size = 15
-        offset_x = -len(shape[0]) * cell_size / 2
-        offset_y = -len(shape) * cell_size / 2
-        
-        for i in range(len(shape)):
-            for j in range(len(shape[i])):
-                if shape[i][j]:
-                    x1 = center_x + offset_x + j * cell_size
-                    y1 = center_y + offset_y + i * cell_size
-                    x2 = x1 + cell_size
-                    y2 = y1 + cell_size
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline='black')
-    
-    def draw_scores(self):
-        """Display the current scores and lines for both players."""
-        self.canvas.create_text(175, 620, text=f"Score: {self.game.scores['human']}", fill="white", font=("Arial", 16))
-        self.canvas.create_text(175, 645, text=f"Lines: {self.game.lines_completed['human']}", fill="white", font=("Arial", 14))
-        
-        self.canvas.create_text(625, 620, text=f"Score: {self.game.scores['ai']}", fill="white", font=("Arial", 16))
-        self.canvas.create_text(625, 645, text=f"Lines: {self.game.lines_completed['ai']}", fill="white", font=("Arial", 14))
-    
     def game_over_display(self):
         """Display game over message and winner."""
         winner = "Human" if self.game.scores['human'] > self.game.scores['ai'] else "AI"
@@ -363,18 +351,34 @@ class TetrisDuel:
         else:
             winner = f"{winner} wins!"
         
-        self.canvas.create_rectangle(200, 250, 600, 350, fill='black', outline='white', width=3)
-        self.canvas.create_text(400, 285, text="GAME OVER", fill="red", font=("Arial", 24, "bold"))
-        self.canvas.create_text(400, 315, text=winner, fill="yellow", font=("Arial", 18))
-        
-        # Add restart instruction
-        self.canvas.create_text(400, 500, text="Press 'R' to restart", fill="white", font=("Arial", 14))
+        self.renderer.show_game_over(winner)
+
+    def dump_ai_metrics(self, path):
+        """Write the AI decision metrics to a JSON file and print the decision times."""
+        metrics = self.ai_worker.ai.metrics
+        metrics.dump(path)
+        wall_time = metrics.summary().get('wall_time')
+        if wall_time:
+            print(f"AI decisions: {wall_time['count']}, p50 {wall_time['p50'] * 1000:.1f} ms, "
+                  f"p95 {wall_time['p95'] * 1000:.1f} ms, p99 {wall_time['p99'] * 1000:.1f} ms "
+                  f"(details in {path})")
+
+def run_game(argv=None):
+    """
+    Run the Tetris Duel game.
+
+    :param argv: Command-line arguments (defaults to sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Play Tetris Duel against the AI.")
+    parser.add_argument('--ai-metrics', metavar='PATH', default=None,
+                        help="write the AI decision metrics to this JSON file on exit")
+    args = parser.parse_args(argv)
 
-def run_game():
-    """Run the Tetris Duel game."""
     root = tk.Tk()
     game = TetrisDuel(root)
     root.mainloop()
+    if args.ai_metrics:
+        game.dump_ai_metrics(args.ai_metrics)
 
 if __name__ == "__main__":
     run_game()
\ No newline at end of file
@@ -0,0 +1,95 @@
+# tetris_duel/src/metrics.py
+
+"""
+Mesures des décisions de l'IA.
+
+DecisionMetrics keeps one RollingHistogram per measured quantity (decision
+time, candidates generated and evaluated, boards simulated, cache hits,
+score margin of the chosen move...). Each histogram holds the last
+``window`` samples, so its percentiles describe recent behaviour; summaries
+can be read while the game runs and dumped to a JSON file at exit.
+"""
+
+import json
+import math
+from collections import deque
+
+
+def _nearest_rank(ordered, p):
+    """Value of rank ceil(p% * n) in a sorted, non-empty list."""
+    rank = math.ceil(p / 100 * len(ordered))
+    return ordered[min(len(ordered), max(rank, 1)) - 1]
+
+
+class RollingHistogram:
+    """
+    The last ``window`` samples of a quantity, with their percentiles.
+    """
+
+    def __init__(self, window=1000):
+        """
+        :param window: Number of most recent samples kept.
+        """
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value):
+        """Record one sample."""
+        self.samples.append(value)
+        self.count += 1
+
+    def percentile(self, p):
+        """
+        Nearest-rank percentile of the kept samples.
+
+        :param p: Percentile, between 0 and 100.
+        :return: The sample value, or 0 if there is no sample yet.
+        """
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0
+        return _nearest_rank(ordered, p)
+
+    def summary(self):
+        """Return count, mean, p50, p95, p99 and max of the kept samples."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {'count': self.count, 'mean': 0, 'p50': 0, 'p95': 0, 'p99': 0, 'max': 0}
+        return {
+            'count': self.count,
+            'mean': sum(ordered) / len(ordered),
+            'p50': _nearest_rank(ordered, 50),
+            'p95': _nearest_rank(ordered, 95),
+            'p99': _nearest_rank(ordered, 99),
+            'max': ordered[-1]
+        }
+
+
+class DecisionMetrics:
+    """
+    Rolling histograms of per-decision measurements, by name.
+    """
+
+    def __init__(self, window=1000):
+        """
+        :param window: Number of most recent decisions kept per histogram.
+        """
+        self.window = window
+        self.histograms = {}
+
+    def record(self, **values):
+        """Record the measurements of one decision, e.g. record(wall_time=0.004, evaluated=34)."""
+        for name, value in values.items():
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.window)
+            histogram.add(value)
+
+    def summary(self):
+        """Return the summary of every histogram, by name."""
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def dump(self, path):
+        """Write the summaries to a JSON file."""
+        with open(path, 'w') as metrics_file:
+            json.dump(self.summary(), metrics_file, indent=2)
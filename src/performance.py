@@ -2,8 +2,14 @@
 
 """
 Module d'optimisation des performances pour le jeu Tetris Duel.
+
+FrameScheduler paces a periodic callback with ``root.after`` instead of
+sleeping inside Tk callbacks: every call is aimed at an absolute deadline,
+so the lateness of one callback is taken off the next delay rather than
+accumulating, and the event loop stays free to handle input between calls.
 """
 
+import math
 import time
 import platform
 import tkinter as tk
@@ -31,7 +37,6 @@ class PerformanceManager:
         
         # Paramètres de limitation de FPS
         self.target_fps = 60
-        self.frame_time_deficit = 0
         self.vsync_enabled = False
         
         # Détection du système
@@ -135,50 +140,81 @@ class PerformanceManager:
             self.target_fps = 0  # pas de limite
             self.vsync_enabled = False
     
-    def limit_fps(self, target_fps=None):
+    def synchronize_with_display(self):
+        """
+        Synchronise avec le taux de rafraîchissement de l'affichage si vsync est activé.
+        À appeler juste avant l'affichage d'une nouvelle frame.
         """
-        Limite le FPS en attendant si nécessaire, avec compensation.
+        if self.vsync_enabled and self.root:
+            self.root.update_idletasks()  # Force le traitement des événements graphiques
+
+
+class FrameScheduler:
+    def __init__(self, root, callback, interval, clock=time.perf_counter):
+        """
+        Prépare l'appel périodique d'une fonction, sans le démarrer.
         
         Args:
-            target_fps: FPS cible (optionnel, utilise self.target_fps par défaut)
+            root: Fenêtre Tkinter (ou tout objet fournissant after et after_cancel)
+            callback: Fonction appelée à chaque échéance
+            interval: Période en secondes, modifiable entre deux appels
+            clock: Horloge monotone en secondes
         """
-        if target_fps is not None:
-            self.target_fps = target_fps
-            
-        # Si le mode vsync est activé ou aucune limite n'est définie
-        if self.vsync_enabled or self.target_fps <= 0:
-            return
-            
-        target_frame_time = 1.0 / self.target_fps
+        self.root = root
+        self.callback = callback
+        self.interval = interval
+        self.clock = clock
+        self.deadline = 0
+        self.task_id = None
+        self.running = False
         
-        # Calculer le temps d'attente nécessaire (avec compensation)
-        wait_time = target_frame_time - self.frame_time - self.frame_time_deficit
+        # Mesures: retard du dernier appel, pire retard et échéances sautées
+        self.lateness = 0
+        self.max_lateness = 0
+        self.skipped = 0
         
-        if wait_time > 0:
-            # Technique de sleep de précision pour minimiser le jitter
-            end_wait = time.time() + wait_time
-            
-            # Sleep grossier jusqu'à ~1ms avant la fin
-            coarse_wait = wait_time - 0.001
-            if coarse_wait > 0:
-                time.sleep(coarse_wait)
-                
-            # Attente active pour la précision finale
-            while time.time() < end_wait:
-                pass
-                
-            # Calculer le temps réel d'attente
-            actual_wait = time.time() - (self.last_frame_time + self.frame_time)
-            # Calculer le déficit pour la prochaine frame
-            self.frame_time_deficit = actual_wait - wait_time
-        else:
-            # Si nous sommes en retard, limiter l'accumulation du déficit
-            self.frame_time_deficit = max(-target_frame_time/2, wait_time)
+    def start(self, delay=0):
+        """
+        Démarre les appels, le premier après ``delay`` secondes.
+        """
+        self.stop()
+        self.running = True
+        self.deadline = self.clock() + delay
+        self._schedule()
+        
+    def stop(self):
+        """
+        Annule l'appel programmé; peut être appelé depuis le callback.
+        """
+        self.running = False
+        if self.task_id is not None:
+            self.root.after_cancel(self.task_id)
+            self.task_id = None
             
-    def synchronize_with_display(self):
+    def _schedule(self):
         """
-        Synchronise avec le taux de rafraîchissement de l'affichage si vsync est activé.
-        À appeler juste avant l'affichage d'une nouvelle frame.
+        Programme le prochain appel pour l'échéance courante.
         """
-        if self.vsync_enabled and self.root:
-            self.root.update_idletasks()  # Force le traitement des événements graphiques
+        delay = max(0, round((self.deadline - self.clock()) * 1000))
+        self.task_id = self.root.after(delay, self._tick)
+        
+    def _tick(self):
+        """
+        Appelle le callback puis vise l'échéance suivante.
+        """
+        self.task_id = None
+        self.lateness = max(0.0, self.clock() - self.deadline)
+        self.max_lateness = max(self.max_lateness, self.lateness)
+        self.callback()
+        if not self.running:
+            return
+            
+        # L'échéance suivante compte depuis la précédente, pas depuis cet appel
+        self.deadline += self.interval
+        behind = self.clock() - self.deadline
+        if behind > self.interval:
+            # Trop en retard: sauter les échéances manquées, un seul appel de rattrapage
+            missed = math.floor(behind / self.interval)
+            self.deadline += missed * self.interval
+            self.skipped += missed
+        self._schedule()
@@ -0,0 +1,124 @@
+# tetris_duel/src/placement.py
+
+"""
+Génération des placements atteignables d'une pièce.
+
+generate_placements runs a breadth-first search over the (row, col,
+rotation) states a piece can actually reach on a board with the game's own
+controls (left, right, rotate, soft drop), so tucks and slides under
+overhangs are found. Every state where the piece cannot move down is a lock
+position; lock positions covering the same cells (for instance the two
+horizontal I rotations) are reported once, each with the shortest input path
+that reaches it.
+"""
+
+from collections import deque, namedtuple
+
+try:
+    from game import piece_rotations
+except ImportError:
+    from src.game import piece_rotations
+
+# A lock position: the rotation index, board row and column of the piece
+# matrix, and the list of actions ('left', 'right', 'up', 'down', 'space')
+# that brings the piece there from its current position and locks it
+Placement = namedtuple('Placement', ['rotation', 'row', 'col', 'path'])
+
+
+def _cells_key(shape, row, col):
+    """Hashable description of the cells covered by a shape at (row, col)."""
+    if col >= 0:
+        return tuple((row + offset, mask << col) for offset, mask in shape.masks)
+    return tuple((row + offset, mask >> -col) for offset, mask in shape.masks)
+
+
+def generate_placements(board, piece, row, col, rotation=0):
+    """
+    Lists the distinct lock positions a piece can reach.
+
+    :param board: The Board the piece moves on.
+    :param piece: The piece dict (a regular tetromino or a funny piece).
+    :param row: Current row of the piece matrix.
+    :param col: Current column of the piece matrix.
+    :param rotation: Current rotation index of the piece.
+    :return: A list of Placement, in breadth-first order.
+    """
+    shapes = piece_rotations(piece)
+    count = len(shapes)
+    rotation %= count
+    start = (row, col, rotation)
+    if not board.fits(shapes[rotation], row, col):
+        return []
+
+    # Au-dessus de la ligne la plus haute occupée, la pièce tombe librement:
+    # une descente y saute directement à la dernière rangée libre
+    first_filled = board.height
+    for r, bits in enumerate(board.rows):
+        if bits:
+            first_filled = r
+            break
+
+    parents = {start: None}
+    queue = deque([start])
+    lock_states = {}
+    while queue:
+        state = queue.popleft()
+        r, c, rot = state
+        shape = shapes[rot]
+
+        moves = [('left', (r, c - 1, rot)), ('right', (r, c + 1, rot))]
+        if count > 1:
+            moves.append(('up', (r, c, (rot + 1) % count)))
+        below = r + 1
+        if below + shape.bottom < first_filled:
+            below = max(below, first_filled - 1 - shape.bottom)
+        moves.append(('down', (below, c, rot)))
+
+        for action, target in moves:
+            if target in parents:
+                continue
+            if board.fits(shapes[target[2]], target[0], target[1]):
+                parents[target] = (state, action)
+                queue.append(target)
+
+        if not board.fits(shape, r + 1, c):
+            key = _cells_key(shape, r, c)
+            if key not in lock_states:
+                lock_states[key] = state
+
+    placements = []
+    for state in lock_states.values():
+        path = []
+        node = state
+        while parents[node] is not None:
+            previous, action = parents[node]
+            if action == 'down':
+                path.extend(['down'] * (node[0] - previous[0]))
+            else:
+                path.append(action)
+            node = previous
+        path.reverse()
+        # The final straight fall is replaced by a hard drop, which also locks the piece
+        while path and path[-1] == 'down':
+            path.pop()
+        path.append('space')
+        placements.append(Placement(state[2], state[0], state[1], path))
+    return placements
+
+
+def find_placement(placements, piece, target):
+    """
+    Finds the placement covering the same cells as a target placement.
+
+    :param placements: Placements returned by generate_placements.
+    :param piece: The piece dict both placements belong to.
+    :param target: The Placement looked for, possibly planned from another
+                   starting position.
+    :return: The matching Placement, or None if it is not in the list.
+    """
+    shapes = piece_rotations(piece)
+    key = _cells_key(shapes[target.rotation % len(shapes)], target.row, target.col)
+    for placement in placements:
+        if _cells_key(shapes[placement.rotation], placement.row, placement.col) == key:
+            return placement
+    return None
@@ -0,0 +1,157 @@
+# tetris_duel/src/planner.py
+
+"""
+Recherche en faisceau sur les pièces à venir.
+
+BeamPlanner looks several pieces ahead: it places the current piece in every
+reachable position, keeps the ``beam_width`` best resulting boards, places
+the next piece on each of them from its spawn position, keeps the best
+boards again, and so on for every piece of the preview. A first move is
+rated by the best board found at the deepest level completed.
+
+The search is anytime: the first level is always completed, then the search
+stops as soon as its wall-clock budget is spent and returns the best move of
+the last level that was fully explored. Without a budget every level is
+explored, so the result only depends on the position (headless runs need
+this to be reproducible).
+"""
+
+import time
+from collections import namedtuple
+
+try:
+    from board import Board
+    from placement import generate_placements, piece_rotations
+except ImportError:
+    from src.board import Board
+    from src.placement import generate_placements, piece_rotations
+
+# Result of a search: the Placement of the current piece, the score of the
+# best line of play starting with it, the number of pieces looked at and the
+# margin over the best line starting with another move (None if there is none)
+Plan = namedtuple('Plan', ['placement', 'score', 'depth', 'margin'])
+
+
+class BeamPlanner:
+    """
+    Beam search over the current piece and the preview queue.
+    """
+
+    def __init__(self, simulator, score_placements, beam_width=4, time_budget=0.25, clock=time.perf_counter,
+                 generate=generate_placements):
+        """
+        Creates a planner.
+
+        :param simulator: The MoveSimulator used to build the boards of the beam.
+        :param score_placements: Callable (board, shapes, placements, lines)
+                                 returning one (score, lines_cleared) pair per
+                                 placement, ``lines`` being the number of lines
+                                 completed since the root position (see
+                                 AI.score_placements).
+        :param beam_width: Number of boards expanded at each level.
+        :param time_budget: Wall-clock budget of a search, in seconds, or None
+                            to always explore every piece of the sequence.
+        :param clock: Time source, in seconds.
+        :param generate: Callable with the signature of generate_placements,
+                         listing the placements of a piece (the AI passes
+                         one going through its evaluation cache).
+        """
+        self.simulator = simulator
+        self.score_placements = score_placements
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+        self.clock = clock
+        self.generate = generate
+        # Effort de la dernière recherche
+        self.generated = 0
+        self.built = 0
+
+    def plan(self, board, pieces, row, col, rotation=0, placements=None, bias=None):
+        """
+        Searches the best placement of the first piece of a sequence.
+
+        :param board: The Board the pieces are played on.
+        :param pieces: The current piece followed by the known next pieces.
+        :param row: Current row of the current piece.
+        :param col: Current column of the current piece.
+        :param rotation: Current rotation index of the current piece.
+        :param placements: Placements of the current piece to choose from
+                           (all the reachable ones by default).
+        :param bias: Optional value added to the rating of each of these
+                     placements, e.g. noise or a repetition penalty; it
+                     does not change which boards the beam keeps.
+        :return: A Plan, or None if the current piece cannot be placed.
+        """
+        deadline = None if self.time_budget is None else self.clock() + self.time_budget
+        if placements is None:
+            placements = self.generate(board, pieces[0], row, col, rotation)
+        self.generated = len(placements)
+        self.built = 0
+        if not placements:
+            return None
+
+        # Un noeud: (score, indice du premier placement, lignes, plateau parent,
+        # forme et placement); son plateau n'est construit que s'il est développé
+        level = completed = self.expand(board, pieces[0], placements, 0, None)
+        depth = 1
+
+        spawn_col = board.width // 2 - 2
+        for piece in pieces[1:]:
+            if self.expired(deadline):
+                break
+            beam = sorted(level, key=_node_score, reverse=True)[:self.beam_width]
+            level = []
+            expired = False
+            for node in beam:
+                parent = self.build_board(node)
+                children = self.generate(parent, piece, 0, spawn_col)
+                self.generated += len(children)
+                level.extend(self.expand(parent, piece, children, node[2], node[1]))
+                if self.expired(deadline):
+                    expired = True
+                    break
+            # Un niveau incomplet n'a pas évalué tous les premiers coups du faisceau
+            if expired or not level:
+                break
+            completed = level
+            depth += 1
+
+        if bias is None:
+            rating = _node_score
+        else:
+            rating = lambda node: node[0] + bias[node[1]]
+        best = max(completed, key=rating)
+        others = [rating(node) for node in completed if node[1] != best[1]]
+        margin = rating(best) - max(others) if others else None
+        return Plan(placements[best[1]], best[0], depth, margin)
+
+    def expired(self, deadline):
+        """Tell whether the search budget is spent (never without a deadline)."""
+        return deadline is not None and self.clock() >= deadline
+
+    def expand(self, board, piece, placements, lines, first):
+        """
+        Scores the placements of a piece on a board.
+
+        :param first: Index of the first move leading to this board, or None
+                      at the root, where each placement is its own first move.
+        :return: The list of child nodes.
+        """
+        shapes = piece_rotations(piece)
+        scored = self.score_placements(board, shapes, placements, lines)
+        return [(score, index if first is None else first, lines + cleared, board, shapes[placement.rotation], placement)
+                for index, ((score, cleared), placement) in enumerate(zip(scored, placements))]
+
+    def build_board(self, node):
+        """Builds the board a node leads to."""
+        _, _, _, parent, shape, placement = node
+        self.built += 1
+        self.simulator.place(parent, shape, placement.row, placement.col)
+        child = Board(parent.width, parent.height)
+        child.load(self.simulator.rows, self.simulator.cols)
+        return child
+
+
+def _node_score(node):
+    """Sort key of the search nodes."""
+    return node[0]
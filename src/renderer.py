@@ -0,0 +1,333 @@
+# tetris_duel/src/renderer.py
+
+"""
+Rendu de la partie sur le canvas en mode retenu.
+
+CanvasRenderer creates the canvas items of the duel once: one rectangle per
+board cell, the borders, the labels and the texts. Each frame it reads the
+game's change set of each board (see TetrisGame.take_changes) and only
+recolours the cells it lists, calling ``itemconfig`` on those whose colour
+differs from the one last drawn; the whole grid is only compared after a
+reset and in rainbow mode. Texts, effect banners and next-piece previews are
+likewise only touched when their content changes. A frame where nothing
+moved costs no Tk call.
+
+ImageRenderer is an alternative backend drawing each board as a single
+image item: the colour of every cell comes from a palette of '#rrggbb'
+strings built once (piece types and rainbow colours), each board row is kept as a pre-built string
+of those colours, and a frame rebuilds the rows that changed and uploads the
+board with one ``put()`` into a one-pixel-per-cell PhotoImage, scaled to the
+displayed size by a single zoomed copy.
+"""
+
+import random
+import tkinter as tk
+
+try:
+    from game import piece_key
+except ImportError:
+    from src.game import piece_key
+
+# Couleur de fond et contour d'une case vide, contour d'une case occupée
+EMPTY_FILL = '#000000'
+EMPTY_OUTLINE = '#222222'
+BLOCK_OUTLINE = 'black'
+UNKNOWN_COLOR = '#C8C8C8'
+SPECIAL_COLOR = '#FF00FF'
+# Nombre de jeux de couleurs arc-en-ciel, parcourus au fil des frames
+RAINBOW_FRAMES = 20
+
+# Coin haut gauche et centre de l'aperçu de chaque plateau
+BOARD_ORIGINS = {'human': (50, 50), 'ai': (500, 50)}
+BOARD_SIZE = (250, 500)
+PREVIEW_CENTERS = {'human': (175, 590), 'ai': (625, 590)}
+PREVIEW_CELL = 15
+
+
+class CanvasRenderer:
+    """
+    Draws both boards on a Canvas, updating only the items that changed.
+    """
+
+    def __init__(self, canvas, grid_width=10, grid_height=20, colors=None):
+        """
+        Creates every static item of the duel.
+
+        :param canvas: The tkinter Canvas to draw on.
+        :param grid_width: Number of columns of a board.
+        :param grid_height: Number of rows of a board.
+        :param colors: Dict mapping piece types to '#rrggbb' colours.
+        """
+        self.canvas = canvas
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        # Palette complète calculée une fois: types de pièces et couleurs arc-en-ciel
+        self.colors = dict(colors) if colors is not None else {}
+        self.rainbow = [f'#{random.randint(128, 255):02x}{random.randint(128, 255):02x}'
+                        f'{random.randint(128, 255):02x}'
+                        for _ in range(RAINBOW_FRAMES * grid_width * grid_height)]
+        # Identifiants des rectangles et couleur affichée de chaque case, par joueur
+        self.cells = {}
+        self.drawn = {}
+        # Textes affichés, aperçus et bandeaux visibles, pour ne les changer qu'au besoin
+        self.texts = {}
+        self.text_values = {}
+        self.previews = {}
+        self.banners = {}
+        self.banners_visible = {}
+        # Le mode arc-en-ciel recolore tout: il faut tout redessiner à sa fin
+        self.rainbow_drawn = False
+        self.build()
+
+    def build(self):
+        """Create the cells, borders, labels and texts."""
+        canvas = self.canvas
+        width, height = BOARD_SIZE
+        for player, (grid_x, grid_y) in BOARD_ORIGINS.items():
+            self.build_cells(player, grid_x, grid_y)
+            self.drawn[player] = [EMPTY_FILL] * (self.grid_width * self.grid_height)
+            canvas.create_rectangle(grid_x, grid_y, grid_x + width, grid_y + height, outline='white', width=2)
+
+            center_x = grid_x + width / 2
+            label = "HUMAN PLAYER" if player == 'human' else "AI PLAYER"
+            canvas.create_text(center_x, 30, text=label, fill="white", font=("Arial", 14))
+            canvas.create_text(center_x, 570, text="NEXT PIECE:", fill="white", font=("Arial", 12))
+            self.texts[('score', player)] = canvas.create_text(center_x, 620, text="", fill="white",
+                                                               font=("Arial", 16))
+            self.texts[('lines', player)] = canvas.create_text(center_x, 645, text="", fill="white",
+                                                               font=("Arial", 14))
+            self.previews[player] = None
+
+        self.banners['gentle_pause'] = canvas.create_text(400, 30, text="GENTLE PAUSE ACTIVE!", fill="yellow",
+                                                          font=("Arial", 16), state='hidden')
+        self.banners['rainbow'] = canvas.create_text(400, 580, text="RAINBOW MODE!", fill="magenta",
+                                                     font=("Arial", 16), state='hidden')
+        self.banners_visible = {name: False for name in self.banners}
+
+    def build_cells(self, player, grid_x, grid_y):
+        """Create one rectangle per cell of a board."""
+        cell_width = BOARD_SIZE[0] / self.grid_width
+        cell_height = BOARD_SIZE[1] / self.grid_height
+        items = []
+        for row in range(self.grid_height):
+            for col in range(self.grid_width):
+                x1 = grid_x + col * cell_width
+                y1 = grid_y + row * cell_height
+                items.append(self.canvas.create_rectangle(x1, y1, x1 + cell_width, y1 + cell_height,
+                                                          fill=EMPTY_FILL, outline=EMPTY_OUTLINE, width=0.5))
+        self.cells[player] = items
+
+    def render(self, game, rainbow_mode=False, gentle_pause=False, frame_count=0):
+        """
+        Brings the canvas up to date with the game.
+
+        :param game: The TetrisGame to draw.
+        :param rainbow_mode: Draw the blocks in random colours.
+        :param gentle_pause: Show the gentle pause banner.
+        :param frame_count: Frame number, selecting the rainbow colours.
+        :return: The number of cells whose colour changed.
+        """
+        changed = 0
+        full = rainbow_mode or self.rainbow_drawn
+        self.rainbow_drawn = rainbow_mode
+        for player in BOARD_ORIGINS:
+            changes = game.take_changes(player)
+            if full or changes.full:
+                grid = game.get_grid_with_current_piece(player)
+                changed += self.draw_cells(player, grid, rainbow_mode, frame_count)
+            else:
+                changed += self.draw_changes(player, game, changes)
+            self.flush_cells(player)
+            self.draw_preview(player, game.next_pieces[player])
+            self.set_text(('score', player), f"Score: {game.scores[player]}")
+            self.set_text(('lines', player), f"Lines: {game.lines_completed[player]}")
+        self.show_banner('gentle_pause', gentle_pause)
+        self.show_banner('rainbow', rainbow_mode)
+        return changed
+
+    def cell_color(self, value, row, col, rainbow_mode, frame_count):
+        """Return the fill colour of a cell holding a grid value."""
+        if not value:
+            return EMPTY_FILL
+        if not isinstance(value, str):
+            return SPECIAL_COLOR
+        if rainbow_mode:
+            frame = frame_count % RAINBOW_FRAMES
+            return self.rainbow[(frame * self.grid_height + row) * self.grid_width + col]
+        return self.colors.get(value, UNKNOWN_COLOR)
+
+    def draw_cells(self, player, grid, rainbow_mode=False, frame_count=0):
+        """
+        Recolours the cells of a board that differ from the last frame.
+
+        :param player: The board drawn ('human' or 'ai').
+        :param grid: The grid values, including the falling piece.
+        :return: The number of cells updated.
+        """
+        width = self.grid_width
+        changed = 0
+        for row, values in enumerate(grid):
+            for col, value in enumerate(values):
+                color = self.cell_color(value, row, col, rainbow_mode, frame_count)
+                changed += self.set_cell(player, row * width + col, color)
+        return changed
+
+    def draw_changes(self, player, game, changes):
+        """
+        Recolours the cells listed in a change set.
+
+        :param player: The board drawn ('human' or 'ai').
+        :param game: The TetrisGame drawn.
+        :param changes: The ChangeSet returned by game.take_changes(player).
+        :return: The number of cells updated.
+        """
+        width = self.grid_width
+        cells = set(changes.cells)
+        for row in changes.rows:
+            cells.update((row, col) for col in range(width))
+        if not cells:
+            return 0
+        board = game.boards[player]
+        piece = game.current_pieces[player]
+        piece_cells = set(game.get_current_piece_cells(player)) if piece else ()
+        changed = 0
+        for row, col in cells:
+            value = piece['type'] if (row, col) in piece_cells else board.get(row, col)
+            changed += self.set_cell(player, row * width + col, self.cell_color(value, row, col, False, 0))
+        return changed
+
+    def set_cell(self, player, index, color):
+        """Recolour one cell if its colour differs; return 1 if it was updated."""
+        drawn = self.drawn[player]
+        if drawn[index] == color:
+            return 0
+        drawn[index] = color
+        outline = EMPTY_OUTLINE if color == EMPTY_FILL else BLOCK_OUTLINE
+        self.canvas.itemconfig(self.cells[player][index], fill=color, outline=outline)
+        return 1
+
+    def flush_cells(self, player):
+        """Push the cell updates of a board to the display (immediate with rectangles)."""
+
+    def draw_preview(self, player, piece):
+        """Redraw the next-piece preview of a player when the piece changed."""
+        key = piece_key(piece)
+        if key == self.previews[player]:
+            return
+        self.previews[player] = key
+        tag = f'preview_{player}'
+        self.canvas.delete(tag)
+        if not piece:
+            return
+
+        shape = piece['shape']  # First rotation
+        r, g, b = piece['color']
+        color = f'#{r:02x}{g:02x}{b:02x}'
+        center_x, center_y = PREVIEW_CENTERS[player]
+        offset_x = center_x - len(shape[0]) * PREVIEW_CELL / 2
+        offset_y = center_y - len(shape) * PREVIEW_CELL / 2
+        for i, line in enumerate(shape):
+            for j, filled in enumerate(line):
+                if filled:
+                    x1 = offset_x + j * PREVIEW_CELL
+                    y1 = offset_y + i * PREVIEW_CELL
+                    self.canvas.create_rectangle(x1, y1, x1 + PREVIEW_CELL, y1 + PREVIEW_CELL, fill=color,
+                                                 outline='black', tags=tag)
+
+    def set_text(self, name, text):
+        """Change a text item if its content differs."""
+        if self.text_values.get(name) != text:
+            self.text_values[name] = text
+            self.canvas.itemconfig(self.texts[name], text=text)
+
+    def show_banner(self, name, visible):
+        """Show or hide an effect banner if its visibility differs."""
+        if self.banners_visible[name] != visible:
+            self.banners_visible[name] = visible
+            self.canvas.itemconfig(self.banners[name], state='normal' if visible else 'hidden')
+
+    def show_game_over(self, winner):
+        """Draw the game over box above the boards."""
+        self.canvas.create_rectangle(200, 250, 600, 350, fill='black', outline='white', width=3, tags='game_over')
+        self.canvas.create_text(400, 285, text="GAME OVER", fill="red", font=("Arial", 24, "bold"),
+                                tags='game_over')
+        self.canvas.create_text(400, 315, text=winner, fill="yellow", font=("Arial", 18), tags='game_over')
+        # Add restart instruction
+        self.canvas.create_text(400, 500, text="Press 'R' to restart", fill="white", font=("Arial", 14),
+                                tags='game_over')
+
+    def clear_game_over(self):
+        """Remove the game over box."""
+        self.canvas.delete('game_over')
+
+
+class ImageRenderer(CanvasRenderer):
+    """
+    Draws each board as one PhotoImage, updated with a single put() per frame.
+    """
+
+    def __init__(self, canvas, grid_width=10, grid_height=20, colors=None, image_factory=tk.PhotoImage):
+        """
+        Creates the board images and every static item of the duel.
+
+        :param canvas: The tkinter Canvas to draw on.
+        :param grid_width: Number of columns of a board.
+        :param grid_height: Number of rows of a board.
+        :param colors: Dict mapping piece types to '#rrggbb' colours.
+        :param image_factory: Called as image_factory(width=..., height=...)
+                              to create the images (tk.PhotoImage).
+        """
+        self.image_factory = image_factory
+        # Image d'un pixel par case, image affichée et lignes de couleurs, par joueur
+        self.sources = {}
+        self.images = {}
+        self.row_data = {}
+        self.dirty_rows = {}
+        self.zoom = (int(BOARD_SIZE[0] // grid_width), int(BOARD_SIZE[1] // grid_height))
+        super().__init__(canvas, grid_width, grid_height, colors)
+
+    def build_cells(self, player, grid_x, grid_y):
+        """Create the images of a board and the grid lines drawn over them."""
+        zoom_x, zoom_y = self.zoom
+        width, height = self.grid_width * zoom_x, self.grid_height * zoom_y
+        self.sources[player] = self.image_factory(width=self.grid_width, height=self.grid_height)
+        self.images[player] = self.image_factory(width=width, height=height)
+        self.canvas.create_image(grid_x, grid_y, image=self.images[player], anchor='nw')
+        # Lignes de la grille, fixes, à la place des contours des rectangles
+        for col in range(1, self.grid_width):
+            x = grid_x + col * zoom_x
+            self.canvas.create_line(x, grid_y, x, grid_y + height, fill=EMPTY_OUTLINE)
+        for row in range(1, self.grid_height):
+            y = grid_y + row * zoom_y
+            self.canvas.create_line(grid_x, y, grid_x + width, y, fill=EMPTY_OUTLINE)
+        self.row_data[player] = [''] * self.grid_height
+        self.dirty_rows[player] = set(range(self.grid_height))
+
+    def set_cell(self, player, index, color):
+        """Record the new colour of a cell; its row is rebuilt by flush_cells."""
+        drawn = self.drawn[player]
+        if drawn[index] == color:
+            return 0
+        drawn[index] = color
+        self.dirty_rows[player].add(index // self.grid_width)
+        return 1
+
+    def flush_cells(self, player):
+        """Rebuild the changed row strings and upload the board in one put()."""
+        dirty = self.dirty_rows[player]
+        if not dirty:
+            return
+        width = self.grid_width
+        drawn = self.drawn[player]
+        rows = self.row_data[player]
+        for row in dirty:
+            rows[row] = '{' + ' '.join(drawn[row * width:(row + 1) * width]) + '}'
+        dirty.clear()
+        source, image = self.sources[player], self.images[player]
+        source.put(' '.join(rows), to=(0, 0))
+        # Copie agrandie dans l'image affichée, sans créer de nouvelle image
+        image.tk.call(image, 'copy', source, '-zoom', *self.zoom)
+
+
+# Render backends selectable in TetrisDuel
+RENDERERS = {'canvas': CanvasRenderer, 'image': ImageRenderer}
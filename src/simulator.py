@@ -0,0 +1,109 @@
+# tetris_duel/src/simulator.py
+
+"""
+Simulateur de placement utilisé par l'IA.
+
+MoveSimulator answers "what does the board look like if this piece is
+dropped here?" without cloning the game: the piece is dropped with the
+board's constant-time landing query and the result, with completed lines
+already removed, is written into scratch row and column buffers owned by the
+simulator and reused for every candidate. The simulator maintains the same
+incremental features as Board, so heuristics read them the same way for the
+live game and for simulated boards.
+"""
+
+try:
+    from game import piece_shape
+    from board import ColumnFeatures, compact_columns
+except ImportError:
+    from src.game import piece_shape
+    from src.board import ColumnFeatures, compact_columns
+
+
+class MoveSimulator(ColumnFeatures):
+    """
+    Drops pieces onto a copy of a board held in reusable scratch buffers.
+    """
+
+    def __init__(self, width=10, height=20):
+        """
+        Creates the scratch buffers.
+
+        :param width: Number of columns of the simulated boards.
+        :param height: Number of rows of the simulated boards.
+        """
+        self.width = width
+        self.height = height
+        self.full_mask = (1 << width) - 1
+        self.rows = [0] * height
+        self.cols = [0] * width
+        self.reset_features()
+
+    def simulate(self, board, piece, rotation, col, row=0):
+        """
+        Drops a piece onto a board and clears the completed lines.
+
+        The source board is left untouched; the resulting board is written
+        into ``self.rows``, ``self.cols`` and the features, which are
+        overwritten by the next call.
+
+        :param board: The Board the piece is dropped onto.
+        :param piece: The piece dict (a regular tetromino or a funny piece).
+        :param rotation: Rotation index of the piece (ignored for funny pieces).
+        :param col: Board column of the piece matrix's left edge.
+        :param row: Board row the piece starts falling from.
+        :return: A tuple (rows, lines_cleared), or None if the piece does not
+                 fit at its starting position.
+        """
+        shape = piece_shape(piece, rotation)
+        if not board.fits(shape, row, col):
+            return None
+        return self.rows, self.place(board, shape, board.landing_row(shape, row, col), col)
+
+    def place(self, board, shape, row, col):
+        """
+        Locks a PieceShape at (row, col) on a copy of the board.
+
+        :return: The number of lines cleared, the resulting board being in
+                 ``self.rows``, ``self.cols`` and the features.
+        """
+        rows = self.rows
+        cols = self.cols
+        rows[:] = board.rows
+        cols[:] = board.cols
+        self.copy_features(board)
+        full_mask = self.full_mask
+        cleared = 0
+        touched = 0
+        for offset, mask in shape.masks:
+            r = row + offset
+            shifted = mask << col if col >= 0 else mask >> -col
+            rows[r] |= shifted
+            touched |= shifted
+            row_bit = 1 << r
+            while shifted:
+                low = shifted & -shifted
+                cols[low.bit_length() - 1] |= row_bit
+                shifted ^= low
+            if rows[r] == full_mask:
+                cleared += 1
+        if cleared:
+            # Compactage en place, du bas vers le haut
+            removed = []
+            write = self.height - 1
+            for r in range(self.height - 1, -1, -1):
+                if rows[r] != full_mask:
+                    rows[write] = rows[r]
+                    write -= 1
+                else:
+                    removed.append(r)
+            for r in range(write + 1):
+                rows[r] = 0
+            removed.reverse()
+            compact_columns(cols, removed)
+            touched = full_mask
+        while touched:
+            low = touched & -touched
+            self.update_column(low.bit_length() - 1)
+            touched ^= low
+        return cleared
@@ -0,0 +1,171 @@
+# tetris_duel/src/tournament.py
+
+"""
+Tournoi IA contre IA sans interface graphique.
+
+Runs many headless duels where an AI controls both boards, spreads them over
+a process pool and aggregates scores, lines, game length and decision speed
+into a JSON report. Every game gets its own seed so any result can be
+replayed, and results are streamed as soon as each game finishes.
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+try:
+    from game import TetrisGame
+    from ai import AI
+except ImportError:
+    from src.game import TetrisGame
+    from src.ai import AI
+
+PLAYERS = ('human', 'ai')
+
+
+def play_duel(seed, max_pieces=500):
+    """
+    Plays one headless AI-vs-AI duel.
+
+    Each tick, both AIs pick a move for their fresh piece and hard-drop it,
+    then gravity advances the game by one step. The AIs search without a
+    deadline, so a seed replays the same duel whatever the machine load.
+
+    :param seed: Seed of the game's random generator.
+    :param max_pieces: Maximum number of pieces placed per player.
+    :return: A dict with the seed, scores, lines, length and decision timing.
+    """
+    random.seed(seed)
+    game = TetrisGame()
+    game.initialize_game()
+    ais = {player: AI(game, player, time_budget=None) for player in PLAYERS}
+
+    decisions = 0
+    thinking_time = 0.0
+    ticks = 0
+    started = time.perf_counter()
+    while not game.game_over and decisions < max_pieces * len(PLAYERS):
+        for player in PLAYERS:
+            if game.game_over:
+                break
+            decision_start = time.perf_counter()
+            move = ais[player].calculate_best_move()
+            thinking_time += time.perf_counter() - decision_start
+            decisions += 1
+            ais[player].play_move(move)
+        game.update_game_state()
+        ticks += 1
+
+    if game.scores['human'] == game.scores['ai']:
+        winner = None
+    else:
+        winner = max(PLAYERS, key=lambda player: game.scores[player])
+    return {
+        'seed': seed,
+        'scores': dict(game.scores),
+        'lines': dict(game.lines_completed),
+        'winner': winner,
+        'ticks': ticks,
+        'decisions': decisions,
+        'thinking_time': thinking_time,
+        'duration': time.perf_counter() - started,
+        'finished': game.game_over
+    }
+
+
+def _play_duel_task(args):
+    """Pool helper unpacking (seed, max_pieces)."""
+    return play_duel(*args)
+
+
+def iter_duels(seeds, max_pieces=500, workers=None):
+    """
+    Plays duels in a process pool and yields each result as soon as it is ready.
+
+    :param seeds: Iterable of per-game seeds.
+    :param max_pieces: Maximum number of pieces placed per player and game.
+    :param workers: Number of worker processes (defaults to the CPU count);
+                    1 plays the games in the current process.
+    """
+    tasks = [(seed, max_pieces) for seed in seeds]
+    if workers == 1:
+        for task in tasks:
+            yield _play_duel_task(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(_play_duel_task, tasks):
+            yield result
+
+
+def _summary(values):
+    """Mean, minimum and maximum of a list of numbers."""
+    if not values:
+        return {'mean': 0, 'min': 0, 'max': 0}
+    return {'mean': sum(values) / len(values), 'min': min(values), 'max': max(values)}
+
+
+def build_report(results):
+    """
+    Aggregates duel results into a report.
+
+    :param results: List of dicts returned by play_duel.
+    :return: A JSON-serialisable dict.
+    """
+    results = sorted(results, key=lambda result: result['seed'])
+    decisions = sum(result['decisions'] for result in results)
+    thinking_time = sum(result['thinking_time'] for result in results)
+    return {
+        'games': len(results),
+        'wins': {player: sum(1 for r in results if r['winner'] == player) for player in PLAYERS},
+        'ties': sum(1 for r in results if r['winner'] is None),
+        'scores': {player: _summary([r['scores'][player] for r in results]) for player in PLAYERS},
+        'lines': {player: _summary([r['lines'][player] for r in results]) for player in PLAYERS},
+        'ticks': _summary([r['ticks'] for r in results]),
+        'decisions': decisions,
+        'decisions_per_second': decisions / thinking_time if thinking_time > 0 else 0,
+        'results': results
+    }
+
+
+def run_tournament(games=10, seed=0, max_pieces=500, workers=None, stream=None):
+    """
+    Runs a full tournament and returns its report.
+
+    :param games: Number of duels to play.
+    :param seed: Seed of the first game; game i uses seed + i.
+    :param max_pieces: Maximum number of pieces placed per player and game.
+    :param workers: Number of worker processes.
+    :param stream: Optional text file receiving one JSON line per finished game.
+    """
+    results = []
+    for result in iter_duels(range(seed, seed + games), max_pieces, workers):
+        results.append(result)
+        if stream is not None:
+            stream.write(json.dumps(result) + "\n")
+            stream.flush()
+    return build_report(results)
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI Tetris Duel games.")
+    parser.add_argument('--games', type=int, default=10, help="number of duels to play")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first duel (game i uses seed + i)")
+    parser.add_argument('--max-pieces', type=int, default=500, help="pieces per player before a duel is stopped")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--output', default='tournament_report.json', help="path of the JSON report")
+    args = parser.parse_args(argv)
+
+    report = run_tournament(args.games, args.seed, args.max_pieces, args.workers, stream=sys.stdout)
+    with open(args.output, 'w') as report_file:
+        json.dump(report, report_file, indent=2)
+    print(f"{report['games']} games, {report['decisions_per_second']:.1f} decisions/s, "
+          f"report written to {args.output}", file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
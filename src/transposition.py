@@ -0,0 +1,94 @@
+# tetris_duel/src/transposition.py
+
+"""
+Table de transposition pour les évaluations de l'IA.
+
+The lookahead places the next piece on the boards it keeps, and the next
+decision usually starts from one of those boards with that same piece, so
+the same placements are searched and evaluated again. TranspositionTable is
+a bounded LRU cache for this work, with hit and miss counters to size it.
+The AI keys it on the parent board's rows and the piece and looks it up
+before searching the placements and building the resulting boards, so a hit
+skips both (see AI.generate_placements and AI.score_placements). Entries are
+only reused by the next decision, so a few dozen are enough.
+"""
+
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    Bounded mapping from hashable keys to evaluations with LRU eviction.
+    """
+
+    def __init__(self, max_size=4096):
+        """
+        Creates an empty table.
+
+        :param max_size: Maximum number of entries kept before the least
+                         recently used one is evicted.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Looks a key up, counting the hit or miss.
+
+        :return: The stored value, or None if the key is unknown.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entry if full."""
+        entries = self.entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def lookup(self, rows, compute):
+        """
+        Returns the features of a board, computing and storing them on a miss.
+
+        :param rows: The board's row bitmasks.
+        :param compute: Callable returning the features of that board.
+        """
+        key = tuple(rows)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Returns the table's counters.
+
+        :return: A dict with hits, misses, hit_rate, size and max_size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+            'max_size': self.max_size
+        }
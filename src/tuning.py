@@ -0,0 +1,262 @@
+# tetris_duel/src/tuning.py
+
+"""
+Réglage des poids de l'IA par algorithme génétique.
+
+A population of weight vectors (height, lines, holes, bumpiness) evolves
+over generations: every candidate plays the same seeded headless games, its
+fitness is the mean number of lines it clears, and each generation the
+weakest candidates are replaced by children of the strongest. Games are
+spread over a process pool and use the fastest AI path (no lookahead, and
+the simulator's constant-time surface features).
+
+The whole state, including the optimizer's random generator and the run's
+settings, is written to a JSON checkpoint after each generation so an
+interrupted run resumes where it stopped (a checkpoint written with other
+settings is refused rather than silently mixed in), and the best weights found so far are written to a weight file
+that AI.load_weights reads.
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+
+try:
+    from game import TetrisGame
+    from ai import AI
+except ImportError:
+    from src.game import TetrisGame
+    from src.ai import AI
+
+# Weights tuned; the AI's 'random' factor is left out and disabled while tuning
+FEATURES = ('height', 'lines', 'holes', 'bumpiness')
+
+
+def play_game(weights, seed, max_pieces=200):
+    """
+    Plays one headless single-board game with the given weights.
+
+    :param weights: Dict of the FEATURES weights.
+    :param seed: Seed of the game's random generator.
+    :param max_pieces: Maximum number of pieces placed.
+    :return: The number of lines cleared.
+    """
+    random.seed(seed)
+    game = TetrisGame()
+    game.initialize_game()
+    ai = AI(game, 'ai', search_depth=1, time_budget=None)
+    ai.weights.update(weights)
+    ai.weights['random'] = 0
+    pieces = 0
+    while not game.game_over and pieces < max_pieces:
+        ai.play_move(ai.calculate_best_move())
+        pieces += 1
+    return game.lines_completed['ai']
+
+
+def _play_game_task(args):
+    """Pool helper unpacking (candidate, weights, seed, max_pieces)."""
+    candidate, weights, seed, max_pieces = args
+    return candidate, play_game(weights, seed, max_pieces)
+
+
+def iter_games(tasks, workers=None):
+    """
+    Plays games in a process pool and yields (candidate, lines) as they finish.
+
+    :param tasks: List of (candidate, weights, seed, max_pieces).
+    :param workers: Number of worker processes (defaults to the CPU count);
+                    1 plays the games in the current process.
+    """
+    if workers == 1:
+        for task in tasks:
+            yield _play_game_task(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(_play_game_task, tasks):
+            yield result
+
+
+def evaluate_population(population, seeds, max_pieces=200, workers=None):
+    """
+    Measures the fitness of every candidate on the same seeded games.
+
+    :param population: List of weight dicts.
+    :param seeds: Seeds of the games played by each candidate.
+    :param max_pieces: Maximum number of pieces placed per game.
+    :param workers: Number of worker processes.
+    :return: The list of mean lines cleared, one per candidate.
+    """
+    tasks = [(i, weights, seed, max_pieces) for i, weights in enumerate(population) for seed in seeds]
+    totals = [0] * len(population)
+    for candidate, lines in iter_games(tasks, workers):
+        totals[candidate] += lines
+    return [total / len(seeds) for total in totals]
+
+
+def normalize(weights):
+    """Scale a weight dict to unit length; only the ratios between weights matter."""
+    norm = math.sqrt(sum(weights[name] ** 2 for name in FEATURES)) or 1.0
+    return {name: weights[name] / norm for name in FEATURES}
+
+
+def random_weights(rng):
+    """Draw a random unit weight vector."""
+    return normalize({name: rng.uniform(-1, 1) for name in FEATURES})
+
+
+def crossover(parent, other, parent_fitness, other_fitness):
+    """Average two parents, each weighted by its fitness."""
+    total = parent_fitness + other_fitness
+    share = parent_fitness / total if total > 0 else 0.5
+    return normalize({name: share * parent[name] + (1 - share) * other[name] for name in FEATURES})
+
+
+def mutate(weights, rng, rate=0.05, amount=0.2):
+    """Randomly nudge one weight of a child, with probability ``rate``."""
+    if rng.random() < rate:
+        weights = dict(weights)
+        weights[rng.choice(FEATURES)] += rng.uniform(-amount, amount)
+        weights = normalize(weights)
+    return weights
+
+
+def next_generation(population, fitness, rng, offspring=0.3, tournament=0.1):
+    """
+    Breeds a new generation.
+
+    Pairs of parents are picked by tournament selection, their children
+    replace the weakest ``offspring`` share of the population.
+
+    :return: The new population (survivors first, then children).
+    """
+    size = len(population)
+    ranked = sorted(range(size), key=lambda i: fitness[i], reverse=True)
+    n_children = max(1, int(size * offspring))
+    tournament_size = max(2, int(size * tournament))
+    children = []
+    while len(children) < n_children:
+        picked = sorted(rng.sample(range(size), tournament_size), key=lambda i: fitness[i], reverse=True)
+        first, second = picked[:2]
+        child = crossover(population[first], population[second], fitness[first], fitness[second])
+        children.append(mutate(child, rng))
+    return [population[i] for i in ranked[:size - n_children]] + children
+
+
+def load_checkpoint(path):
+    """Read a checkpoint written by save_checkpoint, or None if there is none."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as checkpoint_file:
+        state = json.load(checkpoint_file)
+    version, internal, gauss = state['rng_state']
+    state['rng_state'] = (version, tuple(internal), gauss)
+    return state
+
+
+def save_checkpoint(path, state):
+    """Write the tuning state atomically, so an interrupted write keeps the old checkpoint."""
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as checkpoint_file:
+        json.dump(state, checkpoint_file)
+    os.replace(temporary, path)
+
+
+def save_weights(path, weights, fitness=None):
+    """Write a weight file readable by AI.load_weights."""
+    content = dict(weights)
+    if fitness is not None:
+        content['fitness'] = fitness
+    with open(path, 'w') as weights_file:
+        json.dump(content, weights_file, indent=2)
+
+
+def tune(generations=10, population_size=20, games=4, max_pieces=200, seed=0, workers=None,
+         checkpoint=None, output=None, log=None):
+    """
+    Runs (or resumes) the genetic algorithm.
+
+    :param generations: Total number of generations evaluated.
+    :param population_size: Number of candidates per generation.
+    :param games: Number of seeded games played by each candidate.
+    :param max_pieces: Maximum number of pieces placed per game.
+    :param seed: Seed of the optimizer; games use seeds ``seed`` to ``seed + games - 1``.
+    :param workers: Number of worker processes.
+    :param checkpoint: Optional path of the JSON checkpoint, resumed when present.
+    :param output: Optional path of the weight file written after each generation.
+    :param log: Optional text file receiving one line per generation.
+    :return: A tuple (best weights, best fitness); the fitness is None when
+             no generation was evaluated.
+    :raises ValueError: If the checkpoint was written with other settings.
+    """
+    settings = {'population_size': population_size, 'games': games, 'max_pieces': max_pieces, 'seed': seed}
+    state = load_checkpoint(checkpoint)
+    rng = random.Random(seed)
+    if state is None:
+        # Le point de départ inclut les poids actuels de l'IA
+        initial = normalize(AI.DEFAULT_WEIGHTS)
+        population = [initial] + [random_weights(rng) for _ in range(population_size - 1)]
+        state = {'generation': 0, 'population': population, 'best': None, 'best_fitness': None,
+                 'settings': settings}
+    else:
+        # Les fitness d'un autre réglage ne sont pas comparables
+        if state.get('settings') != settings:
+            raise ValueError(f"checkpoint {checkpoint} was written with {state.get('settings')}, "
+                             f"not {settings}; remove it or use the same settings")
+        rng.setstate(state['rng_state'])
+        population = state['population']
+
+    seeds = list(range(seed, seed + games))
+    while state['generation'] < generations:
+        fitness = evaluate_population(population, seeds, max_pieces, workers)
+        best = max(range(len(population)), key=lambda i: fitness[i])
+        if state['best_fitness'] is None or fitness[best] > state['best_fitness']:
+            state['best'], state['best_fitness'] = population[best], fitness[best]
+        if log is not None:
+            log.write(f"generation {state['generation'] + 1}/{generations}: best {fitness[best]:.1f} lines, "
+                      f"mean {sum(fitness) / len(fitness):.1f}\n")
+            log.flush()
+
+        population = next_generation(population, fitness, rng)
+        state['generation'] += 1
+        state['population'] = population
+        state['rng_state'] = rng.getstate()
+        if checkpoint:
+            save_checkpoint(checkpoint, state)
+        if output:
+            save_weights(output, state['best'], state['best_fitness'])
+    return state['best'], state['best_fitness']
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Tune the Tetris Duel AI weights with a genetic algorithm.")
+    parser.add_argument('--generations', type=int, default=10, help="number of generations to evaluate")
+    parser.add_argument('--population', type=int, default=20, help="candidates per generation")
+    parser.add_argument('--games', type=int, default=4, help="seeded games played by each candidate")
+    parser.add_argument('--max-pieces', type=int, default=200, help="pieces per game before it is stopped")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the optimizer and of the first game")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--checkpoint', default='tuning_checkpoint.json', help="checkpoint path, resumed if present")
+    parser.add_argument('--output', default='ai_weights.json', help="path of the weight file")
+    args = parser.parse_args(argv)
+
+    try:
+        weights, fitness = tune(args.generations, args.population, args.games, args.max_pieces, args.seed,
+                                args.workers, args.checkpoint, args.output, log=sys.stderr)
+    except ValueError as error:
+        parser.error(str(error))
+    if fitness is None:
+        print("no generation evaluated, no weights written", file=sys.stderr)
+    else:
+        print(f"best weights: {json.dumps(weights)} ({fitness:.1f} lines per game), "
+              f"written to {args.output}", file=sys.stderr)
+    return weights
+
+
+if __name__ == "__main__":
+    main()
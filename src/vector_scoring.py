@@ -0,0 +1,145 @@
+# tetris_duel/src/vector_scoring.py
+
+"""
+Évaluation vectorisée des placements candidats.
+
+Instead of dropping candidates one at a time, the boards resulting from every
+placement of a piece are stacked into one (N, height) NumPy array of row
+bitmasks; completed lines are cleared for all candidates at once and the
+board features come from features.batch_features, whose aggregate height,
+holes and bumpiness are the AI's surface features. When the AI has feature
+weights, placement_features adds the landing height and eroded cells of
+each placement the same way.
+
+NumPy is optional: ``np`` is None when it is not installed and the AI keeps
+using its pure Python simulator.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from features import FEATURE_NAMES, PLACEMENT_FEATURE_NAMES, batch_features
+except ImportError:
+    from src.features import FEATURE_NAMES, PLACEMENT_FEATURE_NAMES, batch_features
+
+
+# Décalage appliqué avant de placer une pièce à une colonne négative
+PAD = 4
+# Colonnes de batch_features formant MoveSimulator.features()
+SURFACE_FEATURES = [FEATURE_NAMES.index(name) for name in ('aggregate_height', 'holes', 'bumpiness')]
+
+# Row masks of piece rotations, one (rotations, matrix rows) array per piece
+_mask_tables = {}
+
+
+def mask_table(shapes):
+    """
+    Packs the row masks of every rotation of a piece into an array.
+
+    :param shapes: The PieceShapes of the piece, indexed by rotation.
+    :return: An (rotations, matrix rows) int64 array, cached per piece.
+    """
+    key = tuple(shape.masks for shape in shapes)
+    table = _mask_tables.get(key)
+    if table is None:
+        depth = 1 + max(offset for shape in shapes for offset, _ in shape.masks)
+        table = np.zeros((len(shapes), depth), dtype=np.int64)
+        for rotation, shape in enumerate(shapes):
+            for offset, mask in shape.masks:
+                table[rotation, offset] = mask
+        _mask_tables[key] = table
+    return table
+
+
+def stack_placements(rows, shapes, placements):
+    """
+    Locks every placement on its own copy of a board, lines not cleared.
+
+    :param rows: Row bitmasks of the board, top row first.
+    :param shapes: The PieceShapes of the piece, indexed by rotation.
+    :param placements: Placements returned by generate_placements.
+    :return: An (N, height) int64 array of row bitmasks.
+    """
+    table = mask_table(shapes)
+    height, depth = len(rows), table.shape[1]
+    rotation, row, col = np.array([placement[:3] for placement in placements], dtype=np.int64).T
+    masks = (table[rotation] << (col + PAD)[:, None]) >> PAD
+
+    # Des lignes vides sous le plateau reçoivent les lignes vides de la matrice
+    boards = np.zeros((len(placements), height + depth), dtype=np.int64)
+    boards[:, :height] = rows
+    index = row[:, None] + np.arange(depth)
+    boards[np.arange(len(placements))[:, None], index] |= masks
+    return boards[:, :height]
+
+
+def clear_lines(boards, full_mask):
+    """
+    Removes the completed rows of stacked boards.
+
+    :param boards: An (N, height) array of row bitmasks, modified in place.
+    :param full_mask: Bitmask of a completed row.
+    :return: The number of lines cleared on each board.
+    """
+    full = boards == full_mask
+    cleared = full.sum(axis=1)
+    if cleared.any():
+        # Les lignes pleines passent en tête (tri stable) puis sont vidées
+        order = np.argsort(~full, axis=1, kind='stable')
+        boards[:] = np.take_along_axis(boards, order, axis=1)
+        boards[np.arange(boards.shape[1]) < cleared[:, None]] = 0
+    return cleared
+
+
+def placement_features(boards, shapes, placements, width):
+    """
+    Computes features.placement_features for every placement at once.
+
+    :param boards: Boards returned by stack_placements, lines not cleared yet.
+    :param shapes: The PieceShapes of the piece, indexed by rotation.
+    :param placements: Placements returned by generate_placements.
+    :param width: Number of columns of the boards.
+    :return: An (N, len(PLACEMENT_FEATURE_NAMES)) float array.
+    """
+    table = mask_table(shapes)
+    height, depth = boards.shape[1], table.shape[1]
+    rotation, row = np.array([placement[:2] for placement in placements], dtype=np.int64).T
+    masks = table[rotation]
+    # Lignes de la matrice de la pièce devenues pleines (les lignes vides hors plateau sont ignorées)
+    index = np.minimum(row[:, None] + np.arange(depth), height - 1)
+    full = (np.take_along_axis(boards, index, axis=1) == (1 << width) - 1) & (masks != 0)
+    cells = sum((masks >> bit) & 1 for bit in range(int(table.max()).bit_length()))
+    eroded = full.sum(axis=1) * (cells * full).sum(axis=1)
+    middle = np.array([(shape.top + shape.bottom) / 2 for shape in shapes])
+    landing_height = height - row - middle[rotation]
+    return np.stack([landing_height, eroded], axis=1)
+
+
+def evaluate_placements(rows, width, shapes, placements, with_features=False):
+    """
+    Evaluates every placement of a piece at once.
+
+    :param rows: Row bitmasks of the board, top row first.
+    :param width: Number of columns of the board.
+    :param shapes: The PieceShapes of the piece, indexed by rotation.
+    :param placements: Placements returned by generate_placements.
+    :param with_features: Also compute the features of features.py.
+    :return: A list of (features, lines_cleared, feature_vector), one per
+             placement, as AI.evaluate_placements: features is
+             (aggregate_height, holes, bumpiness), feature_vector follows
+             FEATURE_NAMES + PLACEMENT_FEATURE_NAMES, or is None without
+             with_features.
+    """
+    boards = stack_placements(rows, shapes, placements)
+    if with_features:
+        extra = placement_features(boards, shapes, placements, width)
+    cleared = clear_lines(boards, (1 << width) - 1).tolist()
+    board_vectors = batch_features(boards, width)
+    features = board_vectors[:, SURFACE_FEATURES].tolist()
+    if not with_features:
+        return [(tuple(board), lines, None) for board, lines in zip(features, cleared)]
+    vectors = np.concatenate([board_vectors, extra], axis=1).tolist()
+    return [(tuple(board), lines, tuple(vector)) for board, lines, vector in zip(features, cleared, vectors)]
@@ -5,7 +5,8 @@ import os
 # Add the parent directory to the path to import the src modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.ai import AI
-from src.game import TetrisGame
+from src.game import TetrisGame, TETROMINOS, PIECE_COLORS, FUNNY_PIECE, FUNNY_PIECE_COLOR
+from src.simulator import MoveSimulator
 
 class TestAI(unittest.TestCase):
     """Unit tests for AI logic in Tetris Duel."""
@@ -29,6 +30,61 @@ class TestAI(unittest.TestCase):
         moves = self.ai.get_possible_moves(piece)
         self.assertGreater(len(moves), 0, "There should be at least one possible move.")
 
+    def test_simulator(self):
+        """Test the move simulator drops a piece and clears lines on a scratch board."""
+        board = self.game.boards['ai']
+        board.grid[19] = ['I'] * 9 + [0]
+        simulator = MoveSimulator(self.game.grid_width, self.game.grid_height)
+        vertical_i = {'type': 'I', 'shape': None, 'color': None}
+
+        rows, lines = simulator.simulate(board, vertical_i, 1, 7)
+        self.assertEqual(lines, 1, "Filling the gap should clear the bottom line.")
+        self.assertEqual(rows[16:], [0] + [1 << 9] * 3, "The rest of the I piece should remain.")
+        self.assertEqual(board.rows[19], (1 << 9) - 1, "The source board should not change.")
+        self.assertIsNone(simulator.simulate(board, vertical_i, 1, 9), "Off-board moves should be rejected.")
+
+        heart = {'type': 'funny', 'shape': FUNNY_PIECE['heart'][0], 'color': FUNNY_PIECE_COLOR, 'funny_shape': 'heart'}
+        rows, lines = simulator.simulate(board, heart, 0, 0)
+        self.assertEqual(lines, 0)
+        self.assertEqual(rows[18], 0b100, "The tip of the heart should rest on the bottom line.")
+
+    def test_evaluate_move(self):
+        """Test a move is scored from the board the simulator builds for it."""
+        self.ai.weights['random'] = 0
+        self.game.boards['ai'].grid[19] = ['I'] * 9 + [0]
+        piece = {'type': 'I', 'shape': TETROMINOS['I'][0], 'color': PIECE_COLORS['I']}
+        self.game.current_pieces['ai'] = piece
+        row, col = self.game.piece_positions['ai']
+        simulator = MoveSimulator(self.game.grid_width, self.game.grid_height)
+        _, lines = simulator.simulate(self.game.boards['ai'], piece, 1, col + 4, row)
+        self.assertEqual(lines, 1)
+        self.assertAlmostEqual(self.ai.evaluate_move(1, 4), self.ai.score_features(simulator.features(), lines))
+        self.assertEqual(self.ai.evaluate_move(1, 20), float('-inf'), "Off-board moves should be rejected.")
+
+    def test_evaluate_game_copy(self):
+        """Test a drop simulated on the scratch copy leaves the live game untouched."""
+        self.ai.weights['random'] = 0
+        state = self.game.snapshot()
+        copy = self.ai.get_game_copy()
+        self.assertEqual(copy.snapshot(), state)
+        self.ai.simulate_drop(copy, 'ai')
+        self.assertEqual(self.game.snapshot(), state)
+        self.assertLess(self.ai.evaluate_board(copy), self.ai.evaluate_board(self.game),
+                        "Stacking a piece should lower the score of an empty board.")
+        self.assertIs(self.ai.get_game_copy(), copy, "The scratch game should be reused.")
+
+    def test_play_move_locks_where_evaluated(self):
+        """Test an unplanned move is locked in one validated placement."""
+        self.game.current_pieces['ai'] = {'type': 'I', 'shape': TETROMINOS['I'][0], 'color': PIECE_COLORS['I']}
+        self.ai.planned_move = None
+        self.ai.play_move((1, 4))  # Vertical I, matrix column 7: cells in the last column
+        self.assertEqual(self.game.boards['ai'].cols[9], 0b1111 << 16)
+        # A blocked slide leaves the piece where it is instead of locking it elsewhere
+        self.game.boards['ai'].grid[0][0] = 'O'
+        position = list(self.game.piece_positions['ai'])
+        self.ai.play_move((0, -3))
+        self.assertEqual(self.game.piece_positions['ai'], position)
+
     def tearDown(self):
         """Clean up after tests if necessary."""
         pass
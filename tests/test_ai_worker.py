@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.ai_worker import AIWorker
+from src.game import TetrisGame
+from src.ai import AI
+
+class TestAIWorker(unittest.TestCase):
+    def setUp(self):
+        """Set up a game and a background worker."""
+        self.game = TetrisGame()
+        self.game.initialize_game()
+        self.worker = AIWorker()
+
+    def tearDown(self):
+        """Stop the worker thread."""
+        self.worker.stop()
+
+    def wait_for(self, key, timeout=5):
+        """Poll the worker until the decision for key arrives."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            decision = self.worker.poll(key)
+            if decision is not None:
+                return decision
+            time.sleep(0.005)
+        self.fail("The worker did not answer in time.")
+
+    def test_decision_matches_request(self):
+        """Test a decision is computed on the requested state."""
+        self.worker.request((0, 1), self.game.snapshot())
+        decision = self.wait_for((0, 1))
+        self.assertEqual(decision.origin, (0, 3, 0))
+        self.assertIsNotNone(decision.placement)
+        self.assertIsNone(self.worker.pending, "An answered request should no longer be pending.")
+
+    def test_stale_results_are_dropped(self):
+        """Test results for another key are discarded by poll."""
+        self.worker.request((0, 1), self.game.snapshot())
+        self.worker.request((1, 1), self.game.snapshot())
+        decision = self.wait_for((1, 1))
+        self.assertEqual(decision.key, (1, 1))
+        self.assertIsNone(self.worker.poll((0, 1)), "Older results should not be returned.")
+
+    def test_no_placement_is_not_carried_over(self):
+        """Test a decision without a move does not send the previous piece's placement."""
+        self.worker.request('first', self.game.snapshot())
+        self.assertIsNotNone(self.wait_for('first').placement)
+        for row in range(self.game.grid_height):
+            self.game.boards['ai'].set_row(row, ['O'] * self.game.grid_width)
+        self.worker.request('blocked', self.game.snapshot())
+        decision = self.wait_for('blocked')
+        self.assertIsNone(decision.move)
+        self.assertIsNone(decision.placement)
+
+    def test_placement_replayed_after_gravity(self):
+        """Test a placement planned at spawn is still reached after the piece fell."""
+        self.worker.request('spawn', self.game.snapshot())
+        decision = self.wait_for('spawn')
+        self.game.move_piece('ai', 1, 0)
+        self.game.move_piece('ai', 1, 0)
+        pieces_before = self.game.piece_counts['ai']
+        self.assertTrue(AI(self.game).play_placement(decision.placement, decision.origin))
+        self.assertEqual(self.game.piece_counts['ai'], pieces_before + 1, "The piece should be locked.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import random
+import sys
+import os
+from unittest import mock
+
+import numpy as np
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.batch import BatchTetrisGame, PIECE_TYPES, ACTION_CODES, DROP, NO_ACTION, PAD
+from src.game import TetrisGame
+
+class ScriptedDraws:
+    """Seeded index stream standing in for both engines' random generators."""
+    def __init__(self, seed):
+        self.source = random.Random(seed)
+
+    def choice(self, seq):
+        """random.choice, as used by TetrisGame."""
+        return seq[self.source.randrange(len(seq))]
+
+    def integers(self, low, high, size):
+        """numpy Generator.integers, as used by BatchTetrisGame."""
+        return np.array([low + self.source.randrange(high - low) for _ in range(size)], dtype=np.int64)
+
+class TestBatchTetrisGame(unittest.TestCase):
+    def setUp(self):
+        """Set up a small batch of duels."""
+        self.batch = BatchTetrisGame(4, seed=0)
+
+    def fill_rows(self, game, player, rows, hole_col):
+        """Fill board rows except one column."""
+        for row in rows:
+            self.batch.rows[game, player, row] = self.batch.full_row & ~(1 << (hole_col + PAD))
+
+    def test_initial_state(self):
+        """Test a fresh batch is empty and running."""
+        self.assertFalse(self.batch.game_over.any(), "No duel should be over at the start.")
+        self.assertFalse(self.batch.grid(0, 0).any(), "Boards should start empty.")
+        self.assertTrue((self.batch.scores == 0).all())
+
+    def test_double_clear_scoring_and_gift(self):
+        """Test a double clear scores 200 points and gives the opponent a gift."""
+        self.fill_rows(1, 1, [18, 19], hole_col=9)
+        self.batch.current_pieces[1, 1] = PIECE_TYPES.index('I')
+        self.batch.piece_rotations[1, 1] = 1  # Vertical I, cells in matrix column 2
+        self.batch.piece_cols[1, 1] = 7
+        actions = np.full((4, 2), NO_ACTION)
+        actions[1, 1] = DROP
+        self.batch.step(actions)
+
+        self.assertEqual(self.batch.lines_completed[1, 1], 2)
+        self.assertEqual(self.batch.scores[1, 1], 200, "2 lines should give 50 * 2 + 100 points.")
+        self.assertTrue(self.batch.surprise_gift_pending[1, 0], "The opponent should get a surprise gift.")
+        self.assertEqual(self.batch.grid(1, 1).sum(), 2, "Only the top of the I piece should remain.")
+        self.assertEqual(self.batch.scores[0].sum(), 0, "Other duels should not be affected.")
+
+    def replay(self, seed):
+        """Play one random action stream in TetrisGame and in a batch of one duel, comparing every tick."""
+        actions = random.Random(seed)
+        choices = [None, None, 'left', 'right', 'down', 'up', 'space']
+        with mock.patch('src.game.random', ScriptedDraws(seed)):
+            game = TetrisGame()
+            game.initialize_game()
+            batch = BatchTetrisGame(1)
+            batch.rng = ScriptedDraws(seed)
+            batch.initialize_game()
+            # Lignes presque pleines pour que les deux moteurs en suppriment
+            for row in range(12, 20):
+                hole = 4 + row % 2
+                for index, player in enumerate(('human', 'ai')):
+                    game.boards[player].set_row(row, ['O'] * hole + [0] + ['O'] * (9 - hole))
+                    batch.rows[0, index, row] = batch.full_row & ~(1 << (hole + PAD))
+            for tick in range(3000):
+                moves = (actions.choice(choices), actions.choice(choices))
+                game.step(*moves)
+                batch.step([[ACTION_CODES[move] for move in moves]])
+                self.assertEqual(batch.game_over[0], game.game_over, f"tick {tick}")
+                for index, player in enumerate(('human', 'ai')):
+                    grid = [[bool(value) for value in row] for row in game.grids[player]]
+                    self.assertEqual(batch.grid(0, index).tolist(), grid, f"tick {tick}")
+                    self.assertEqual(batch.scores[0, index], game.scores[player], f"tick {tick}")
+                    self.assertEqual(batch.lines_completed[0, index], game.lines_completed[player], f"tick {tick}")
+                if game.game_over:
+                    break
+        self.assertTrue(game.game_over)
+        return sum(game.lines_completed.values())
+
+    def test_matches_tetris_game(self):
+        """Test a batched duel follows TetrisGame tick for tick from the same pieces and actions."""
+        lines = 0
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                lines += self.replay(seed)
+        self.assertGreater(lines, 0, "Line clears should be compared too.")
+
+    def test_games_end(self):
+        """Test duels eventually top out when pieces only fall."""
+        for _ in range(500):
+            if self.batch.step().all():
+                break
+        self.assertTrue(self.batch.game_over.all(), "Every duel should end without any input.")
+
+if __name__ == '__main__':
+    unittest.main()
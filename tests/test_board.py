@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.board import Board
+from src.game import TetrisGame, PIECE_SHAPES, FUNNY_SHAPES
+
+class TestBoard(unittest.TestCase):
+    def setUp(self):
+        """Set up an empty standard board."""
+        self.board = Board(10, 20)
+
+    def test_fits_and_place(self):
+        """Test bitwise collision and locking of a piece."""
+        piece = PIECE_SHAPES['O'][0]
+        self.assertTrue(self.board.fits(piece, 17, 0), "O piece should fit in the bottom-left corner.")
+        self.assertFalse(self.board.fits(piece, 18, 0), "O piece should not go below the floor.")
+        self.assertFalse(self.board.fits(piece, 0, -2), "O piece should not go through the left wall.")
+        self.assertFalse(self.board.fits(piece, 0, 8), "O piece should not go through the right wall.")
+
+        self.board.place(piece, 17, 0, 'O')
+        self.assertEqual(self.board.rows[18], 0b110, "Locked cells should be set in the row bitmask.")
+        self.assertEqual(self.board.grid[18][1], 'O', "Grid view should expose the piece type.")
+        self.assertFalse(self.board.fits(piece, 16, 0), "O piece should collide with locked cells.")
+
+    def test_piece_shape_table(self):
+        """Test the precomputed geometry of piece rotations."""
+        vertical_i = PIECE_SHAPES['I'][1]
+        self.assertEqual(vertical_i.cells, ((0, 2), (1, 2), (2, 2), (3, 2)))
+        self.assertEqual((vertical_i.left, vertical_i.right), (2, 2))
+        self.assertEqual(vertical_i.profile, ((3, 2),), "Only the lowest cell of a column can land.")
+        self.assertEqual(len(FUNNY_SHAPES['heart'].cells), 16)
+
+    def test_grid_view_assignment(self):
+        """Test writing through the grid view."""
+        self.board.grid[19][3] = 'T'
+        self.assertEqual(self.board.rows[19], 1 << 3)
+        self.board.grid[19] = ['L'] * 10
+        self.assertTrue(self.board.is_full(19), "A row filled through the view should be full.")
+        self.board.grid[19][3] = 0
+        self.assertFalse(self.board.is_full(19))
+
+    def test_remove_row(self):
+        """Test removing a row shifts the rows above down."""
+        self.board.grid[18][0] = 'I'
+        self.board.grid[19] = ['J'] * 10
+        self.board.remove_row(19)
+        self.assertEqual(self.board.grid[19][0], 'I', "Cells above a removed row should move down.")
+        self.assertEqual(self.board.rows[0], 0, "A new empty row should appear at the top.")
+
+    def test_landing_row(self):
+        """Test the landing row is read from the column bitmasks."""
+        piece = PIECE_SHAPES['T'][0]
+        self.assertEqual(self.board.landing_row(piece, 0, 0), 17, "T piece should land on the floor.")
+        self.board.grid[15][1] = 'I'
+        self.assertEqual(self.board.landing_row(piece, 0, 0), 12, "T piece should land on the block.")
+        self.assertEqual(self.board.column_height(1), 5)
+        # Under an overhang the first block below the piece is used
+        self.assertEqual(self.board.landing_row(piece, 16, 0), 17)
+
+    def test_columns_follow_row_removal(self):
+        """Test the column bitmasks stay consistent when a row is removed."""
+        self.board.grid[17][4] = 'S'
+        self.board.grid[19] = ['Z'] * 10
+        self.board.remove_row(19)
+        expected = [sum(1 << r for r in range(20) if (self.board.rows[r] >> c) & 1) for c in range(10)]
+        self.assertEqual(self.board.cols, expected)
+        self.assertEqual(self.board.column_height(4), 2)
+
+    def test_clear_full_rows(self):
+        """Test several completed rows are cleared in one pass."""
+        self.board.grid[16][0] = 'T'
+        self.board.grid[17] = ['I'] * 10
+        self.board.grid[18][5] = 'O'
+        self.board.grid[19] = ['I'] * 10
+        self.assertEqual(self.board.full_rows, {17, 19}, "Fill counters should track completed rows.")
+        self.assertEqual(self.board.clear_full_rows(), 2)
+        self.assertEqual(self.board.grid[18][0], 'T')
+        self.assertEqual(self.board.grid[19][5], 'O')
+        self.assertEqual(self.board.fill[18:], [1, 1])
+        self.assertEqual(self.board.full_rows, set())
+
+    def test_incremental_features(self):
+        """Test heights, holes and bumpiness follow locks and line clears."""
+        self.board.place(PIECE_SHAPES['O'][0], 17, -1, 'O')  # Columns 0 and 1
+        self.board.grid[16][5] = 'T'
+        self.assertEqual(self.board.heights[:6], [2, 2, 0, 0, 0, 4])
+        self.assertEqual(self.board.holes[5], 3)
+        self.assertEqual(self.board.features(), (8, 3, 2 + 4 + 4))
+
+        self.board.grid[19] = ['L'] * 10
+        self.board.clear_full_rows()
+        self.assertEqual(self.board.heights[:6], [1, 1, 0, 0, 0, 3])
+        self.assertEqual(self.board.features(), (5, 2, 1 + 3 + 3))
+
+    def test_game_uses_grid_view(self):
+        """Test the game's grids stay in sync with its bitboards."""
+        game = TetrisGame()
+        game.initialize_game()
+        game.grids['human'][19] = ['I'] * 10
+        self.assertEqual(game.check_for_completed_lines('human'), 1)
+        self.assertEqual(game.boards['human'].rows[19], 0)
+
+if __name__ == '__main__':
+    unittest.main()
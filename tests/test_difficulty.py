@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.difficulty import SearchBudgetController, apply_difficulty, ADAPTIVE_LEVELS
+from src.performance import PerformanceManager
+from src.game import TetrisGame
+from src.ai import AI
+
+class TestDifficulty(unittest.TestCase):
+    def setUp(self):
+        """Set up an AI and a performance manager without window."""
+        self.game = TetrisGame()
+        self.game.initialize_game()
+        self.ai = AI(self.game)
+        self.performance = PerformanceManager()
+
+    def test_presets_set_search_budget(self):
+        """Test presets replace the random noise by a search budget."""
+        apply_difficulty(self.ai, 'easy')
+        self.assertEqual((self.ai.search_depth, self.ai.noise, self.ai.weights['random']), (1, 0, 0))
+        self.ai.calculate_best_move()
+        self.assertEqual(self.ai.decision_stats['evaluated'], 6, "Easy should only consider 6 placements.")
+        apply_difficulty(self.ai, 'expert')
+        self.assertEqual((self.ai.search_depth, self.ai.planner.beam_width), (2, 12))
+        with self.assertRaises(ValueError):
+            apply_difficulty(self.ai, 'impossible')
+
+    def test_controller_follows_measured_times(self):
+        """Test the budget goes down on slow decisions and up with headroom."""
+        controller = SearchBudgetController(self.ai, self.performance, target_fps=60, decision_budget=0.05, window=3)
+        start = controller.level
+        self.assertEqual(self.ai.planner.beam_width, ADAPTIVE_LEVELS[start]['beam_width'])
+
+        self.performance.frame_times = [0.005] * 3
+        for _ in range(3):
+            self.ai.metrics.record(wall_time=0.2)
+        self.assertEqual(controller.update(), start - 1, "Slow decisions should lower the budget.")
+        self.assertEqual(controller.update(), start - 1, "No change before a new window of decisions.")
+
+        for _ in range(3):
+            self.ai.metrics.record(wall_time=0.001)
+        self.assertEqual(controller.update(), start)
+
+        self.performance.frame_times = [0.03] * 3
+        for _ in range(3):
+            self.ai.metrics.record(wall_time=0.001)
+        self.assertEqual(controller.update(), start - 1, "Slow frames should lower the budget.")
+
+if __name__ == '__main__':
+    unittest.main()
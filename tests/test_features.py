@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import random
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import features
+from src.features import FEATURE_NAMES, extract_features, placement_features, batch_features
+from src.game import TETROMINOS, PIECE_COLORS
+from src.placement import piece_rotations
+from src.game import TetrisGame, piece_from_key
+from src.ai import AI
+
+WIDTH = 10
+FULL = (1 << WIDTH) - 1
+
+def board(*bottom_rows, height=20):
+    """Build row bitmasks, top row first, from the given bottom rows."""
+    return [0] * (height - len(bottom_rows)) + list(bottom_rows)
+
+class TestFeatures(unittest.TestCase):
+    def named(self, rows):
+        """Return the features of a board by name."""
+        return dict(zip(FEATURE_NAMES, extract_features(rows, WIDTH)))
+
+    def test_empty_board(self):
+        """Test an empty board only has the wall and floor transitions."""
+        values = self.named(board())
+        self.assertEqual(values['aggregate_height'], 0)
+        self.assertEqual(values['row_transitions'], 2 * 20, "The walls count as filled.")
+        self.assertEqual(values['column_transitions'], WIDTH, "The floor counts as filled.")
+        self.assertEqual(values['wells'], 0)
+
+    def test_well_and_tetris_ready(self):
+        """Test four rows open in the last column form a well ready for a tetris."""
+        rows = board(*[FULL & ~(1 << 9)] * 4)
+        values = self.named(rows)
+        self.assertEqual(values['tetris_ready'], 4)
+        self.assertEqual(values['wells'], 1 + 2 + 3 + 4)
+        self.assertEqual(values['row_transitions'], 20 * 2, "Each row changes twice, at the well or at the walls.")
+        self.assertEqual(values['holes'], 0)
+
+        # Un bloc au-dessus du puits le rend inutilisable
+        rows[15] = 1 << 9
+        values = self.named(rows)
+        self.assertEqual(values['tetris_ready'], 0)
+        self.assertEqual(values['holes'], 4)
+        self.assertEqual(values['covered_cells'], 1)
+
+    def test_covered_cells(self):
+        """Test blocks stacked over a hole are all covered cells."""
+        rows = board(0b1, 0b1, 0b0, 0b1)
+        values = self.named(rows)
+        self.assertEqual(values['holes'], 1)
+        self.assertEqual(values['covered_cells'], 2)
+        self.assertEqual(values['max_height'], 4)
+
+    def test_placement_features(self):
+        """Test a vertical I clearing two lines erodes two of its cells."""
+        rows = board(*[FULL & ~(1 << 9)] * 2)
+        piece = {'type': 'I', 'shape': TETROMINOS['I'][0], 'color': PIECE_COLORS['I']}
+        shape = piece_rotations(piece)[1]
+        # La colonne de la forme verticale dans la matrice 4x4
+        offset = shape.masks[0][1].bit_length() - 1
+        top = 20 - 4 - shape.top
+        landing_height, eroded = placement_features(rows, shape, top, 9 - offset, WIDTH)
+        self.assertEqual(eroded, 2 * 2)
+        self.assertEqual(landing_height, 2.5)
+
+    def test_feature_weight_changes_decision(self):
+        """Test a feature weight changes the placement the AI chooses, on both scoring paths."""
+        for vectorized in (False, True):
+            game = TetrisGame()
+            game.initialize_game()
+            for row in range(16, 20):
+                game.boards['ai'].set_row(row, ['O'] * 9 + [0])
+            game.current_pieces['ai'] = piece_from_key('I')
+            ai = AI(game, search_depth=1, vectorized=vectorized)
+            ai.noise = 0
+            ai.weights['random'] = 0
+            ai.calculate_best_move()
+            self.assertEqual(ai.planned_placement.col + 2, 9, "The I piece should fill the well.")
+
+            ai.feature_weights['eroded_cells'] = -10
+            ai.calculate_best_move()
+            self.assertNotEqual(ai.planned_placement.col + 2, 9,
+                                "Penalizing eroded cells should keep the I piece out of the well.")
+
+    @unittest.skipIf(features.np is None, "NumPy is not installed")
+    def test_batch_matches_python(self):
+        """Test the NumPy extractor agrees with the bitwise one on random boards."""
+        rng = random.Random(3)
+        boards = []
+        for _ in range(100):
+            top = rng.randint(0, 20)
+            rows = [0] * top + [rng.getrandbits(WIDTH) for _ in range(20 - top)]
+            boards.append(rows)
+        vectors = batch_features(boards, WIDTH)
+        for rows, vector in zip(boards, vectors):
+            self.assertEqual(tuple(vector.tolist()), extract_features(rows, WIDTH))
+
+    @unittest.skipIf(features.np is None, "NumPy is not installed")
+    def test_batch_engine_features(self):
+        """Test the batch engine exposes the features of every duel."""
+        from src.batch import BatchTetrisGame, PAD
+        batch = BatchTetrisGame(2, seed=0)
+        batch.rows[1, 1, 19] = batch.full_row & ~(1 << (9 + PAD))
+        vectors = batch.board_features(1)
+        self.assertEqual(vectors.shape, (2, len(FEATURE_NAMES)))
+        self.assertEqual(tuple(vectors[1].tolist()), extract_features(board(FULL & ~(1 << 9)), WIDTH))
+
+if __name__ == '__main__':
+    unittest.main()
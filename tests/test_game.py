@@ -1,10 +1,11 @@
 import unittest
+import subprocess
 import sys
 import os
 
 # Add the parent directory to the path to import the src modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.game import TetrisGame
+from src.game import TetrisGame, PIECE_SHAPES, piece_from_key
 
 class TestGameLogic(unittest.TestCase):
     def setUp(self):
@@ -28,5 +29,109 @@ class TestGameLogic(unittest.TestCase):
         self.game.update_game_state()
         self.assertGreaterEqual(self.game.scores['human'], initial_score, "Human score should not decrease after update.")
 
+    def test_step(self):
+        """Test advancing the game one tick with actions for both players."""
+        start_row = self.game.piece_positions['ai'][0]
+        game_over = self.game.step('left', None)
+        self.assertFalse(game_over, "The game should not end after one tick.")
+        self.assertEqual(self.game.piece_positions['ai'][0], start_row + 1, "Gravity should move the AI piece down.")
+
+        self.game.step('space', 'space')
+        self.assertEqual(self.game.piece_positions['human'][0], 1, "A new piece should spawn after a hard drop.")
+
+    def test_event_hook(self):
+        """Test notifications are published through on_event."""
+        events = []
+        self.game.on_event = lambda event, **details: events.append((event, details))
+        self.game.grids['ai'][19] = ['I'] * 10
+        self.game.grids['ai'][18] = ['I'] * 10
+        self.game.grids['ai'][19][0] = 0
+        self.game.grids['ai'][18][0] = 0
+        self.game.current_pieces['ai'] = {'type': 'I', 'shape': None, 'color': None}
+        self.game.piece_rotations['ai'] = 3
+        self.game.piece_positions['ai'] = [0, -1]
+        self.game.hard_drop('ai')
+        self.assertIn(('gift_pending', {'player': 'human'}), events)
+        self.assertIn(('points', {'player': 'ai', 'base': 100, 'bonus': 100}), events)
+        self.assertEqual(self.game.scores['ai'], 200)
+
+    def test_snapshot_restore(self):
+        """Test a snapshot brings the game back to the captured state."""
+        self.game.grids['human'][19][0] = 'T'
+        state = self.game.snapshot()
+        hash(state)  # Snapshots are immutable values
+        grid = self.game.get_grid_with_current_piece('human')
+        scores = dict(self.game.scores)
+
+        for _ in range(5):
+            self.game.step('space', 'space')
+        self.assertNotEqual(self.game.snapshot(), state)
+
+        self.game.restore(state)
+        self.assertEqual(self.game.snapshot(), state)
+        self.assertEqual(self.game.get_grid_with_current_piece('human'), grid)
+        self.assertEqual(self.game.scores, scores)
+
+    def test_apply_placement(self):
+        """Test a placement is validated once and the piece locked there."""
+        self.game.current_pieces['ai'] = piece_from_key('I')
+        board = self.game.boards['ai']
+        self.assertFalse(self.game.apply_placement('ai', 1, 10, 3), "A floating target should be refused.")
+        self.assertFalse(self.game.apply_placement('ai', 0, 17, 3, ['left', 'space']),
+                         "A path ending elsewhere should be refused.")
+        self.assertEqual(board.rows[18], 0, "A refused placement should leave the board unchanged.")
+
+        # Vertical I dropped into the last column
+        self.assertTrue(self.game.apply_placement('ai', 1, 16, 7))
+        self.assertEqual(board.cols[9], 0b1111 << 16)
+        self.assertEqual(self.game.piece_positions['ai'], [0, 3], "The next piece should spawn.")
+
+    def test_apply_placement_rejects_blocked_slide(self):
+        """Test a direct placement needs a free corridor to its column."""
+        self.game.current_pieces['ai'] = piece_from_key('O')
+        for row in range(0, 20):
+            self.game.boards['ai'].grid[row][6] = 'I'
+        self.assertFalse(self.game.apply_placement('ai', 0, 17, 6), "The O piece cannot slide through column 6.")
+        self.assertTrue(self.game.apply_placement('ai', 0, 17, 3, ['left', 'left', 'right', 'right', 'space']))
+
+    def test_apply_placement_rejects_blocked_rotation(self):
+        """Test a direct placement needs every intermediate rotation to fit."""
+        self.game.current_pieces['ai'] = piece_from_key('I')
+        board = self.game.boards['ai']
+        board.grid[0][5] = 'O'  # Blocks the vertical I, not the horizontal ones
+        shape = PIECE_SHAPES['I'][2]
+        row = board.landing_row(shape, 0, 3)
+        self.assertTrue(board.fits(shape, 0, 3))
+        self.assertFalse(self.game.apply_placement('ai', 2, row, 3),
+                         "The I piece cannot turn twice through the blocked vertical rotation.")
+        self.assertEqual(self.game.piece_rotations['ai'], 0)
+        self.assertEqual(board.rows[row + shape.top], 0, "A refused placement should leave the board unchanged.")
+
+    def test_take_changes(self):
+        """Test change sets list the piece footprints, locked cells and shifted rows."""
+        self.assertTrue(self.game.take_changes('ai').full, "A new game should be redrawn entirely.")
+        self.assertEqual(self.game.take_changes('ai'), (set(), range(0), False))
+
+        before = set(self.game.get_current_piece_cells('ai'))
+        self.game.move_piece('ai', 0, 1)
+        after = set(self.game.get_current_piece_cells('ai'))
+        self.assertEqual(self.game.take_changes('ai').cells, before | after)
+
+        # Vertical I completing the two bottom rows
+        for row in (18, 19):
+            self.game.boards['ai'].set_row(row, ['O'] * 9 + [0])
+        self.game.current_pieces['ai'] = piece_from_key('I')
+        self.assertTrue(self.game.apply_placement('ai', 1, 16, 7))
+        changes = self.game.take_changes('ai')
+        self.assertEqual(changes.rows, range(20), "Every row above the cleared ones moves down.")
+        self.assertTrue({(16, 9), (17, 9)} <= changes.cells, "Locked cells should be listed.")
+
+    def test_headless_import(self):
+        """Test the game core can be imported without tkinter."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = "import sys; sys.modules['tkinter'] = None; import src.game"
+        result = subprocess.run([sys.executable, '-c', code], cwd=root)
+        self.assertEqual(result.returncode, 0, "src.game should not need tkinter.")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.game import TetrisGame
+from src.main import TetrisDuel
+
+class FakeRoot:
+    """Event loop stand-in: run() fires the pending callback scheduled first."""
+    def __init__(self):
+        self.tasks = {}
+        self.idle_calls = 0
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.tasks[self.next_id] = (delay / 1000, callback)
+        return self.next_id
+
+    def after_idle(self, callback):
+        self.next_id += 1
+        self.tasks[self.next_id] = (0.0, callback)
+        self.idle_calls += 1
+        return self.next_id
+
+    def after_cancel(self, task_id):
+        self.tasks.pop(task_id, None)
+
+    def run(self):
+        """Fire the pending callback with the earliest time."""
+        task_id = min(self.tasks, key=lambda i: self.tasks[i][0])
+        _, callback = self.tasks.pop(task_id)
+        callback()
+
+class TestRedrawCoalescing(unittest.TestCase):
+    def setUp(self):
+        """Set up a TetrisDuel without a window: a fake event loop and renderer."""
+        self.root = FakeRoot()
+        duel = TetrisDuel.__new__(TetrisDuel)
+        duel.root = self.root
+        duel.canvas = mock.Mock()
+        duel.renderer = mock.Mock()
+        duel.redraw_task_id = None
+        duel.rainbow_mode = duel.gentle_pause_active = False
+        duel.last_update_time, duel.frame_count, duel.frame_rate = 0, 0, 0
+        duel.game = TetrisGame()
+        duel.game.initialize_game()
+        self.duel = duel
+
+    def test_burst_schedules_one_redraw(self):
+        """Test a burst of key presses is drawn by a single idle redraw."""
+        for command in ('left', 'left', 'up', 'right'):
+            self.duel.on_user_input(command)
+        self.assertEqual(self.root.idle_calls, 1)
+        self.assertEqual(len(self.root.tasks), 1)
+        self.root.run()
+        self.assertEqual(self.duel.renderer.render.call_count, 1)
+        self.assertIsNone(self.duel.redraw_task_id)
+
+    def test_tick_redraw_cancels_pending(self):
+        """Test a tick's redraw replaces the idle redraw waiting to run."""
+        self.duel.on_user_input('left')
+        self.duel.redraw()
+        self.assertFalse(self.root.tasks, "The pending idle redraw should be cancelled.")
+        self.assertIsNone(self.duel.redraw_task_id)
+        self.assertEqual(self.duel.renderer.render.call_count, 1)
+
+    def test_reset_cancels_pending(self):
+        """Test reset_game drops the idle redraw of the previous game."""
+        duel = self.duel
+        duel.ai_task_id = None
+        duel.game_loop = mock.Mock()
+        duel.ai_worker = mock.Mock()
+        duel.scoreboard = mock.Mock()
+        duel.update_ai = mock.Mock()
+        duel.game_generation = 0
+        duel.original_speed = 500
+        duel.on_user_input('left')
+        pending = duel.redraw_task_id
+        with mock.patch('builtins.print'):
+            duel.reset_game()
+        self.assertNotIn(pending, self.root.tasks)
+        self.assertIsNone(duel.redraw_task_id)
+        self.assertEqual(duel.renderer.render.call_count, 1, "Only the reset's own redraw should run.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.metrics import RollingHistogram, DecisionMetrics
+from src.game import TetrisGame
+from src.ai import AI
+
+class TestMetrics(unittest.TestCase):
+    def test_rolling_percentiles(self):
+        """Test percentiles only cover the most recent samples."""
+        histogram = RollingHistogram(window=100)
+        for value in range(1, 201):
+            histogram.add(value)
+        summary = histogram.summary()
+        self.assertEqual(summary['count'], 200)
+        self.assertEqual((summary['p50'], summary['p95'], summary['p99'], summary['max']), (150, 195, 199, 200))
+        self.assertEqual(histogram.percentile(0), 101)
+
+    def test_dump(self):
+        """Test summaries are written as JSON."""
+        metrics = DecisionMetrics()
+        metrics.record(wall_time=0.5, evaluated=10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metrics.json')
+            metrics.dump(path)
+            with open(path) as metrics_file:
+                self.assertEqual(json.load(metrics_file)['evaluated']['p99'], 10)
+
+    def test_ai_records_decisions(self):
+        """Test every AI decision records its search effort."""
+        game = TetrisGame()
+        game.initialize_game()
+        for search_depth in (1, 2):
+            ai = AI(game, search_depth=search_depth)
+            ai.calculate_best_move()
+            summary = ai.metrics.summary()
+            self.assertEqual(summary['wall_time']['count'], 1)
+            self.assertEqual(summary['depth']['max'], search_depth)
+            self.assertGreater(summary['generated']['max'], 0)
+            self.assertGreaterEqual(summary['simulated']['max'], summary['evaluated']['max'])
+            self.assertIn('margin', summary)
+
+if __name__ == '__main__':
+    unittest.main()
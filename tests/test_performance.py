@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.performance import FrameScheduler
+
+class FakeRoot:
+    """Event loop stand-in with a manual clock: run() fires the next after() callback."""
+    def __init__(self):
+        self.now = 0.0
+        self.tasks = {}
+        self.delays = []
+        self.next_id = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.tasks[self.next_id] = (self.now + delay / 1000, callback)
+        self.delays.append(delay)
+        return self.next_id
+
+    def after_cancel(self, task_id):
+        self.tasks.pop(task_id, None)
+
+    def run(self, late=0.0):
+        """Fire the pending callback, ``late`` seconds after its time."""
+        task_id = min(self.tasks, key=lambda i: self.tasks[i][0])
+        when, callback = self.tasks.pop(task_id)
+        self.now = max(self.now, when) + late
+        callback()
+
+class TestFrameScheduler(unittest.TestCase):
+    def setUp(self):
+        """Set up a scheduler ticking every 100 ms on a fake event loop."""
+        self.root = FakeRoot()
+        self.calls = []
+        self.scheduler = FrameScheduler(self.root, lambda: self.calls.append(self.root.now), 0.1,
+                                        clock=self.root.clock)
+
+    def test_lateness_compensated(self):
+        """Test a late call shortens the next delay so ticks stay on their deadlines."""
+        self.scheduler.start()
+        self.root.run()
+        self.root.run(late=0.03)
+        self.assertAlmostEqual(self.scheduler.lateness, 0.03)
+        self.assertEqual(self.root.delays[-1], 70, "The next delay should absorb the 30 ms of lateness.")
+        self.root.run()
+        self.assertAlmostEqual(self.calls[-1], 0.2)
+
+    def test_missed_deadlines_skipped(self):
+        """Test a long stall skips the missed ticks instead of replaying them."""
+        self.scheduler.start()
+        self.root.run(late=0.35)
+        self.assertEqual(self.scheduler.skipped, 2)
+        self.root.run()
+        self.root.run()
+        self.assertEqual(len(self.calls), 3, "Only one late tick should be caught up.")
+        self.assertAlmostEqual(self.calls[-1], 0.4)
+
+    def test_stop_from_callback(self):
+        """Test the callback can stop the scheduler."""
+        self.scheduler.callback = self.scheduler.stop
+        self.scheduler.start()
+        self.root.run()
+        self.assertFalse(self.root.tasks, "No call should be scheduled after stop().")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.game import TetrisGame, TETROMINOS, PIECE_COLORS
+from src.placement import generate_placements
+
+class TestPlacement(unittest.TestCase):
+    def setUp(self):
+        """Set up a game with an empty AI board."""
+        self.game = TetrisGame()
+        self.game.initialize_game()
+        self.board = self.game.boards['ai']
+
+    def make_piece(self, piece_type):
+        """Build a regular piece dict."""
+        return {'type': piece_type, 'shape': TETROMINOS[piece_type][0], 'color': PIECE_COLORS[piece_type]}
+
+    def test_symmetric_shapes_are_deduplicated(self):
+        """Test rotations covering the same cells give a single placement."""
+        counts = {piece_type: len(generate_placements(self.board, self.make_piece(piece_type), 0, 3))
+                  for piece_type in ('O', 'I', 'S', 'T')}
+        self.assertEqual(counts, {'O': 9, 'I': 17, 'S': 17, 'T': 34})
+
+    def test_tuck_under_overhang(self):
+        """Test placements under an overhang are found and their path reaches them."""
+        # An overhang over columns 0-1, with a two-row gap under it
+        for col in range(0, 2):
+            self.board.grid[17][col] = 'J'
+        for col in range(4, 10):
+            self.board.grid[19][col] = 'L'
+
+        piece = self.make_piece('O')
+        placements = generate_placements(self.board, piece, 0, 3)
+        tucked = [p for p in placements if p.row == 17 and p.col == -1]
+        self.assertEqual(len(tucked), 1, "The O piece should slide under the overhang.")
+        self.assertIn('left', tucked[0].path[tucked[0].path.index('down'):], "A slide needs a move after falling.")
+
+        self.game.current_pieces['ai'] = piece
+        self.game.piece_positions['ai'] = [0, 3]
+        for action in tucked[0].path:
+            self.game.apply_action('ai', action)
+        self.assertEqual(self.game.grids['ai'][19][0], 'O', "The path should lock the piece under the overhang.")
+        self.assertEqual(self.game.grids['ai'][18][1], 'O')
+
+if __name__ == '__main__':
+    unittest.main()
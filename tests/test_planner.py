@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.game import TetrisGame, TETROMINOS, PIECE_COLORS
+from src.planner import BeamPlanner
+from src.simulator import MoveSimulator
+from src.ai import AI
+
+class TestBeamPlanner(unittest.TestCase):
+    def setUp(self):
+        """Set up a board with two rows open on their four left columns."""
+        self.game = TetrisGame()
+        self.game.initialize_game()
+        self.board = self.game.boards['ai']
+        for row in (18, 19):
+            for col in range(4, 10):
+                self.board.grid[row][col] = 'I'
+        self.simulator = MoveSimulator(10, 20)
+        self.o_piece = {'type': 'O', 'shape': TETROMINOS['O'][0], 'color': PIECE_COLORS['O']}
+
+    def score_placements(self, board, shapes, placements, lines):
+        """Deterministic scoring: lines first, then the aggregate height."""
+        scored = []
+        for placement in placements:
+            cleared = self.simulator.place(board, shapes[placement.rotation], placement.row, placement.col)
+            scored.append((10 * (lines + cleared) - self.simulator.aggregate_height, cleared))
+        return scored
+
+    def test_lookahead_finds_two_piece_clear(self):
+        """Test the next piece is used to find a double clear."""
+        planner = BeamPlanner(self.simulator, self.score_placements, beam_width=9, time_budget=10)
+        plan = planner.plan(self.board, [self.o_piece, self.o_piece], 0, 3)
+        self.assertEqual(plan.depth, 2)
+        self.assertEqual(plan.score, 20, "Two O pieces should clear both rows and empty the board.")
+        self.assertEqual(self.board.rows[19], 0b1111110000, "The planner should not modify the board.")
+
+    def test_budget_keeps_last_complete_level(self):
+        """Test an expired budget returns the best move of the first level."""
+        planner = BeamPlanner(self.simulator, self.score_placements, time_budget=0)
+        plan = planner.plan(self.board, [self.o_piece, self.o_piece], 0, 3)
+        self.assertEqual(plan.depth, 1)
+        self.assertEqual(plan.score, -16, "A single O piece should only fill the left gap.")
+
+    def test_ai_plays_planned_move(self):
+        """Test the AI locks its piece where the lookahead placed it."""
+        self.game.current_pieces['ai'] = self.o_piece
+        self.game.next_pieces['ai'] = dict(self.o_piece)
+        ai = AI(self.game, 'ai', search_depth=2)
+        self.assertEqual(len(ai.preview_pieces()), 2)
+        ai.play_move(ai.calculate_best_move())
+        # Le premier O complète le trou de gauche sans effacer de ligne
+        self.assertEqual(self.game.lines_completed['ai'], 0)
+        self.assertEqual(bin(self.board.rows[19]).count('1') + bin(self.board.rows[18]).count('1'), 16)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.renderer import CanvasRenderer, ImageRenderer, EMPTY_FILL
+from src.game import TetrisGame, PIECE_COLORS, piece_from_key
+
+class FakeCanvas:
+    """Canvas stand-in recording the item calls (no display is needed)."""
+    def __init__(self):
+        self.items = {}
+        self.updates = []
+        self.deleted = []
+
+    def _create(self, kind, options):
+        item = len(self.items) + 1
+        self.items[item] = dict(options, kind=kind)
+        return item
+
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', options)
+
+    def create_image(self, *coords, **options):
+        return self._create('image', options)
+
+    def itemconfig(self, item, **options):
+        self.updates.append(item)
+        self.items[item].update(options)
+
+    def delete(self, tag):
+        self.deleted.append(tag)
+
+class FakeImage:
+    """PhotoImage stand-in decoding the put() data into a grid of colours."""
+    def __init__(self, width, height):
+        self.pixels = [[None] * width for _ in range(height)]
+        self.puts = 0
+        self.tk = self
+
+    def put(self, data, to=(0, 0)):
+        self.puts += 1
+        for row, line in enumerate(data[1:-1].split('} {')):
+            self.pixels[row] = line.split(' ')
+
+    def call(self, *command):
+        """Record the zoomed copy into the displayed image."""
+        image, _, source = command[:3]
+        image.copied_from = source
+
+class TestCanvasRenderer(unittest.TestCase):
+    def setUp(self):
+        """Set up a game and a renderer drawing on a fake canvas."""
+        self.game = TetrisGame()
+        self.game.initialize_game()
+        self.canvas = FakeCanvas()
+        self.renderer = CanvasRenderer(self.canvas, colors={'I': '#00ffff'})
+
+    def test_items_created_once(self):
+        """Test rendering frames creates no new item when nothing changed."""
+        self.renderer.render(self.game)
+        created = len(self.canvas.items)
+        self.canvas.updates = []
+        self.assertEqual(self.renderer.render(self.game), 0, "An unchanged frame should recolour no cell.")
+        self.assertEqual(self.canvas.updates, [], "An unchanged frame should make no Tk call.")
+        self.assertEqual(len(self.canvas.items), created)
+
+    def test_only_changed_cells_updated(self):
+        """Test moving the piece recolours only the cells it left and entered."""
+        self.renderer.render(self.game)
+        before = set(self.game.get_current_piece_cells('human'))
+        self.game.move_piece('human', 0, -1)
+        after = set(self.game.get_current_piece_cells('human'))
+        self.canvas.updates = []
+        changed = self.renderer.render(self.game)
+        self.assertEqual(changed, len(before ^ after))
+
+    def test_locked_piece_drawn(self):
+        """Test a dropped piece stays drawn where it locked."""
+        self.game.current_pieces['human'] = piece_from_key('I')
+        self.renderer.render(self.game)
+        self.game.hard_drop('human')
+        self.renderer.render(self.game)
+        for col in range(3, 7):
+            item = self.renderer.cells['human'][19 * 10 + col]
+            self.assertEqual(self.canvas.items[item]['fill'], '#00ffff')
+        self.assertEqual(self.canvas.items[self.renderer.cells['human'][0]]['fill'], EMPTY_FILL)
+
+class TestImageRenderer(unittest.TestCase):
+    def test_one_put_per_changed_board(self):
+        """Test a frame uploads each changed board with a single put()."""
+        game = TetrisGame()
+        game.initialize_game()
+        game.current_pieces['ai'] = piece_from_key('I')
+        renderer = ImageRenderer(FakeCanvas(), colors={'I': '#00ffff'}, image_factory=FakeImage)
+        renderer.render(game)
+        source = renderer.sources['ai']
+        self.assertEqual(source.puts, 1)
+        self.assertIs(renderer.images['ai'].copied_from, source)
+        for row, col in game.get_current_piece_cells('ai'):
+            self.assertEqual(source.pixels[row][col], '#00ffff')
+
+        renderer.render(game)
+        self.assertEqual(source.puts, 1, "An unchanged board should not be uploaded again.")
+        game.hard_drop('ai')
+        renderer.render(game)
+        self.assertEqual(source.puts, 2)
+        self.assertEqual(source.pixels[19][3:7], ['#00ffff'] * 4)
+        self.assertEqual(source.pixels[0][0], EMPTY_FILL)
+
+    def test_put_data_is_precomputed_hex(self):
+        """Test every colour uploaded comes from the palette built at creation."""
+        game = TetrisGame()
+        game.initialize_game()
+        for col in range(9):
+            game.grids['ai'][19][col] = 'I'
+        colors = {piece_type: '#%02x%02x%02x' % rgb for piece_type, rgb in PIECE_COLORS.items()}
+        renderer = ImageRenderer(FakeCanvas(), colors=colors, image_factory=FakeImage)
+        palette = {EMPTY_FILL} | set(colors.values()) | set(renderer.rainbow)
+        rainbow = list(renderer.rainbow)
+        for frame in range(3):
+            renderer.render(game, rainbow_mode=frame < 2, frame_count=frame)
+            for line in renderer.sources['ai'].pixels:
+                for color in line:
+                    self.assertRegex(color, r'^#[0-9a-f]{6}$')
+                    self.assertIn(color, palette)
+        self.assertEqual(renderer.rainbow, rainbow, "Rainbow colours should not be drawn lazily.")
+        self.assertEqual(renderer.colors, colors)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from unittest import mock
+from src import tournament
+from src.tournament import play_duel, run_tournament
+
+class TestTournament(unittest.TestCase):
+    def test_play_duel_is_reproducible(self):
+        """Test a duel replayed with the same seed gives the same result."""
+        first = play_duel(7, max_pieces=5)
+        second = play_duel(7, max_pieces=5)
+        self.assertEqual(first['scores'], second['scores'])
+        self.assertEqual(first['ticks'], second['ticks'])
+        self.assertEqual(first['decisions'], 10, "Both AIs should place 5 pieces each.")
+
+    def test_depth_two_duel_replays_identically(self):
+        """Test a lookahead duel does not depend on how long decisions take."""
+        ais = []
+        real_ai = tournament.AI
+        def make_ai(*args, **kwargs):
+            ai = real_ai(*args, **kwargs)
+            ais.append(ai)
+            return ai
+        with mock.patch.object(tournament, 'AI', side_effect=make_ai):
+            first = play_duel(11, max_pieces=25)
+        second = play_duel(11, max_pieces=25)
+        self.assertEqual(ais[0].search_depth, 2)
+        self.assertIsNone(ais[0].planner.time_budget)
+        for key in ('scores', 'lines', 'ticks', 'decisions'):
+            self.assertEqual(first[key], second[key], key)
+
+    def test_run_tournament_report(self):
+        """Test the tournament report aggregates every game."""
+        report = run_tournament(games=2, seed=3, max_pieces=3, workers=1)
+        self.assertEqual(report['games'], 2)
+        self.assertEqual([result['seed'] for result in report['results']], [3, 4])
+        self.assertGreater(report['decisions_per_second'], 0)
+        self.assertIn('mean', report['scores']['ai'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.transposition import TranspositionTable
+from src.game import TetrisGame
+from src.ai import AI
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        """Set up a small table."""
+        self.table = TranspositionTable(max_size=2)
+
+    def test_lookup_counts_hits_and_misses(self):
+        """Test features are computed once per board."""
+        calls = []
+        compute = lambda: calls.append(1) or (1, 2, 3)
+        self.assertEqual(self.table.lookup([0, 1], compute), (1, 2, 3))
+        self.assertEqual(self.table.lookup([0, 1], compute), (1, 2, 3))
+        self.assertEqual(len(calls), 1, "A known board should not be evaluated again.")
+        self.assertEqual(self.table.stats()['hits'], 1)
+        self.assertEqual(self.table.stats()['misses'], 1)
+
+    def test_lru_eviction(self):
+        """Test the least recently used board is evicted first."""
+        self.table.put((1,), 'a')
+        self.table.put((2,), 'b')
+        self.table.get((1,))
+        self.table.put((3,), 'c')
+        self.assertEqual(len(self.table), 2)
+        self.assertIsNone(self.table.get((2,)), "The least recently used board should be evicted.")
+        self.assertEqual(self.table.get((1,)), 'a')
+
+    def decide_twice(self, **options):
+        """Play one AI move from a seeded game, then decide the next one."""
+        random.seed(1)
+        game = TetrisGame()
+        game.initialize_game()
+        ai = AI(game, time_budget=None, **options)
+        ai.play_move(ai.calculate_best_move())
+        return ai, ai.calculate_best_move()
+
+    def test_cache_skips_search(self):
+        """Test the next decision reuses the placements the lookahead evaluated."""
+        for vectorized in (False, True):
+            plain, expected = self.decide_twice(cache_size=None, vectorized=vectorized)
+            cached, move = self.decide_twice(vectorized=vectorized)
+            self.assertEqual(move, expected, "The cache should not change the decision.")
+            self.assertGreater(cached.metrics.histograms['cache_hits'].samples[-1], 0)
+            self.assertLess(cached.decision_stats['simulated'], plain.decision_stats['simulated'],
+                            "Cached placements should not be simulated again.")
+
+    def test_no_cache(self):
+        """Test an AI created without a cache records no cache hits."""
+        game = TetrisGame()
+        game.initialize_game()
+        ai = AI(game, cache_size=None)
+        ai.calculate_best_move()
+        self.assertIsNone(ai.evaluation_cache)
+        self.assertNotIn('cache_hits', ai.metrics.histograms)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import json
+import math
+import random
+import tempfile
+from unittest import mock
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.tuning import tune, main, next_generation, random_weights, save_weights, FEATURES
+from src.game import TetrisGame
+from src.ai import AI
+
+class TestTuning(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary directory for checkpoints and weight files."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.directory.name, 'checkpoint.json')
+        self.output = os.path.join(self.directory.name, 'weights.json')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.directory.cleanup()
+
+    def test_next_generation_keeps_size_and_best(self):
+        """Test children replace the weakest candidates only."""
+        rng = random.Random(0)
+        population = [random_weights(rng) for _ in range(10)]
+        fitness = list(range(10))
+        children = next_generation(population, fitness, rng)
+        self.assertEqual(len(children), 10)
+        self.assertEqual(children[0], population[9], "The fittest candidate should survive.")
+        for weights in children:
+            self.assertAlmostEqual(math.sqrt(sum(weights[name] ** 2 for name in FEATURES)), 1.0)
+
+    def test_resume_matches_uninterrupted_run(self):
+        """Test a run resumed from its checkpoint ends like an uninterrupted one."""
+        settings = dict(population_size=4, games=1, max_pieces=20, seed=3, workers=1)
+        expected = tune(generations=2, **settings)
+        tune(generations=1, checkpoint=self.checkpoint, **settings)
+        with open(self.checkpoint) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)['generation'], 1)
+        resumed = tune(generations=2, checkpoint=self.checkpoint, output=self.output, **settings)
+        self.assertEqual(resumed, expected)
+        self.assertTrue(os.path.exists(self.output))
+
+    def test_resume_refuses_other_settings(self):
+        """Test a checkpoint is not resumed with another population, game count or seed."""
+        settings = dict(population_size=4, games=1, max_pieces=20, seed=3, workers=1)
+        tune(generations=1, checkpoint=self.checkpoint, **settings)
+        for name, value in (('population_size', 5), ('games', 2), ('seed', 4)):
+            with self.assertRaises(ValueError):
+                tune(generations=2, checkpoint=self.checkpoint, **dict(settings, **{name: value}))
+
+    def test_main_without_generations(self):
+        """Test the command line reports that nothing was evaluated."""
+        with mock.patch('sys.stderr') as stderr:
+            weights = main(['--generations', '0', '--checkpoint', self.checkpoint, '--output', self.output])
+        self.assertIsNone(weights)
+        self.assertFalse(os.path.exists(self.output))
+        self.assertIn("no generation evaluated", ''.join(call.args[0] for call in stderr.write.call_args_list))
+
+    def test_ai_loads_weight_file(self):
+        """Test the AI reads a weight file and keeps the weights it does not contain."""
+        save_weights(self.output, {'height': -1.0, 'lines': 2.0, 'holes': -3.0, 'bumpiness': -4.0}, fitness=5)
+        game = TetrisGame()
+        game.initialize_game()
+        ai = AI(game)
+        ai.load_weights(self.output)
+        self.assertEqual(ai.weights['holes'], -3.0)
+        self.assertEqual(ai.weights['random'], AI.DEFAULT_WEIGHTS['random'])
+        self.assertNotIn('fitness', ai.weights)
+
+if __name__ == '__main__':
+    unittest.main()
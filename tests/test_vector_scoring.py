@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import random
+from unittest import mock
+
+# Add the parent directory to the path to import the src modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import vector_scoring
+from src.features import batch_features
+from src.game import TetrisGame, TETROMINOS, PIECE_COLORS
+from src.placement import generate_placements, piece_rotations
+from src.ai import AI
+
+@unittest.skipIf(vector_scoring.np is None, "NumPy is not installed")
+class TestVectorScoring(unittest.TestCase):
+    def setUp(self):
+        """Set up a game whose AI board has holes and an almost full row."""
+        self.game = TetrisGame()
+        self.game.initialize_game()
+        self.board = self.game.boards['ai']
+        self.board.grid[19] = ['I'] * 9 + [0]
+        self.board.grid[18][0] = 'O'
+        self.board.grid[16][0] = 'O'
+        self.board.grid[17][5] = 'T'
+        self.piece = {'type': 'I', 'shape': TETROMINOS['I'][0], 'color': PIECE_COLORS['I']}
+
+    def test_features_match_simulator(self):
+        """Test stacked features equal the ones the simulator maintains."""
+        ai = AI(self.game, vectorized=False)
+        shapes = piece_rotations(self.piece)
+        placements = generate_placements(self.board, self.piece, 0, 3)
+        boards = vector_scoring.stack_placements(self.board.rows, shapes, placements)
+        cleared = vector_scoring.clear_lines(boards, self.board.full_mask)
+        features = batch_features(boards, self.board.width)[:, vector_scoring.SURFACE_FEATURES]
+        for i, placement in enumerate(placements):
+            lines = ai.simulator.place(self.board, shapes[placement.rotation], placement.row, placement.col)
+            self.assertEqual(boards[i].tolist(), ai.simulator.rows)
+            self.assertEqual(cleared[i], lines)
+            self.assertEqual(tuple(features[i].tolist()), ai.simulator.features())
+        self.assertEqual(max(cleared), 1, "The vertical I in the last column should clear a line.")
+
+    def test_ai_scores_match_without_numpy(self):
+        """Test the vectorized and pure Python paths give the same scores."""
+        random.seed(0)
+        vectorized = AI(self.game, vectorized=True)
+        plain = AI(self.game, vectorized=False)
+        vectorized.weights['random'] = plain.weights['random'] = 0
+        shapes = piece_rotations(self.piece)
+        placements = generate_placements(self.board, self.piece, 0, 3)
+        for (score, lines), (expected, expected_lines) in zip(
+                vectorized.score_placements(self.board, shapes, placements, 2),
+                plain.score_placements(self.board, shapes, placements, 2)):
+            self.assertAlmostEqual(score, expected)
+            self.assertEqual(lines, expected_lines)
+
+    def test_small_sets_use_simulator(self):
+        """Test NumPy is only used for enough placements."""
+        ai = AI(self.game, vectorized=True)
+        shapes = piece_rotations(self.piece)
+        placements = generate_placements(self.board, self.piece, 0, 3)
+        with mock.patch.object(vector_scoring, 'evaluate_placements',
+                               wraps=vector_scoring.evaluate_placements) as evaluate:
+            ai.evaluate_placements(self.board, shapes, placements[:AI.VECTOR_MIN_PLACEMENTS - 1])
+            self.assertFalse(evaluate.called)
+            ai.evaluate_placements(self.board, shapes, placements[:AI.VECTOR_MIN_PLACEMENTS])
+            self.assertTrue(evaluate.called)
+
+if __name__ == '__main__':
+    unittest.main()
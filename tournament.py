@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+# tournament.py - Lancer un tournoi IA contre IA sans interface graphique
+
+import sys
+import os
+
+# Ajouter le répertoire du projet au path Python
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.tournament import main
+
+if __name__ == "__main__":
+    main()
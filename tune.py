@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+# tune.py - Régler les poids de l'IA par algorithme génétique
+
+import sys
+import os
+
+# Ajouter le répertoire du projet au path Python
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.tuning import main
+
+if __name__ == "__main__":
+    main()